@@ -0,0 +1,49 @@
+"""
+Benchmark: cancelling 50k bookings one by one vs. cancel_bookings_bulk.
+
+Sells 50k single-ticket bookings over 200 shows, then cancels all of them either with
+one cancel_booking call per id or with one bulk call (one lock per show).
+
+Run:
+  python -m scripts.bench_bulk_cancel
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+from src.services.cinema_service import CinemaService
+from src.utils.clock import VirtualClock
+
+SHOWS = 200
+BOOKINGS = 50_000
+START = datetime(2030, 6, 3, 18, 0)
+NOW = START - timedelta(days=1)
+
+
+def setup() -> tuple:
+    svc = CinemaService(clock=VirtualClock(NOW), lazy_status=True)
+    for i in range(SHOWS):
+        svc.register_show(f"C{i % 10}", f"M{i}", START, 200, BOOKINGS // SHOWS)
+    ids = [svc.order_tickets(f"M{i % SHOWS}", START, 1, NOW)[0] for i in range(BOOKINGS)]
+    random.Random(0).shuffle(ids)  # campaigns arrive in arbitrary order
+    return svc, ids
+
+
+def main() -> None:
+    svc, ids = setup()
+    t0 = time.perf_counter()
+    one_by_one = sum(svc.cancel_booking(bid, NOW) for bid in ids)
+    single = time.perf_counter() - t0
+    print(f"cancel_booking x{len(ids):,}: {single:.3f}s  refund={one_by_one:,}")
+
+    svc, ids = setup()
+    t0 = time.perf_counter()
+    res = svc.cancel_bookings_bulk(ids, NOW)
+    bulk = time.perf_counter() - t0
+    print(f"cancel_bookings_bulk:      {bulk:.3f}s  refund={res.total_refund:,}  "
+          f"({single / bulk:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
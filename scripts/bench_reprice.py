@@ -0,0 +1,51 @@
+"""
+Benchmark: bulk rule-based repricing over 100k shows.
+
+Registers 100k shows across 50 movies / 20 cinemas / 7 days with random occupancy,
+then times "+10% for movie M0 this weekend with <20% seats left" and a catalog-wide
+"-5% for every show with >80% seats left".
+
+Run:
+  python -m scripts.bench_reprice
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+from src.services.cinema_service import CinemaService
+from src.services.repricing import ShowSelector, percent_change
+from src.utils.clock import VirtualClock
+
+SHOWS = 100_000
+BASE = datetime(2030, 6, 3, 9, 0)  # a Monday
+
+
+def main() -> None:
+    rnd = random.Random(0)
+    svc = CinemaService(clock=VirtualClock(BASE - timedelta(days=7)), lazy_status=True)
+    t0 = time.perf_counter()
+    for i in range(SHOWS):
+        start = BASE + timedelta(days=rnd.randrange(7), minutes=15 * rnd.randrange(48))
+        sid = svc.register_show(f"C{i % 20}", f"M{i % 50}", start, rnd.randint(100, 500), 100)
+        # Fake occupancy directly; selling 100k batches is not what is measured here
+        svc.store.get_show(sid).seats_remaining = rnd.randint(0, 100)
+    print(f"setup: {SHOWS:,} shows in {time.perf_counter() - t0:.2f}s")
+
+    weekend = ShowSelector(
+        movie="M0",
+        start_from=BASE + timedelta(days=5),
+        start_to=BASE + timedelta(days=7),
+        max_seats_left_ratio=0.2,
+    )
+    t0 = time.perf_counter()
+    n = svc.reprice(weekend, percent_change(10))
+    print(f"weekend +10%:  {n:>6,} shows changed in {time.perf_counter() - t0:.3f}s")
+
+    t0 = time.perf_counter()
+    n = svc.reprice(ShowSelector(predicate=lambda s: s.seats_remaining > 80), percent_change(-5))
+    print(f"catalog -5%:   {n:>6,} shows changed in {time.perf_counter() - t0:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: multi-core scaling of the booking path.
+
+Each worker thread books single tickets on its own show (own cinema), so show locks and
+the striped revenue locks never contend. Every order still passes two global locks (the
+booking-id counter and the ChangeFeed condition). Both critical sections are now a counter
+bump and a slot store (id formatting and Event construction happen outside), but even on a
+free-threaded interpreter (python3.13t, PYTHON_GIL=0) they bound scaling; with the GIL
+throughput stays flat. Only GIL numbers have been measured so far.
+
+Run:
+  python -m scripts.bench_threads
+  PYTHON_GIL=0 python3.13t -m scripts.bench_threads
+"""
+
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+from src.services.cinema_service import CinemaService
+from src.utils.clock import VirtualClock
+
+ORDERS_PER_THREAD = 20_000
+START = datetime(2030, 6, 3, 18, 0)
+NOW = START - timedelta(days=1)
+
+
+def run(threads: int) -> float:
+    svc = CinemaService(clock=VirtualClock(NOW), lazy_status=True)
+    for i in range(threads):
+        svc.register_show(f"C{i}", f"M{i}", START, 200, ORDERS_PER_THREAD)
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(i: int) -> None:
+        movie = f"M{i}"
+        barrier.wait()
+        for _ in range(ORDERS_PER_THREAD):
+            svc.order_tickets(movie, START, 1, NOW)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    t0 = time.perf_counter()
+    for t in pool:
+        t.join()
+    return threads * ORDERS_PER_THREAD / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    cpus = os.cpu_count() or 1
+    print(f"python {sys.version.split()[0]}  GIL={'on' if gil else 'off'}  cpus={cpus}")
+    base = 0.0
+    n = 1
+    while n <= min(max(cpus, 8), 32):
+        rate = run(n)
+        base = base or rate
+        print(f"threads={n:>2}  {rate:>10,.0f} orders/s  x{rate / base:.2f}")
+        n *= 2
+
+
+if __name__ == "__main__":
+    main()
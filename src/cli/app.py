@@ -1,8 +1,27 @@
+import sys
+from typing import List, Optional
 from src.services.cinema_service import CinemaService
 from src.cli.parser import run_line
+from src.cli.replay import TrafficRecorder
+from src.repo.replication import LogShipper
 
-def main():
+
+def main(argv: Optional[List[str]] = None) -> None:
+    # Optional:
+    #   --record <file.jsonl>     captures timestamped traffic for src.cli.replay
+    #   --replicate-to <path>     ships the mutation log to a src.cli.replica process
+    argv = sys.argv[1:] if argv is None else argv
+    opts = dict(zip(argv[::2], argv[1::2]))
     svc = CinemaService()
+    record = None
+    if "--record" in opts:
+        record = TrafficRecorder(svc, open(opts["--record"], "a"))
+    run = record.run_line if record else (lambda line: run_line(svc, line))
+    shipper = None
+    if "--replicate-to" in opts:
+        shipper = LogShipper(svc.store.feed, open(opts["--replicate-to"], "w"))
+        shipper.start()
+
     print("Cinema Ticket System (in-memory). Type EXIT to quit.")
     while True:
         try:
@@ -12,9 +31,14 @@ def main():
             if line.upper() in ("EXIT", "QUIT"):
                 print("Bye.")
                 break
-            print(run_line(svc, line))
+            print(run(line))
         except EOFError:
             break
+    if record:
+        record.out.close()
+    if shipper:
+        shipper.stop()
+        shipper.out.close()
 
 if __name__ == "__main__":
     main()
@@ -8,3 +8,10 @@ ERR_SHOW_ALREADY_ENDED = "ERROR: Show Already Ended"
 ERR_BOOKING_UNAVAILABLE = "ERROR: Booking Unavailable"
 ERR_ALREADY_CANCELLED = "ERROR: Booking Already Cancelled"
 ERR_INVALID_INPUT = "ERROR: Invalid Input"
+ERR_HOLD_NOT_FOUND = "ERROR: Hold Not Found"
+ERR_HOLD_EXPIRED = "ERROR: Hold Expired"
+ERR_TOO_MANY_REQUESTS = "ERROR: Too Many Requests"
+ERR_READ_ONLY = "ERROR: Read Only Replica"
+ERR_CUSTOMER_LIMIT = "ERROR: Customer Limit Exceeded"
+ERR_TENANT_NOT_FOUND = "ERROR: Tenant Not Found"
+ERR_INTERNAL = "ERROR: Internal Error"
@@ -1,8 +1,12 @@
-from datetime import datetime
+from datetime import timedelta
+from typing import Dict, List, Optional
 from src.services.cinema_service import CinemaService
 from src.utils.time import parse_dt
 from src.utils.errors import DomainError
 from src.cli import commands as C
+from src.repo.rollups import DIMENSIONS
+
+_MEASURES = {"GROSS": "gross", "REFUNDED": "refunded", "NET": "net"}
 
 
 def _join_dt(parts, i):
@@ -26,6 +30,17 @@ def _join_dt(parts, i):
     return parse_dt(dt_str), i + 1
 
 
+def _options(parts: List[str], i: int) -> Optional[Dict[str, str]]:
+    """Parses trailing NAME=value tokens from parts[i:]; None if any token is malformed."""
+    opts: Dict[str, str] = {}
+    for tok in parts[i:]:
+        name, sep, value = tok.partition("=")
+        if not sep or not value:
+            return None
+        opts[name.upper()] = value
+    return opts
+
+
 def run_line(svc: CinemaService, line: str) -> str:
     parts = line.strip().split()
     if not parts:
@@ -34,7 +49,7 @@ def run_line(svc: CinemaService, line: str) -> str:
     cmd = parts[0].upper()
     try:
         if cmd == "REGISTER_SHOW":
-            # REGISTER_SHOW <cinema> <movie> <date> <time> <price> <capacity>
+            # REGISTER_SHOW <cinema> <movie> <date> <time> <price> <capacity> [seats_per_row]
             # or REGISTER_SHOW <cinema> <movie> <"date time"> <price> <capacity>
             if len(parts) < 6:
                 return C.ERR_INVALID_INPUT
@@ -45,7 +60,9 @@ def run_line(svc: CinemaService, line: str) -> str:
                 return C.ERR_INVALID_INPUT
             price = int(parts[j])
             cap = int(parts[j + 1])
-            show_id = svc.register_show(cinema, movie, dt, price, cap)
+            # optional trailing <seats_per_row> enables the seat map
+            seats_per_row = int(parts[j + 2]) if j + 2 < len(parts) else None
+            show_id = svc.register_show(cinema, movie, dt, price, cap, seats_per_row)
             return f"{C.OK} {show_id}"
 
         if cmd == "START_SHOW":
@@ -71,7 +88,7 @@ def run_line(svc: CinemaService, line: str) -> str:
             return C.OK
 
         if cmd == "ORDER_TICKETS":
-            # ORDER_TICKETS <movie> <date> <time> <qty>
+            # ORDER_TICKETS <movie> <date> <time> <qty> [KEY=<key>] [SPLIT=YES] [CUSTOMER=<id>]
             if len(parts) < 4:
                 return C.ERR_INVALID_INPUT
             movie = parts[1]
@@ -79,21 +96,146 @@ def run_line(svc: CinemaService, line: str) -> str:
             if j >= len(parts):
                 return C.ERR_INVALID_INPUT
             qty = int(parts[j])
-            bid, sid = svc.order_tickets(movie, dt, qty, datetime.now())
+            opts = _options(parts, j + 1)
+            if opts is None or set(opts) - {"KEY", "SPLIT", "CUSTOMER"}:
+                return C.ERR_INVALID_INPUT
+            customer = opts.get("CUSTOMER")
+            if opts.get("SPLIT", "NO").upper() == "YES":
+                if "KEY" in opts:
+                    return C.ERR_INVALID_INPUT
+                bid, sids = svc.order_tickets_split(
+                    movie, dt, qty, svc.clock.now(), customer_id=customer
+                )
+                return f"{C.OK} {bid} {','.join(sids)}"
+            bid, sid = svc.order_tickets(
+                movie,
+                dt,
+                qty,
+                svc.clock.now(),
+                idempotency_key=opts.get("KEY"),
+                customer_id=customer,
+            )
             return f"{C.OK} {bid} {sid}"
 
         if cmd == "CANCEL_BOOKING":
-            if len(parts) != 2:
+            # CANCEL_BOOKING <booking_id> [KEY=<idempotency_key>]
+            opts = _options(parts, 2)
+            if len(parts) < 2 or opts is None or set(opts) - {"KEY"}:
                 return C.ERR_INVALID_INPUT
             booking_id = parts[1]
-            refund = svc.cancel_booking(booking_id, datetime.now())
+            refund = svc.cancel_booking(
+                booking_id, svc.clock.now(), idempotency_key=opts.get("KEY")
+            )
             return f"{C.OK} REFUND={refund}"
 
+        if cmd == "MY_BOOKINGS":
+            # MY_BOOKINGS <customer_id> [LIMIT=<n>] [CURSOR=<c>]
+            #   ->  <booking_id>:<show_id>:<qty>:<status> ... [NEXT=<cursor>]
+            opts = _options(parts, 2)
+            if len(parts) < 2 or opts is None or set(opts) - {"LIMIT", "CURSOR"}:
+                return C.ERR_INVALID_INPUT
+            cursor = int(opts["CURSOR"]) if "CURSOR" in opts else None
+            page, nxt = svc.customer_bookings(parts[1], int(opts.get("LIMIT", 20)), cursor)
+            out = [f"{b.booking_id}:{b.show_id}:{b.quantity}:{b.status.name}" for b in page]
+            if nxt is not None:
+                out.append(f"NEXT={nxt}")
+            return " ".join(out)
+
+        if cmd == "HOLD_TICKETS":
+            # HOLD_TICKETS <movie> <date> <time> <qty> [ttl_seconds]
+            if len(parts) < 4:
+                return C.ERR_INVALID_INPUT
+            movie = parts[1]
+            dt, j = _join_dt(parts, 2)
+            if j >= len(parts) or j + 2 < len(parts):
+                return C.ERR_INVALID_INPUT
+            qty = int(parts[j])
+            if j + 1 < len(parts):
+                hid, sid = svc.hold_tickets(
+                    movie, dt, qty, svc.clock.now(), ttl=timedelta(seconds=int(parts[j + 1]))
+                )
+            else:
+                hid, sid = svc.hold_tickets(movie, dt, qty, svc.clock.now())
+            return f"{C.OK} {hid} {sid}"
+
+        if cmd == "CONFIRM_HOLD":
+            if len(parts) != 2:
+                return C.ERR_INVALID_INPUT
+            bid = svc.confirm_hold(parts[1], svc.clock.now())
+            return f"{C.OK} {bid}"
+
+        if cmd == "RELEASE_HOLD":
+            if len(parts) != 2:
+                return C.ERR_INVALID_INPUT
+            svc.release_hold(parts[1], svc.clock.now())
+            return C.OK
+
+        if cmd == "AVAILABILITY":
+            # AVAILABILITY <movie> <date> <time>  ->  <show_id>:<seats_left>@<price> ...
+            if len(parts) < 3:
+                return C.ERR_INVALID_INPUT
+            dt, j = _join_dt(parts, 2)
+            if j != len(parts):
+                return C.ERR_INVALID_INPUT
+            slots = svc.availability(parts[1], dt)
+            return " ".join(f"{sid}:{left}@{price}" for sid, left, price in slots)
+
+        if cmd == "EXPORT":
+            # EXPORT <directory> [FORMAT=CSV|JSONL|COLUMNAR] [COMPRESS=GZIP|BZ2|XZ] [CHUNK=<rows>]
+            opts = _options(parts, 2)
+            if len(parts) < 2 or opts is None or set(opts) - {"FORMAT", "COMPRESS", "CHUNK"}:
+                return C.ERR_INVALID_INPUT
+            compress = opts.get("COMPRESS")
+            res = svc.export(
+                parts[1],
+                opts.get("FORMAT", "CSV").lower(),
+                compress.lower() if compress else None,
+                int(opts.get("CHUNK", 10_000)),
+            )
+            counts = " ".join(f"{t.upper()}={n}" for t, n in res.rows.items())
+            return f"{C.OK} OFFSET={res.offset} {counts}"
+
+        if cmd == "MEMSTATS":
+            # MEMSTATS                ->  <component>:<entries>/<bytes> ... total:<entries>/<bytes>
+            # MEMSTATS START | STOP   ->  tracemalloc baseline on / off
+            # MEMSTATS DIFF [n]       ->  <file:line>:<+bytes>/<+blocks> ... (top n growth)
+            sub = parts[1].upper() if len(parts) > 1 else None
+            if sub is None:
+                stats = svc.memory_stats()
+                return " ".join(f"{k}:{v['entries']}/{v['bytes']}" for k, v in stats.items())
+            if sub == "START" and len(parts) == 2:
+                svc.memory_tracker.start()
+                return C.OK
+            if sub == "STOP" and len(parts) == 2:
+                svc.memory_tracker.stop()
+                return C.OK
+            if sub == "DIFF" and len(parts) <= 3:
+                deltas = svc.memory_tracker.diff(int(parts[2]) if len(parts) == 3 else 10)
+                return " ".join(
+                    f"{d.location}:{d.size_diff:+d}/{d.count_diff:+d}" for d in deltas
+                )
+            return C.ERR_INVALID_INPUT
+
         if cmd == "REPORT_REVENUE":
             if len(parts) == 1:
                 return " ".join([f"{k}:{v}" for k, v in svc.all_revenue().items()])
             cinema = parts[1]
-            return str(svc.revenue_for(cinema))
+            if len(parts) == 2:
+                return str(svc.revenue_for(cinema))
+            # REPORT_REVENUE <cinema> GROSS|REFUNDED|NET
+            # REPORT_REVENUE <cinema> BY MOVIE|SHOW|DAY|HOUR|MOVIE_DAY [GROSS|REFUNDED|NET]
+            if parts[2].upper() == "BY":
+                if len(parts) not in (4, 5):
+                    return C.ERR_INVALID_INPUT
+                measure = parts[4].upper() if len(parts) == 5 else "NET"
+                if measure not in _MEASURES or parts[3].lower() not in DIMENSIONS:
+                    return C.ERR_INVALID_INPUT
+                rows = svc.revenue_breakdown(cinema, parts[3].lower())
+                attr = _MEASURES[measure]
+                return " ".join(f"{k}:{getattr(t, attr)}" for k, t in sorted(rows.items()))
+            if len(parts) != 3 or parts[2].upper() not in _MEASURES:
+                return C.ERR_INVALID_INPUT
+            return str(getattr(svc.revenue_totals(cinema), _MEASURES[parts[2].upper()]))
 
         return "UNKNOWN_COMMAND"
 
@@ -103,6 +245,16 @@ def run_line(svc: CinemaService, line: str) -> str:
             return C.ERR_BOOKING_NOT_FOUND
         if "not found: s" in msg:
             return C.ERR_SHOW_NOT_FOUND
+        if "not found: h" in msg:
+            return C.ERR_HOLD_NOT_FOUND
+        if "customer limit exceeded" in msg:
+            return C.ERR_CUSTOMER_LIMIT
+        if "read-only replica" in msg:
+            return C.ERR_READ_ONLY
+        if "admission rejected" in msg:
+            return C.ERR_TOO_MANY_REQUESTS
+        if "hold expired" in msg:
+            return C.ERR_HOLD_EXPIRED
         if "already started" in msg:
             return C.ERR_SHOW_ALREADY_STARTED
         if "cannot end before start" in msg:
@@ -0,0 +1,126 @@
+"""
+Traffic capture and time-compressed replay for CLI command streams.
+
+Record (wraps run_line, one JSON object per line):
+  {"ts": "2025-08-20T09:00:00.123456", "line": "ORDER_TICKETS ...", "out": "OK B00001 S00001"}
+
+Replay re-runs the commands against a fresh CinemaService driven by a VirtualClock,
+jumping the clock to each recorded timestamp instead of waiting, so a week of traffic
+runs as fast as the CPU allows. IDs minted during replay are mapped back onto the
+recorded ones, so later commands (CANCEL_BOOKING <id>, ...) hit the right entities.
+
+Run:
+  python -m src.cli.replay traffic.jsonl
+"""
+
+from __future__ import annotations
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from src.cli.parser import run_line
+from src.services.cinema_service import CinemaService
+from src.utils.clock import VirtualClock
+
+_ID = re.compile(r"^[SBH]\d{5,}$")
+
+
+class TrafficRecorder:
+    """Runs CLI lines against svc and appends each one, timestamped by svc.clock, to `out`."""
+
+    def __init__(self, svc: CinemaService, out: TextIO) -> None:
+        self.svc = svc
+        self.out = out
+
+    def run_line(self, line: str) -> str:
+        ts = self.svc.clock.now()
+        result = run_line(self.svc, line)
+        self.out.write(json.dumps({"ts": ts.isoformat(), "line": line, "out": result}) + "\n")
+        self.out.flush()
+        return result
+
+
+@dataclass
+class ReplayStats:
+    commands: int = 0
+    mismatches: int = 0          # replay output differed from the recorded output
+    simulated_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    @property
+    def speedup(self) -> float:
+        return self.simulated_seconds / self.wall_seconds if self.wall_seconds else 0.0
+
+
+def read_records(f: TextIO) -> Iterator[dict]:
+    for raw in f:
+        raw = raw.strip()
+        if raw:
+            yield json.loads(raw)
+
+
+def replay(records: Iterable[dict], svc: Optional[CinemaService] = None) -> ReplayStats:
+    """
+    Replays recorded commands in order. `svc` must use a VirtualClock; by default a
+    fresh service is created with the clock starting at the first record's timestamp.
+    """
+    stats = ReplayStats()
+    ids: Dict[str, str] = {}  # recorded id -> replayed id
+    first: Optional[datetime] = None
+    clock: Optional[VirtualClock] = None
+    t0 = time.perf_counter()
+
+    for rec in records:
+        ts = datetime.fromisoformat(rec["ts"])
+        if first is None:
+            first = ts
+            if svc is None:
+                svc = CinemaService(clock=VirtualClock(ts))
+            if not isinstance(svc.clock, VirtualClock):
+                raise ValueError("replay requires a CinemaService with a VirtualClock")
+            clock = svc.clock
+        clock.advance_to(ts)  # type: ignore[union-attr]
+
+        line = " ".join(ids.get(tok, tok) for tok in rec["line"].split())
+        out = run_line(svc, line)  # type: ignore[arg-type]
+        stats.commands += 1
+
+        expected = rec.get("out")
+        if expected is not None:
+            got_tokens, exp_tokens = out.split(), expected.split()
+            if len(got_tokens) == len(exp_tokens):
+                for exp, got in zip(exp_tokens, got_tokens):
+                    if _ID.match(exp) and _ID.match(got):
+                        ids.setdefault(exp, got)
+            if _strip_ids(out) != _strip_ids(expected):
+                stats.mismatches += 1
+        stats.simulated_seconds = (ts - first).total_seconds()
+
+    stats.wall_seconds = time.perf_counter() - t0
+    return stats
+
+
+def _strip_ids(out: str) -> str:
+    return " ".join("<id>" if _ID.match(t) else t for t in out.split())
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("usage: python -m src.cli.replay <traffic.jsonl>")
+        sys.exit(2)
+    with open(argv[0]) as f:
+        stats = replay(read_records(f))
+    print(
+        f"commands={stats.commands} mismatches={stats.mismatches} "
+        f"simulated={stats.simulated_seconds:.0f}s wall={stats.wall_seconds:.3f}s "
+        f"speedup={stats.speedup:,.0f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Read-only replica process.
+
+Follows a primary's mutation log (written by `python -m src.cli.app --replicate-to <path>`,
+typically a named pipe) in a background thread and answers read commands from stdin
+(REPORT_REVENUE, AVAILABILITY, EXPORT, ...). Writes answer "ERROR: Read Only Replica".
+LAG prints "<offsets> <seconds>" behind the primary.
+
+Run:
+  mkfifo /tmp/cinema.log
+  python -m src.cli.app --replicate-to /tmp/cinema.log      # primary
+  python -m src.cli.replica /tmp/cinema.log                 # replica
+"""
+
+from __future__ import annotations
+import sys
+import threading
+from typing import List, Optional
+
+from src.cli import commands as C
+from src.cli.parser import run_line
+from src.services.replica_service import ReplicaCinemaService
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("usage: python -m src.cli.replica <mutation-log>")
+        sys.exit(2)
+    svc = ReplicaCinemaService()
+
+    def follow() -> None:
+        with open(argv[0]) as f:
+            svc.replica.follow(f)
+
+    threading.Thread(target=follow, name="replica-applier", daemon=True).start()
+
+    print("Cinema Ticket System (read-only replica). Type EXIT to quit.")
+    while True:
+        try:
+            line = input(">> ").strip()
+            if not line:
+                continue
+            if line.upper() in ("EXIT", "QUIT"):
+                print("Bye.")
+                break
+            if line.upper() == "LAG":
+                lag = svc.lag()
+                print(f"{lag.offsets} {lag.seconds:.3f}")
+                continue
+            print(run_line(svc, line))  # type: ignore[arg-type]
+        except EOFError:
+            break
+        except Exception as e:  # a failing command must not take the replica down
+            print(C.ERR_INTERNAL)
+            print(f"{type(e).__name__}: {e}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 from dataclasses import dataclass
 from datetime import datetime
+from typing import List, Optional
+from src.models.seat_map import Seat
 from src.utils.enums import BookingStatus
 
 
@@ -11,3 +13,16 @@ class Booking:
     unit_price: int
     status: BookingStatus
     created_at: datetime
+    seats: Optional[List[Seat]] = None     # assigned seats when the show has a seat map
+    group_id: Optional[str] = None          # set when part of a split (multi-show) booking
+    customer_id: Optional[str] = None       # optional; indexed for "my bookings" lookups
+    cancelled_seq: Optional[int] = None     # change-feed offset of the cancellation (exports)
+
+
+@dataclass
+class BookingGroup:
+    """Composite booking spanning several shows; cancelled only as a unit."""
+    group_id: str
+    booking_ids: List[str]
+    status: BookingStatus
+    created_at: datetime
@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+from src.models.seat_map import Seat
+from src.utils.enums import HoldStatus
+
+
+@dataclass
+class Hold:
+    hold_id: str
+    show_id: str
+    quantity: int
+    unit_price: int         # price locked in when the hold was taken
+    status: HoldStatus
+    created_at: datetime
+    expires_at: datetime
+    booking_id: Optional[str] = None   # set once confirmed
+    seats: Optional[List[Seat]] = None
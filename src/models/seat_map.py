@@ -0,0 +1,85 @@
+from __future__ import annotations
+from typing import Iterable, List, Optional, Tuple
+
+Seat = Tuple[int, int]  # (row, column), both 0-based
+
+
+def _free_runs(free: int) -> Iterable[Tuple[int, int]]:
+    """Yields (start_col, length) for each run of set bits in `free`, left to right."""
+    while free:
+        start = (free & -free).bit_length() - 1
+        shifted = free >> start
+        length = (shifted ^ (shifted + 1)).bit_length() - 1
+        yield start, length
+        free &= ~(((1 << length) - 1) << start)
+
+
+class SeatMap:
+    """
+    Compact per-show seat map: one int bitmap per row (bit set => seat taken).
+    - _max_run[row] caches the longest free run of each row, so picking a row for
+      N contiguous seats never scans bitmaps of rows that cannot fit.
+    - best_run is the longest free run in the hall; safe to read without the show lock
+      as a hint (BookingService re-checks under the lock).
+    - Not thread-safe by itself: mutated only under the owning show's lock.
+    """
+
+    def __init__(self, capacity: int, seats_per_row: int) -> None:
+        full_rows, last = divmod(capacity, seats_per_row)
+        self.row_len: List[int] = [seats_per_row] * full_rows + ([last] if last else [])
+        self._full: List[int] = [(1 << n) - 1 for n in self.row_len]
+        self.rows: List[int] = [0] * len(self.row_len)
+        self._max_run: List[int] = list(self.row_len)
+        self.best_run = max(self.row_len)
+
+    def allocate(self, n: int) -> Optional[List[Seat]]:
+        """
+        Best-fit allocation of n contiguous seats in a single row: the row whose longest
+        free run is the smallest that still fits, then the smallest fitting run in that row
+        (leftmost on ties). Returns None if no row has n contiguous free seats.
+        """
+        if n <= 0 or n > self.best_run:
+            return None
+        row = -1
+        for r, run in enumerate(self._max_run):
+            if run >= n and (row < 0 or run < self._max_run[row]):
+                row = r
+                if run == n:
+                    break
+
+        best_start, best_len = -1, 0
+        for start, length in _free_runs(~self.rows[row] & self._full[row]):
+            if length >= n and (best_start < 0 or length < best_len):
+                best_start, best_len = start, length
+                if length == n:
+                    break
+
+        self.rows[row] |= ((1 << n) - 1) << best_start
+        self._refresh(row)
+        return [(row, c) for c in range(best_start, best_start + n)]
+
+    def occupy(self, seats: Iterable[Seat]) -> None:
+        """Marks specific seats taken (e.g. replaying another store's allocation)."""
+        touched = set()
+        for row, col in seats:
+            self.rows[row] |= 1 << col
+            touched.add(row)
+        for row in touched:
+            self._refresh(row)
+
+    def release(self, seats: Iterable[Seat]) -> None:
+        touched = set()
+        for row, col in seats:
+            self.rows[row] &= ~(1 << col)
+            touched.add(row)
+        for row in touched:
+            self._refresh(row)
+
+    def free_count(self) -> int:
+        return sum(n - bin(bits).count("1") for n, bits in zip(self.row_len, self.rows))
+
+    def _refresh(self, row: int) -> None:
+        self._max_run[row] = max(
+            (length for _, length in _free_runs(~self.rows[row] & self._full[row])), default=0
+        )
+        self.best_run = max(self._max_run)
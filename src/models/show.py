@@ -1,5 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Optional
+from src.models.seat_map import SeatMap
 from src.utils.enums import ShowStatus
 
 
@@ -13,3 +15,5 @@ class Show:
     capacity: int
     seats_remaining: int
     status: ShowStatus = ShowStatus.REGISTERED
+    # Optional seat selection; None => plain seat count only
+    seat_map: Optional[SeatMap] = field(default=None, repr=False, compare=False)
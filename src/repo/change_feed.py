@@ -0,0 +1,161 @@
+from __future__ import annotations
+import asyncio
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple
+from src.utils.enums import EventType
+from src.utils.errors import FeedOffsetExpiredError
+from src.utils.memory import Usage, deep_sizeof
+
+
+@dataclass(frozen=True)
+class Event:
+    offset: int
+    type: EventType
+    data: Dict[str, Any]
+    ts: float = 0.0  # wall-clock publish time (time.time()), for replication lag
+
+
+_Slot = Tuple[EventType, Dict[str, Any], float]  # an Event minus its offset
+
+
+class ChangeFeed:
+    """
+    In-process change-data-capture feed.
+    - Bounded ring buffer; offsets increase monotonically from 0 and are never reused.
+    - Events older than `capacity` are overwritten; reading them raises FeedOffsetExpiredError.
+    - Consumers pull batches at their own pace (Subscription). With backpressure=True a
+      publisher waits up to publish_timeout for the slowest open subscription before
+      overwriting events it has not read yet. A subscription still that far behind when
+      the timeout expires is dropped from backpressure (its next read raises
+      FeedOffsetExpiredError), so a stalled or abandoned consumer costs writers one
+      timeout, not one per event. Store publishers hold show locks: keep it short.
+    - The ring stores (type, data, ts) slots built before taking the lock; readers turn
+      them into Events outside it, so publish only stores a slot and bumps the offset.
+    """
+
+    def __init__(
+        self, capacity: int = 65536, backpressure: bool = False, publish_timeout: float = 1.0
+    ) -> None:
+        self.capacity = capacity
+        self.backpressure = backpressure
+        self.publish_timeout = publish_timeout
+        self._buf: List[Optional[_Slot]] = [None] * capacity
+        self._next = 0
+        self._subs: Set[Subscription] = set()
+        self._cond = threading.Condition()
+
+    @property
+    def head(self) -> int:
+        """Offset the next published event will get."""
+        return self._next
+
+    @property
+    def tail(self) -> int:
+        """Oldest offset still retained."""
+        return max(0, self._next - self.capacity)
+
+    def memory_usage(self, sample: int = 64) -> Usage:
+        """Retained events (the ring buffer itself is preallocated at `capacity` slots)."""
+        with self._cond:
+            tail = self.tail
+            retained = self._next - tail
+            head = [self._buf[o % self.capacity] for o in range(tail, tail + min(sample, retained))]
+        seen: Set[int] = set()
+        per_event = sum(deep_sizeof(e, seen) for e in head) / len(head) if head else 0
+        size = sys.getsizeof(self._buf) + int(per_event * retained)
+        return {"change_feed": {"entries": retained, "bytes": size}}
+
+    def publish(self, type: EventType, **data: Any) -> int:
+        slot = (type, data, time.time())
+        with self._cond:
+            if self.backpressure and self._subs:
+                deadline = time.monotonic() + self.publish_timeout
+                while self._subs and self._next - self._slowest() >= self.capacity:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        # Give up on the laggards for good rather than stall every publish
+                        self._subs = {
+                            s for s in self._subs if self._next - s.offset < self.capacity
+                        }
+                        break
+                    self._cond.wait(remaining)
+            offset = self._next
+            self._buf[offset % self.capacity] = slot
+            self._next = offset + 1
+            self._cond.notify_all()
+            return offset
+
+    def _slowest(self) -> int:
+        return min(s.offset for s in self._subs)
+
+    def read(
+        self, offset: int, max_items: int = 100, timeout: Optional[float] = 0.0
+    ) -> List[Event]:
+        """
+        Returns up to max_items events starting at `offset`.
+        Waits up to `timeout` seconds (None => forever) when nothing is available yet.
+        """
+        with self._cond:
+            if offset >= self._next and timeout != 0.0:
+                self._cond.wait_for(lambda: offset < self._next, timeout)
+            if offset < self.tail:
+                raise FeedOffsetExpiredError(f"Feed offset expired: {offset} < {self.tail}")
+            end = min(self._next, offset + max_items)
+            slots = [self._buf[o % self.capacity] for o in range(offset, end)]
+        return [Event(o, *slot) for o, slot in zip(range(offset, end), slots)]  # type: ignore[misc]
+
+    def subscribe(self, from_offset: Optional[int] = None, batch_size: int = 100) -> Subscription:
+        """from_offset=None => only events published from now on."""
+        with self._cond:
+            sub = Subscription(self, self._next if from_offset is None else from_offset, batch_size)
+            self._subs.add(sub)
+            return sub
+
+    def _advance(self, sub: Subscription, offset: int) -> None:
+        with self._cond:
+            sub.offset = offset
+            self._cond.notify_all()
+
+    def _close(self, sub: Subscription) -> None:
+        with self._cond:
+            self._subs.discard(sub)
+            self._cond.notify_all()
+
+
+class Subscription:
+    """A consumer cursor. Iterate it (blocking) or `async for` it to get event batches."""
+
+    def __init__(self, feed: ChangeFeed, offset: int, batch_size: int) -> None:
+        self.feed = feed
+        self.offset = offset
+        self.batch_size = batch_size
+
+    def poll(self, timeout: Optional[float] = 0.0) -> List[Event]:
+        batch = self.feed.read(self.offset, self.batch_size, timeout)
+        if batch:
+            self.feed._advance(self, batch[-1].offset + 1)
+        return batch
+
+    def __iter__(self) -> Iterator[List[Event]]:
+        while True:
+            yield self.poll(timeout=None)
+
+    async def __aiter__(self) -> AsyncIterator[List[Event]]:
+        # Poll in a worker thread so the event loop is never blocked on the feed lock
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await loop.run_in_executor(None, self.poll, 0.1)
+            if batch:
+                yield batch
+
+    def close(self) -> None:
+        self.feed._close(self)
+
+    def __enter__(self) -> Subscription:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
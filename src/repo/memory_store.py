@@ -1,19 +1,26 @@
 from __future__ import annotations
 from collections import defaultdict
-from typing import Dict, List, Tuple
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 import threading
 
 from src.models.show import Show
-from src.models.booking import Booking
-from src.utils.enums import ShowStatus, BookingStatus
+from src.models.booking import Booking, BookingGroup
+from src.models.hold import Hold
+from src.models.seat_map import Seat, SeatMap
+from src.repo.change_feed import ChangeFeed
+from src.repo.rollups import RevenueRollups
+from src.utils.enums import ShowStatus, BookingStatus, HoldStatus, EventType
 from src.utils.errors import (
     ShowNotFoundError,
     BookingNotFoundError,
+    HoldNotFoundError,
     InvalidInputError,
 )
-from src.utils.ids import next_show_id, next_booking_id
-from src.utils.locks import ShowLockManager
+from src.utils.ids import IdGenerator, id_number
+from src.utils.locks import ShowLockManager, StripedLock
+from src.utils.memory import Usage, container_usage
 
 Key = Tuple[str, datetime]  # (movie, start_time)
 
@@ -24,30 +31,92 @@ class MemoryStore:
     - shows_by_id
     - shows_by_key[(movie, start_time)] -> [show_id,...]
     - bookings_by_id
+    - holds_by_id
+    - groups_by_id (split bookings; ids share the booking id namespace)
+    - bookings_by_customer[customer_id] -> [booking_id,...] in creation order
+    - tickets_by_customer_show[(customer_id, show_id)] -> live (uncancelled) tickets
     - revenue_by_cinema[cinema] -> int (rupees)
+    - rollups: gross/refunded aggregates by cinema × movie/show/day/hour
+    Every mutation is also published to `feed` (change-data-capture), in lock order.
+
+    Thread-safety does not rely on the GIL: per-show state changes under the show lock;
+    aggregates shared across shows (cinema revenue, customer index) use striped locks.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, lazy_status: bool = False, ids: Optional[IdGenerator] = None) -> None:
+        """
+        lazy_status: a REGISTERED show whose start_time has passed reads as STARTED
+        (see status_of) even before anything flips its stored status.
+        ids: id counters; each store gets its own unless one is shared explicitly.
+        """
+        self.lazy_status = lazy_status
+        self.ids = ids or IdGenerator()
         self.shows_by_id: Dict[str, Show] = {}
         self.shows_by_key: Dict[Key, List[str]] = defaultdict(list)
         self.bookings_by_id: Dict[str, Booking] = {}
+        self.holds_by_id: Dict[str, Hold] = {}
+        self.groups_by_id: Dict[str, BookingGroup] = {}
+        self.bookings_by_customer: Dict[str, List[str]] = defaultdict(list)
+        self.tickets_by_customer_show: Dict[Tuple[str, str], int] = defaultdict(int)
         self.revenue_by_cinema: Dict[str, int] = defaultdict(int)
         self.locks = ShowLockManager()
+        self._revenue_locks = StripedLock()    # by cinema
+        self._customer_locks = StripedLock()   # by customer_id
+        self.feed = ChangeFeed()
+        self.rollups = RevenueRollups()
 
         # Global registration lock to protect show creation & indexing
         self._register_lock = threading.Lock()
 
+    @contextmanager
+    def quiesced(self) -> Iterator[None]:
+        """
+        Blocks every store mutation for the duration: the registration lock, then every
+        show lock in show_id order (the same global order multi-show bookings use).
+        Used to cut consistent snapshots; keep the body short, bookers wait on it.
+        """
+        with self._register_lock, ExitStack() as stack:
+            for sid in sorted(self.shows_by_id):
+                stack.enter_context(self.locks.get(sid))
+            yield
+
+    def memory_usage(self, sample: int = 64) -> Usage:
+        """Entry counts and estimated bytes per index, rollups, lock table and change feed."""
+        indexes = {
+            "shows_by_id": self.shows_by_id,
+            "shows_by_key": self.shows_by_key,
+            "bookings_by_id": self.bookings_by_id,
+            "holds_by_id": self.holds_by_id,
+            "groups_by_id": self.groups_by_id,
+            "bookings_by_customer": self.bookings_by_customer,
+            "tickets_by_customer_show": self.tickets_by_customer_show,
+            "revenue_by_cinema": self.revenue_by_cinema,
+        }
+        usage = {name: container_usage(c, sample) for name, c in indexes.items()}
+        usage.update(self.rollups.memory_usage(sample))
+        usage.update(self.locks.memory_usage(sample))
+        usage.update(self.feed.memory_usage(sample))
+        return usage
+
     # ----- Show ops -----
     def create_show(
-        self, cinema: str, movie: str, start_time: datetime, price: int, capacity: int
+        self,
+        cinema: str,
+        movie: str,
+        start_time: datetime,
+        price: int,
+        capacity: int,
+        seats_per_row: Optional[int] = None,
     ) -> str:
         if price <= 0 or capacity <= 0:
             raise InvalidInputError("Price/Capacity must be positive")
+        if seats_per_row is not None and seats_per_row <= 0:
+            raise InvalidInputError("Seats per row must be positive")
 
         # <sync block start>
         # // Cinemas registering shows and capacities
         with self._register_lock:
-            sid = next_show_id()
+            sid = self.ids.next_show_id()
             show = Show(
                 show_id=sid,
                 cinema=cinema,
@@ -56,19 +125,44 @@ class MemoryStore:
                 price=price,
                 capacity=capacity,
                 seats_remaining=capacity,
+                seat_map=SeatMap(capacity, seats_per_row) if seats_per_row else None,
+            )
+            self._index_show_nolock(show)
+            self.feed.publish(
+                EventType.SHOW_REGISTERED,
+                show_id=sid,
+                cinema=cinema,
+                movie=movie,
+                start_time=start_time,
+                price=price,
+                capacity=capacity,
+                seats_per_row=seats_per_row,
             )
-            self.shows_by_id[sid] = show
-            self.shows_by_key[(movie, start_time)].append(sid)
         # <sync block end>
 
         return sid
 
+    def add_show(self, show: Show) -> None:
+        """Indexes a show built elsewhere under its existing id (replicas); not published."""
+        with self._register_lock:
+            self._index_show_nolock(show)
+
+    def _index_show_nolock(self, show: Show) -> None:
+        self.shows_by_id[show.show_id] = show
+        self.shows_by_key[(show.movie, show.start_time)].append(show.show_id)
+
     def get_show(self, show_id: str) -> Show:
         try:
             return self.shows_by_id[show_id]
         except KeyError:
             raise ShowNotFoundError(f"Show not found: {show_id}")
 
+    def status_of(self, show: Show, now: datetime) -> ShowStatus:
+        """Effective status at `now`; differs from show.status only in lazy mode."""
+        if self.lazy_status and show.status == ShowStatus.REGISTERED and now >= show.start_time:
+            return ShowStatus.STARTED
+        return show.status
+
     def save_show(self, show: Show) -> None:
         self.shows_by_id[show.show_id] = show
 
@@ -76,8 +170,17 @@ class MemoryStore:
         return [self.shows_by_id[sid] for sid in self.shows_by_key.get((movie, start_time), [])]
 
     # ----- Booking ops -----
-    def create_booking(self, show_id: str, qty: int, unit_price: int, now: datetime) -> str:
-        bid = next_booking_id()
+    def create_booking(
+        self,
+        show_id: str,
+        qty: int,
+        unit_price: int,
+        now: datetime,
+        seats: Optional[List[Seat]] = None,
+        group_id: Optional[str] = None,
+        customer_id: Optional[str] = None,
+    ) -> str:
+        bid = self.ids.next_booking_id()
         booking = Booking(
             booking_id=bid,
             show_id=show_id,
@@ -85,8 +188,24 @@ class MemoryStore:
             unit_price=unit_price,
             status=BookingStatus.CONFIRMED,
             created_at=now,
+            seats=seats,
+            group_id=group_id,
+            customer_id=customer_id,
         )
         self.bookings_by_id[bid] = booking
+        self.index_customer_booking(booking)
+        self.feed.publish(
+            EventType.BOOKING_CREATED,
+            booking_id=bid,
+            show_id=show_id,
+            quantity=qty,
+            unit_price=unit_price,
+            created_at=now,
+            seats=seats,
+            group_id=group_id,
+            customer_id=customer_id,
+            seats_remaining=self.shows_by_id[show_id].seats_remaining,
+        )
         return bid
 
     def get_booking(self, booking_id: str) -> Booking:
@@ -95,12 +214,121 @@ class MemoryStore:
         except KeyError:
             raise BookingNotFoundError(f"Booking not found: {booking_id}")
 
+    def add_booking(self, booking: Booking) -> None:
+        """
+        Stores a booking created elsewhere under its existing id (replicas); not published.
+        Advances the id counter so snapshots, which walk ids up to it, include the booking.
+        Called under the booking's show lock.
+        """
+        self.bookings_by_id[booking.booking_id] = booking
+        self.index_customer_booking(booking)
+        self.ids.advance_bookings(id_number(booking.booking_id))
+
     def save_booking(self, booking: Booking) -> None:
         self.bookings_by_id[booking.booking_id] = booking
 
+    def new_group_id(self) -> str:
+        return self.ids.next_booking_id()
+
+    def save_group(self, group: BookingGroup) -> None:
+        self.groups_by_id[group.group_id] = group
+
+    # ----- Customer index -----
+    def index_customer_booking(self, booking: Booking) -> None:
+        """Called under the booking's show lock when the booking is created."""
+        if booking.customer_id is None:
+            return
+        # One customer books on several shows at once: their list is shared across show locks
+        with self._customer_locks.for_key(booking.customer_id):
+            self.bookings_by_customer[booking.customer_id].append(booking.booking_id)
+        self.tickets_by_customer_show[(booking.customer_id, booking.show_id)] += booking.quantity
+
+    def release_customer_tickets(self, booking: Booking) -> None:
+        """Called under the booking's show lock when the booking is cancelled."""
+        if booking.customer_id is None:
+            return
+        key = (booking.customer_id, booking.show_id)
+        left = self.tickets_by_customer_show[key] - booking.quantity
+        if left > 0:
+            self.tickets_by_customer_show[key] = left
+        else:
+            del self.tickets_by_customer_show[key]
+
+    def customer_tickets(self, customer_id: str, show_id: str) -> int:
+        return self.tickets_by_customer_show.get((customer_id, show_id), 0)
+
+    def list_customer_bookings(
+        self, customer_id: str, limit: int = 20, cursor: Optional[int] = None
+    ) -> Tuple[List[Booking], Optional[int]]:
+        """
+        One page of a customer's bookings, most recent first, cancelled ones included.
+        Returns (bookings, next_cursor); next_cursor is None on the last page. The index
+        is append-only, so cursors stay valid while new bookings arrive.
+        """
+        if limit <= 0 or (cursor is not None and cursor < 0):
+            raise InvalidInputError("Limit must be positive and cursor non-negative")
+        with self._customer_locks.for_key(customer_id):
+            ids = self.bookings_by_customer.get(customer_id, [])
+            end = len(ids) if cursor is None else min(cursor, len(ids))
+            start = max(0, end - limit)
+            page_ids = ids[start:end]
+        page = [self.bookings_by_id[bid] for bid in reversed(page_ids)]
+        return page, (start if start > 0 else None)
+
+    # ----- Hold ops -----
+    def create_hold(
+        self,
+        show_id: str,
+        qty: int,
+        unit_price: int,
+        now: datetime,
+        expires_at: datetime,
+        seats: Optional[List[Seat]] = None,
+    ) -> str:
+        hid = self.ids.next_hold_id()
+        hold = Hold(
+            hold_id=hid,
+            show_id=show_id,
+            quantity=qty,
+            unit_price=unit_price,
+            status=HoldStatus.ACTIVE,
+            created_at=now,
+            expires_at=expires_at,
+            seats=seats,
+        )
+        self.holds_by_id[hid] = hold
+        self.feed.publish(
+            EventType.HOLD_CREATED,
+            hold_id=hid,
+            show_id=show_id,
+            quantity=qty,
+            unit_price=unit_price,
+            created_at=now,
+            expires_at=expires_at,
+            seats=seats,
+            seats_remaining=self.shows_by_id[show_id].seats_remaining,
+        )
+        return hid
+
+    def get_hold(self, hold_id: str) -> Hold:
+        try:
+            return self.holds_by_id[hold_id]
+        except KeyError:
+            raise HoldNotFoundError(f"Hold not found: {hold_id}")
+
+    def save_hold(self, hold: Hold) -> None:
+        self.holds_by_id[hold.hold_id] = hold
+
     # ----- Revenue -----
     def add_revenue(self, cinema: str, amount_rupees: int) -> None:
-        self.revenue_by_cinema[cinema] += amount_rupees
+        # Shows of one cinema post under different show locks; += is a read-modify-write
+        with self._revenue_locks.for_key(cinema):
+            self.revenue_by_cinema[cinema] += amount_rupees
+
+    def post_revenue(self, show: Show, amount_rupees: int, now: datetime) -> None:
+        """Posts a sale (>0) or refund (<0) to the cinema total and the rollups."""
+        self.add_revenue(show.cinema, amount_rupees)
+        self.rollups.record(show, amount_rupees, now)
 
     def get_revenue(self, cinema: str) -> int:
         return self.revenue_by_cinema.get(cinema, 0)
@@ -0,0 +1,314 @@
+"""
+Log shipping from a primary MemoryStore to read-only replicas.
+
+The primary's change feed already describes every mutation in lock order; LogShipper
+turns it into a compact JSONL mutation log on any text stream (file, pipe, socket):
+
+  {"o": 42, "ts": 1755680400.12, "t": "BOOKING_CREATED", "d": {"booking_id": "B00007", ...}}
+  {"hb": 43, "ts": 1755680401.13}          # heartbeat while idle: primary head + time
+
+Replica applies the records, strictly in offset order, to its own MemoryStore. A shipper
+that fails (feed offset expired, broken pipe) records the error and stops; heartbeats then
+stop too, and the replica's lag() keeps growing instead of reporting it caught up. Readers
+of the replica never touch the primary's locks, so read traffic scales out without
+contending with bookers. Shipping starts at offset 0, so the primary's feed must still
+retain it when a replica is attached (size ChangeFeed.capacity accordingly).
+"""
+
+from __future__ import annotations
+import json
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, TextIO
+
+from src.models.booking import Booking, BookingGroup
+from src.models.hold import Hold
+from src.models.seat_map import SeatMap
+from src.models.show import Show
+from src.repo.change_feed import ChangeFeed, Event
+from src.repo.memory_store import MemoryStore
+from src.utils.clock import Clock, SystemClock
+from src.utils.enums import BookingStatus, EventType, HoldStatus, ShowStatus
+from src.utils.errors import ReplicationError
+
+_DATETIME_FIELDS = ("start_time", "created_at", "expires_at", "cancelled_at")
+
+
+def encode_event(event: Event) -> str:
+    data = {k: v.isoformat() if isinstance(v, datetime) else v for k, v in event.data.items()}
+    record = {"o": event.offset, "ts": event.ts, "t": event.type.name, "d": data}
+    return json.dumps(record, separators=(",", ":")) + "\n"
+
+
+def _decode_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    for name in _DATETIME_FIELDS:
+        if data.get(name) is not None:
+            data[name] = datetime.fromisoformat(data[name])
+    if data.get("seats") is not None:
+        data["seats"] = [tuple(seat) for seat in data["seats"]]
+    return data
+
+
+class LogShipper:
+    """
+    Tails a ChangeFeed and writes mutation records to `out`, one flush per batch.
+    Runs in its own thread (start/stop) or is pumped manually with ship().
+    If shipping fails in the thread, the error is kept in `error`, the thread ends with it
+    (reported by threading.excepthook) and stop() raises ReplicationError.
+    """
+
+    def __init__(
+        self,
+        feed: ChangeFeed,
+        out: TextIO,
+        from_offset: int = 0,
+        batch_size: int = 500,
+        heartbeat: float = 1.0,
+    ) -> None:
+        self.feed = feed
+        self.out = out
+        self.heartbeat = heartbeat
+        self._sub = feed.subscribe(from_offset, batch_size)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.error: Optional[BaseException] = None
+
+    def ship(self, timeout: Optional[float] = 0.0) -> int:
+        """
+        Writes the next batch, or a heartbeat if none arrives within `timeout`.
+        Returns the number of events written.
+        """
+        batch = self._sub.poll(timeout)
+        if batch:
+            self.out.write("".join(encode_event(e) for e in batch))
+        else:
+            self.out.write(json.dumps({"hb": self.feed.head, "ts": time.time()}) + "\n")
+        self.out.flush()
+        return len(batch)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="log-shipper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        try:
+            if self.error is not None:
+                raise ReplicationError(f"Log shipping failed: {self.error}") from self.error
+            while self.ship():  # drain what was published before stop()
+                pass
+        finally:
+            self._sub.close()
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                self.ship(timeout=self.heartbeat)
+        except BaseException as e:
+            self.error = e
+            raise
+
+
+@dataclass(frozen=True)
+class ReplicationLag:
+    offsets: int     # primary events known to exist but not applied yet
+    # Primary time between the newest known event and the last applied one; at least the
+    # time since anything arrived once that exceeds the heartbeat interval
+    seconds: float
+
+
+class Replica:
+    """
+    Applies a primary's mutation log to a local MemoryStore.
+    - Records must arrive in offset order; duplicates (offset already applied) are skipped,
+      so a shipper can be restarted from an earlier offset. A gap raises ReplicationError.
+    - Each record is applied under the same per-show lock the primary used, so replica
+      readers see the same per-show atomicity as primary readers.
+    - Applied records are re-published to the local store's feed under the same offsets,
+      so the replica's store supports consistent snapshots (exports) like a primary's.
+    """
+
+    def __init__(
+        self,
+        store: Optional[MemoryStore] = None,
+        heartbeat: float = 1.0,
+        clock: Optional[Clock] = None,
+    ) -> None:
+        """heartbeat: the shipper's interval; longer silence counts as lag (see lag())."""
+        self.store = store or MemoryStore()
+        self.heartbeat = heartbeat
+        self.clock = clock or SystemClock()
+        self._last_heard = self.clock.now()
+        self.offset = self.store.feed.head  # next offset expected (mirrors the local feed)
+        self._applied_ts = 0.0
+        self._primary_head = 0
+        self._primary_ts = 0.0
+        self._lock = threading.Lock()   # one applier at a time
+
+    def apply_line(self, line: str) -> None:
+        line = line.strip()
+        if line:
+            self.apply(json.loads(line))
+
+    def apply(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._last_heard = self.clock.now()
+            ts = record.get("ts", 0.0)
+            if "hb" in record:
+                self._primary_head = max(self._primary_head, record["hb"])
+                self._primary_ts = max(self._primary_ts, ts)
+                return
+            offset = record["o"]
+            if offset < self.offset:
+                return
+            if offset > self.offset:
+                raise ReplicationError(f"Replication gap: expected {self.offset}, got {offset}")
+            handler = getattr(self, "_on_" + record["t"].lower())
+            handler(_decode_data(dict(record["d"])))
+            self.offset = offset + 1
+            self._applied_ts = ts
+            self._primary_head = max(self._primary_head, self.offset)
+            self._primary_ts = max(self._primary_ts, ts)
+
+    def follow(self, f: TextIO, stop: Optional[threading.Event] = None) -> None:
+        """Applies records from `f` until EOF (or `stop` is set between records)."""
+        for line in f:
+            self.apply_line(line)
+            if stop is not None and stop.is_set():
+                break
+
+    def lag(self) -> ReplicationLag:
+        with self._lock:
+            behind = max(0, self._primary_head - self.offset)
+            seconds = max(0.0, self._primary_ts - self._applied_ts) if behind else 0.0
+            silence = self.clock.now() - self._last_heard
+            if silence > timedelta(seconds=self.heartbeat):
+                # Not even a heartbeat: the shipper or primary is gone, so whatever
+                # happened since is missing here
+                seconds = max(seconds, silence.total_seconds())
+            return ReplicationLag(behind, seconds)
+
+    # ----- record handlers -----
+    def _on_show_registered(self, d: Dict[str, Any]) -> None:
+        seats_per_row = d["seats_per_row"]
+        show = Show(
+            show_id=d["show_id"],
+            cinema=d["cinema"],
+            movie=d["movie"],
+            start_time=d["start_time"],
+            price=d["price"],
+            capacity=d["capacity"],
+            seats_remaining=d["capacity"],
+            seat_map=SeatMap(d["capacity"], seats_per_row) if seats_per_row else None,
+        )
+        self.store.add_show(show)
+        self._mirror(EventType.SHOW_REGISTERED, d)
+
+    def _on_show_started(self, d: Dict[str, Any]) -> None:
+        self._set_status(EventType.SHOW_STARTED, d, ShowStatus.STARTED)
+
+    def _on_show_ended(self, d: Dict[str, Any]) -> None:
+        self._set_status(EventType.SHOW_ENDED, d, ShowStatus.ENDED)
+
+    def _set_status(self, type: EventType, d: Dict[str, Any], status: ShowStatus) -> None:
+        with self.store.locks.get(d["show_id"]):
+            self.store.get_show(d["show_id"]).status = status
+            self._mirror(type, d)
+
+    def _on_price_updated(self, d: Dict[str, Any]) -> None:
+        with self.store.locks.get(d["show_id"]):
+            self.store.get_show(d["show_id"]).price = d["price"]
+            self._mirror(EventType.PRICE_UPDATED, d)
+
+    def _on_booking_created(self, d: Dict[str, Any]) -> None:
+        with self.store.locks.get(d["show_id"]):
+            show = self.store.get_show(d["show_id"])
+            booking = Booking(
+                booking_id=d["booking_id"],
+                show_id=show.show_id,
+                quantity=d["quantity"],
+                unit_price=d["unit_price"],
+                status=BookingStatus.CONFIRMED,
+                created_at=d["created_at"],
+                seats=d["seats"],
+                group_id=d["group_id"],
+                customer_id=d.get("customer_id"),
+            )
+            self.store.add_booking(booking)
+            if show.seat_map is not None and booking.seats:
+                show.seat_map.occupy(booking.seats)
+            show.seats_remaining = d["seats_remaining"]
+            self.store.post_revenue(show, booking.unit_price * booking.quantity, booking.created_at)
+            self._mirror(EventType.BOOKING_CREATED, d)
+        if booking.group_id is not None:
+            group = self.store.groups_by_id.get(booking.group_id)
+            if group is None:
+                group = BookingGroup(
+                    booking.group_id, [], BookingStatus.CONFIRMED, booking.created_at
+                )
+                self.store.save_group(group)
+            group.booking_ids.append(booking.booking_id)
+
+    def _on_booking_cancelled(self, d: Dict[str, Any]) -> None:
+        with self.store.locks.get(d["show_id"]):
+            show = self.store.get_show(d["show_id"])
+            booking = self.store.get_booking(d["booking_id"])
+            booking.status = BookingStatus.CANCELLED
+            self.store.release_customer_tickets(booking)
+            if d["seats_restored"] and show.seat_map is not None and booking.seats:
+                show.seat_map.release(booking.seats)
+            show.seats_remaining = d["seats_remaining"]
+            if d["refund"]:
+                self.store.post_revenue(show, -d["refund"], d["cancelled_at"])
+            booking.cancelled_seq = self._mirror(EventType.BOOKING_CANCELLED, d)
+        if booking.group_id is not None:
+            group = self.store.groups_by_id[booking.group_id]
+            if all(
+                self.store.get_booking(bid).status == BookingStatus.CANCELLED
+                for bid in group.booking_ids
+            ):
+                group.status = BookingStatus.CANCELLED
+
+    def _on_hold_created(self, d: Dict[str, Any]) -> None:
+        with self.store.locks.get(d["show_id"]):
+            show = self.store.get_show(d["show_id"])
+            hold = Hold(
+                hold_id=d["hold_id"],
+                show_id=show.show_id,
+                quantity=d["quantity"],
+                unit_price=d["unit_price"],
+                status=HoldStatus.ACTIVE,
+                created_at=d["created_at"],
+                expires_at=d["expires_at"],
+                seats=d["seats"],
+            )
+            self.store.save_hold(hold)
+            if show.seat_map is not None and hold.seats:
+                show.seat_map.occupy(hold.seats)
+            show.seats_remaining = d["seats_remaining"]
+            self._mirror(EventType.HOLD_CREATED, d)
+
+    def _on_hold_confirmed(self, d: Dict[str, Any]) -> None:
+        hold = self.store.get_hold(d["hold_id"])
+        with self.store.locks.get(hold.show_id):
+            hold.status = HoldStatus.CONFIRMED
+            hold.booking_id = d["booking_id"]
+            self._mirror(EventType.HOLD_CONFIRMED, d)
+
+    def _on_hold_released(self, d: Dict[str, Any]) -> None:
+        with self.store.locks.get(d["show_id"]):
+            show = self.store.get_show(d["show_id"])
+            hold = self.store.get_hold(d["hold_id"])
+            hold.status = HoldStatus.RELEASED
+            if d["seats_restored"] and show.seat_map is not None and hold.seats:
+                show.seat_map.release(hold.seats)
+            show.seats_remaining = d["seats_remaining"]
+            self._mirror(EventType.HOLD_RELEASED, d)
+
+    def _mirror(self, type: EventType, d: Dict[str, Any]) -> int:
+        # Same offset as on the primary: both feeds start empty and apply() goes in order
+        return self.store.feed.publish(type, **d)
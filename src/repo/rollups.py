@@ -0,0 +1,92 @@
+from __future__ import annotations
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Tuple
+from src.models.show import Show
+from src.utils.locks import StripedLock
+from src.utils.memory import Usage, container_usage, nested_usage
+
+# Dimensions maintained per cinema; keys are rendered as CLI-friendly strings
+DIMENSIONS = ("movie", "show", "day", "hour", "movie_day")
+
+
+class Totals:
+    __slots__ = ("gross", "refunded")
+
+    def __init__(self) -> None:
+        self.gross = 0
+        self.refunded = 0
+
+    @property
+    def net(self) -> int:
+        return self.gross - self.refunded
+
+    def copy(self) -> Totals:
+        t = Totals()
+        t.gross, t.refunded = self.gross, self.refunded
+        return t
+
+    def __repr__(self) -> str:
+        return f"Totals(gross={self.gross}, refunded={self.refunded})"
+
+
+class RevenueRollups:
+    """
+    Incrementally maintained revenue aggregates (gross vs refunded), per cinema and
+    per dimension: movie, show, day, hour and movie×day.
+    - record() is O(1) (one dict update per dimension) and is called inside the same
+      per-show critical section that posts the revenue.
+    - Sales and refunds are bucketed by transaction time (cash-flow view): a refund
+      lands in the day/hour the booking was cancelled.
+    """
+
+    def __init__(self) -> None:
+        self._cinema: Dict[str, Totals] = defaultdict(Totals)
+        # (dimension, cinema) -> {bucket: Totals}
+        self._by: Dict[Tuple[str, str], Dict[str, Totals]] = defaultdict(
+            lambda: defaultdict(Totals)
+        )
+        # All state is keyed by cinema, so cinemas on different stripes never contend;
+        # keep these critical sections tiny
+        self._locks = StripedLock()
+
+    def record(self, show: Show, amount: int, when: datetime) -> None:
+        """amount > 0 => sale, amount < 0 => refund."""
+        day = when.strftime("%Y-%m-%d")
+        keys = (
+            ("movie", show.movie),
+            ("show", show.show_id),
+            ("day", day),
+            ("hour", when.strftime("%Y-%m-%dT%H")),
+            ("movie_day", f"{show.movie}@{day}"),
+        )
+        with self._locks.for_key(show.cinema):
+            buckets = [self._cinema[show.cinema]]
+            buckets += [self._by[(dim, show.cinema)][value] for dim, value in keys]
+            for t in buckets:
+                if amount >= 0:
+                    t.gross += amount
+                else:
+                    t.refunded -= amount
+
+    def memory_usage(self, sample: int = 64) -> Usage:
+        """Buckets per cinema × dimension; every new show, day and hour adds some, forever."""
+        usage = nested_usage(self._by, sample)
+        cinemas = container_usage(self._cinema, sample)
+        return {
+            "revenue_rollups": {
+                "entries": usage["entries"] + cinemas["entries"],
+                "bytes": usage["bytes"] + cinemas["bytes"],
+            }
+        }
+
+    def totals(self, cinema: str) -> Totals:
+        with self._locks.for_key(cinema):
+            t = self._cinema.get(cinema)
+            return t.copy() if t is not None else Totals()
+
+    def breakdown(self, cinema: str, dimension: str) -> Dict[str, Totals]:
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown revenue dimension: {dimension}")
+        with self._locks.for_key(cinema):
+            return {k: t.copy() for k, t in self._by.get((dimension, cinema), {}).items()}
@@ -0,0 +1,111 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Iterator, List, Sequence, Tuple
+
+from src.repo.memory_store import MemoryStore
+from src.utils.enums import BookingStatus
+from src.utils.ids import booking_id, id_number
+
+# (name, type) per column; types: "str" | "int" | "datetime" (all nullable)
+Columns = Sequence[Tuple[str, str]]
+
+BOOKING_COLUMNS: Columns = (
+    ("booking_id", "str"),
+    ("show_id", "str"),
+    ("quantity", "int"),
+    ("unit_price", "int"),
+    ("amount", "int"),
+    ("status", "str"),
+    ("created_at", "datetime"),
+    ("group_id", "str"),
+    ("customer_id", "str"),
+)
+SHOW_COLUMNS: Columns = (
+    ("show_id", "str"),
+    ("cinema", "str"),
+    ("movie", "str"),
+    ("start_time", "datetime"),
+    ("price", "int"),
+    ("capacity", "int"),
+    ("seats_remaining", "int"),
+    ("status", "str"),
+)
+REVENUE_COLUMNS: Columns = (
+    ("cinema", "str"),
+    ("revenue", "int"),
+    ("gross", "int"),
+    ("refunded", "int"),
+    ("net", "int"),
+)
+
+
+@dataclass(frozen=True)
+class Table:
+    name: str
+    columns: Columns
+    rows: Iterator[tuple]
+
+
+class StoreSnapshot:
+    """
+    Point-in-time view of a store that is cheap to take and streams without locks.
+    - The constructor quiesces the store only long enough to note the change-feed offset and
+      the last minted booking number and to copy the small tables (shows, revenue).
+    - Bookings are not copied: iter_bookings() walks booking ids 1..last in id order and
+      shows each booking as of the cut: later bookings have higher ids, and a later
+      cancellation is recognised by its change-feed offset (Booking.cancelled_seq).
+    Memory is O(shows + cinemas), independent of the number of bookings.
+    """
+
+    def __init__(self, store: MemoryStore) -> None:
+        self.store = store
+        with store.quiesced():
+            self.offset = store.feed.head
+            self.last_booking = store.ids.last_booking_number
+            self.shows: List[tuple] = [
+                (
+                    s.show_id,
+                    s.cinema,
+                    s.movie,
+                    s.start_time,
+                    s.price,
+                    s.capacity,
+                    s.seats_remaining,
+                    s.status.name,  # stored status; lazy-status reads derive STARTED
+                )
+                for s in store.shows_by_id.values()
+            ]
+            self.revenue: List[tuple] = []
+            for cinema, revenue in sorted(store.revenue_by_cinema.items()):
+                t = store.rollups.totals(cinema)
+                self.revenue.append((cinema, revenue, t.gross, t.refunded, t.net))
+        self.shows.sort(key=lambda row: id_number(row[0]))  # id order, outside the quiesce
+
+    def iter_bookings(self) -> Iterator[tuple]:
+        bookings = self.store.bookings_by_id
+        for n in range(1, self.last_booking + 1):
+            b = bookings.get(booking_id(n))
+            if b is None:
+                continue  # split-group id (shares the booking id namespace)
+            status = b.status
+            seq = b.cancelled_seq
+            if status == BookingStatus.CANCELLED and (seq is None or seq >= self.offset):
+                status = BookingStatus.CONFIRMED  # cancelled after the cut
+            yield (
+                b.booking_id,
+                b.show_id,
+                b.quantity,
+                b.unit_price,
+                b.quantity * b.unit_price,
+                status.name,
+                b.created_at,
+                b.group_id,
+                b.customer_id,
+            )
+
+    def tables(self) -> List[Table]:
+        return [
+            Table("bookings", BOOKING_COLUMNS, self.iter_bookings()),
+            Table("shows", SHOW_COLUMNS, iter(self.shows)),
+            Table("revenue", REVENUE_COLUMNS, iter(self.revenue)),
+        ]
@@ -0,0 +1,103 @@
+from __future__ import annotations
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Tuple
+from src.utils.errors import AdmissionRejectedError
+from src.utils.memory import Usage, container_usage
+
+Key = Tuple[str, datetime]  # (movie, start_time)
+
+
+@dataclass
+class AdmissionConfig:
+    """
+    rate_per_sec / burst: token bucket per (movie, start_time); rate 0 disables it.
+    max_in_flight: orders allowed inside BookingService at once; 0 disables it.
+    queue_timeout: seconds a request may wait for a token/slot; 0 => fast reject.
+    """
+    rate_per_sec: float = 0.0
+    burst: int = 1
+    max_in_flight: int = 0
+    queue_timeout: float = 0.0
+
+
+class TokenBucket:
+    def __init__(self, rate_per_sec: float, burst: int) -> None:
+        self.rate = rate_per_sec
+        self.capacity = float(burst)
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_take(self) -> float:
+        """Takes one token. Returns 0.0 on success, else seconds until a token is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            return (1.0 - self._tokens) / self.rate
+
+
+class AdmissionController:
+    """
+    Gatekeeper in front of BookingService.order_tickets so a hot show key cannot
+    pile thousands of threads onto one show lock.
+    """
+
+    def __init__(self, config: AdmissionConfig) -> None:
+        self.config = config
+        self._buckets: Dict[Key, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+        self._in_flight: Optional[threading.BoundedSemaphore] = (
+            threading.BoundedSemaphore(config.max_in_flight) if config.max_in_flight > 0 else None
+        )
+
+    @contextmanager
+    def admit(self, key: Key) -> Iterator[None]:
+        deadline = time.monotonic() + self.config.queue_timeout
+
+        if self.config.rate_per_sec > 0:
+            bucket = self._bucket(key)
+            while True:
+                wait = bucket.try_take()
+                if wait == 0.0:
+                    break
+                if time.monotonic() + wait > deadline:
+                    raise AdmissionRejectedError("Admission rejected: rate limited")
+                time.sleep(wait)
+
+        if self._in_flight is None:
+            yield
+            return
+
+        remaining = max(deadline - time.monotonic(), 0.0)
+        if remaining > 0:
+            acquired = self._in_flight.acquire(timeout=remaining)
+        else:
+            acquired = self._in_flight.acquire(blocking=False)
+        if not acquired:
+            raise AdmissionRejectedError("Admission rejected: too many in flight")
+        try:
+            yield
+        finally:
+            self._in_flight.release()
+
+    def memory_usage(self, sample: int = 64) -> Usage:
+        """One token bucket per (movie, start_time) ever ordered; never evicted."""
+        with self._buckets_lock:
+            return {"admission_buckets": container_usage(self._buckets, sample)}
+
+    def _bucket(self, key: Key) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._buckets_lock:
+                bucket = self._buckets.setdefault(
+                    key, TokenBucket(self.config.rate_per_sec, self.config.burst)
+                )
+        return bucket
@@ -1,25 +1,81 @@
 from __future__ import annotations
+from collections import defaultdict
+from concurrent.futures import Future
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Tuple, List
+from itertools import combinations
+from typing import Dict, Iterable, Iterator, Tuple, List, Optional
 from src.repo.memory_store import MemoryStore
-from src.utils.enums import ShowStatus, BookingStatus
+from src.services.waitlist import Waitlist, WaitlistEntry
+from src.utils.enums import ShowStatus, BookingStatus, EventType
 from src.utils.errors import (
     BookingUnavailableError,
     ShowAlreadyStartedError,
     BookingAlreadyCancelledError,
+    InvalidInputError,
+    CustomerLimitExceededError,
+    DomainError,
 )
+from src.models.booking import Booking, BookingGroup
 from src.models.show import Show
+from src.models.seat_map import Seat
+
+# Up to this many sellable screens per slot, split plans are searched exhaustively
+_SPLIT_EXHAUSTIVE_MAX = 12
+
+
+@dataclass
+class BulkCancelResult:
+    refunds: Dict[str, int] = field(default_factory=dict)           # cancelled id -> refund
+    errors: Dict[str, DomainError] = field(default_factory=dict)    # id -> why it was skipped
+    total_refund: int = 0
 
 
 class BookingService:
-    def __init__(self, store: MemoryStore) -> None:
+    def __init__(self, store: MemoryStore, max_tickets_per_customer: Optional[int] = None) -> None:
+        """max_tickets_per_customer: cap on live tickets one customer holds for one show."""
         self.store = store
+        self.waitlist = Waitlist()
+        self.max_tickets_per_customer = max_tickets_per_customer
 
     # ---------- ORDER ----------
-    def order_tickets(self, movie: str, start_time: datetime, qty: int, now: datetime) -> Tuple[str, str]:
+    def order_tickets(
+        self,
+        movie: str,
+        start_time: datetime,
+        qty: int,
+        now: datetime,
+        customer_id: Optional[str] = None,
+    ) -> Tuple[str, str]:
         """
         Returns: (booking_id, show_id)
-        Selection: among matching (movie, start_time) shows, choose cheapest with seats and not started/ended.
+        Selection: among matching (movie, start_time) shows, choose cheapest with seats
+        and not started/ended.
+        customer_id: recorded on the booking and checked against the per-customer limit.
+        """
+        while True:
+            # The lock-free pick reads Show fields that other threads are changing; only the
+            # re-check under the lock counts. If the pick went stale (sold out / started in
+            # between), pick again: another order or a start made progress meanwhile.
+            chosen = self.pick_show(movie, start_time, qty, now)
+
+            lock = self.store.locks.get(chosen.show_id)
+            with lock:
+                # <async block start>
+                # // Concurrent booking and cancellation requests
+                s = self.store.get_show(chosen.show_id)
+                sellable = self.store.status_of(s, now) == ShowStatus.REGISTERED
+                if not sellable or not self.can_seat(s, qty):
+                    continue
+                bid = self._book_locked(s, qty, now, customer_id)
+                # <async block end>
+                return bid, s.show_id
+
+    def pick_show(self, movie: str, start_time: datetime, qty: int, now: datetime) -> Show:
+        """
+        Lock-free candidate selection; the caller must re-validate under the show lock.
+        Raises ShowAlreadyStartedError / BookingUnavailableError when nothing fits.
         """
         shows = self.store.list_shows_by_key(movie, start_time)
         if not shows:
@@ -29,11 +85,12 @@ class BookingService:
         candidates: List[Show] = []
         any_started = False
         for s in shows:
-            if s.status in (ShowStatus.STARTED, ShowStatus.ENDED):
-                if s.status == ShowStatus.STARTED:
+            status = self.store.status_of(s, now)
+            if status in (ShowStatus.STARTED, ShowStatus.ENDED):
+                if status == ShowStatus.STARTED:
                     any_started = True
                 continue
-            if s.seats_remaining >= qty:
+            if self.can_seat(s, qty):
                 candidates.append(s)
 
         if not candidates:
@@ -43,41 +100,114 @@ class BookingService:
 
         # choose cheapest; tie-breaker: smallest show_id (earliest registration)
         candidates.sort(key=lambda s: (s.price, s.show_id))
-        chosen = candidates[0]
+        return candidates[0]
 
-        lock = self.store.locks.get(chosen.show_id)
-        with lock:
-            # <async block start>
-            # // Concurrent booking and cancellation requests
-            s = self.store.get_show(chosen.show_id)
-            if s.status != ShowStatus.REGISTERED:
-                raise ShowAlreadyStartedError("Show already started")
-            if s.seats_remaining < qty:
+    def order_or_wait(self, movie: str, start_time: datetime, qty: int, now: datetime) -> Future:
+        """
+        Like order_tickets, but if no show has enough seats the request joins the FIFO
+        waitlist for (movie, start_time) instead of failing.
+        Returns a Future resolved with (booking_id, show_id); it is already done when
+        the order succeeded immediately. The caller may future.cancel() to leave the queue.
+        Errors are raised directly only when no show of the slot is still REGISTERED
+        (nothing will ever free up) or none of those could seat qty even when empty.
+        """
+        fut: Future = Future()
+        try:
+            fut.set_result(self.order_tickets(movie, start_time, qty, now))
+            return fut
+        except (BookingUnavailableError, ShowAlreadyStartedError):
+            # Some shows may have started while the rest are full: cancellations on
+            # the REGISTERED ones can still free seats, so queue for those
+            open_shows = self._open_shows(movie, start_time, now)
+            if not open_shows:
+                raise
+            # Never queue a request that no show could hold even when empty: as the
+            # strict-FIFO head it would block every waiter behind it for good
+            if qty > max(_max_party(s) for s in open_shows):
                 raise BookingUnavailableError("Booking unavailable")
 
-            # Mutations guarded by per-show lock
-            s.seats_remaining -= qty
-            self.store.save_show(s)
+        entry = self.waitlist.enqueue(movie, start_time, qty, now)
+        # A cancellation may have freed seats between the failed order and the enqueue;
+        # sweep every show once so such seats are not left unclaimed.
+        for s in self.store.list_shows_by_key(movie, start_time):
+            with self.store.locks.get(s.show_id):
+                served = self.serve_waitlist_locked(s, now)
+            self.notify_waiters(served)
+            if entry.future.done():
+                break
+        # Shows may have stopped selling between the failed order and the enqueue; the
+        # show service then pruned the queue before this entry joined it.
+        self.close_waitlist(movie, start_time, now)
+        return entry.future
 
-            bid = self.store.create_booking(s.show_id, qty, s.price, now)
-            self.store.add_revenue(s.cinema, s.price * qty)
-            # <async block end>
-            return bid, s.show_id
+    def order_tickets_split(
+        self,
+        movie: str,
+        start_time: datetime,
+        qty: int,
+        now: datetime,
+        customer_id: Optional[str] = None,
+    ) -> Tuple[str, List[str]]:
+        """
+        Split-booking mode. Returns (booking_id, [show_id, ...]).
+        If one show can take the whole batch this is a normal order. Otherwise the batch
+        is spread over the fewest shows of the (movie, start_time) slot, cheapest total
+        first, and committed atomically as one composite booking whose id cancels all
+        parts. Involved show locks are taken in show_id order (deadlock-free).
+        """
+        try:
+            bid, sid = self.order_tickets(movie, start_time, qty, now, customer_id)
+            return bid, [sid]
+        except (BookingUnavailableError, ShowAlreadyStartedError) as e:
+            # A started show in the slot does not stop a split over the others
+            error: DomainError = e
+
+        sellable = self._open_shows(movie, start_time, now)
+        if not sellable:
+            raise error
+        plan = _plan_split(sellable, qty)
+        shows = {s.show_id: s for s, _ in plan}
+
+        with self._locked(shows):
+            # Re-validate the whole plan before mutating anything
+            for s, n in plan:
+                open_for_sale = self.store.status_of(s, now) == ShowStatus.REGISTERED
+                if not open_for_sale or not self.can_seat(s, n):
+                    raise BookingUnavailableError("Booking unavailable")
+                self._check_customer_limit_locked(s, n, customer_id)
+            gid = self.store.new_group_id()
+            bids = []
+            for s, n in plan:
+                seats = self.take_seats_locked(s, n)
+                bids.append(
+                    self.store.create_booking(s.show_id, n, s.price, now, seats, gid, customer_id)
+                )
+                self.store.post_revenue(s, s.price * n, now)
+            self.store.save_group(BookingGroup(gid, bids, BookingStatus.CONFIRMED, now))
+        return gid, [s.show_id for s, _ in plan]
 
     # ---------- CANCEL ----------
     def cancel_booking(self, booking_id: str, now: datetime) -> int:
         """
         Cancels entire booking (batch). Returns refund amount (int rupees).
-        Before start => 50% refund and seats restored.
+        Before start => 50% refund and seats restored; restored seats go to waitlisted
+        requests first (FIFO) before becoming generally available.
         After start/ended => 0% refund and seats NOT restored.
+        A split booking id cancels all of its parts atomically (refunds summed).
         """
+        if booking_id in self.store.groups_by_id:
+            return self._cancel_group(booking_id, now)
+
         booking = self.store.get_booking(booking_id)
         if booking.status == BookingStatus.CANCELLED:
             raise BookingAlreadyCancelledError("Booking already cancelled")
+        if booking.group_id is not None:
+            raise InvalidInputError("Booking is part of a split booking; cancel the group")
 
         show = self.store.get_show(booking.show_id)
         lock = self.store.locks.get(show.show_id)
 
+        served: List[Tuple[WaitlistEntry, str]] = []
         with lock:
             # <async block start>
             # // Concurrent booking and cancellation requests
@@ -87,17 +217,282 @@ class BookingService:
             if booking.status == BookingStatus.CANCELLED:
                 raise BookingAlreadyCancelledError("Booking already cancelled")
 
-            if show.status == ShowStatus.REGISTERED:
-                # Before start → refund 50% and restore seats
-                refund = (booking.unit_price * booking.quantity) // 2
-                show.seats_remaining += booking.quantity
-                self.store.save_show(show)
-                self.store.add_revenue(show.cinema, -refund)
-            else:
-                # STARTED or ENDED → no refund, no seat return
-                refund = 0
+            refund = self._cancel_locked(booking, show, now)
 
-            booking.status = BookingStatus.CANCELLED
-            self.store.save_booking(booking)
+            # No-op unless seats were restored (show still REGISTERED)
+            served = self.serve_waitlist_locked(show, now)
             # <async block end>
-            return refund
+
+        # Resolve futures outside the show lock so waiter callbacks cannot block bookers
+        self.notify_waiters(served)
+        return refund
+
+    def cancel_bookings_bulk(self, booking_ids: Iterable[str], now: datetime) -> BulkCancelResult:
+        """
+        Cancels many bookings with the same rules as cancel_booking, but grouped by show:
+        each show lock is taken once, one after another (never two at a time), and the
+        refunds of a show are posted as one revenue delta. A failing id (not found,
+        already cancelled, part of a split) is reported in `errors` and does not stop
+        the rest. Split-booking ids are cancelled as units after the per-show pass.
+        Duplicate ids are processed once.
+        """
+        result = BulkCancelResult()
+        by_show: Dict[str, List[str]] = defaultdict(list)
+        groups: List[str] = []
+        for bid in dict.fromkeys(booking_ids):
+            if bid in self.store.groups_by_id:
+                groups.append(bid)
+                continue
+            try:
+                booking = self.store.get_booking(bid)
+            except DomainError as e:
+                result.errors[bid] = e
+                continue
+            by_show[booking.show_id].append(bid)
+
+        for show_id in sorted(by_show):
+            served: List[Tuple[WaitlistEntry, str]] = []
+            with self.store.locks.get(show_id):
+                show = self.store.get_show(show_id)
+                show_refund = 0
+                for bid in by_show[show_id]:
+                    booking = self.store.get_booking(bid)
+                    if booking.status == BookingStatus.CANCELLED:
+                        result.errors[bid] = BookingAlreadyCancelledError(
+                            "Booking already cancelled"
+                        )
+                        continue
+                    if booking.group_id is not None:
+                        result.errors[bid] = InvalidInputError(
+                            "Booking is part of a split booking; cancel the group"
+                        )
+                        continue
+                    refund = self._cancel_locked(booking, show, now, post_refund=False)
+                    result.refunds[bid] = refund
+                    show_refund += refund
+                if show_refund:
+                    self.store.post_revenue(show, -show_refund, now)
+                served = self.serve_waitlist_locked(show, now)
+            self.notify_waiters(served)
+            result.total_refund += show_refund
+
+        for gid in groups:
+            try:
+                refund = self._cancel_group(gid, now)
+            except DomainError as e:
+                result.errors[gid] = e
+                continue
+            result.refunds[gid] = refund
+            result.total_refund += refund
+        return result
+
+    def _cancel_group(self, group_id: str, now: datetime) -> int:
+        group = self.store.groups_by_id[group_id]
+        parts = [self.store.get_booking(bid) for bid in group.booking_ids]
+        shows = {b.show_id: self.store.get_show(b.show_id) for b in parts}
+
+        served: List[Tuple[WaitlistEntry, str]] = []
+        with self._locked(shows):
+            if group.status == BookingStatus.CANCELLED:
+                raise BookingAlreadyCancelledError("Booking already cancelled")
+            refund = sum(self._cancel_locked(b, shows[b.show_id], now) for b in parts)
+            group.status = BookingStatus.CANCELLED
+            self.store.save_group(group)
+            for show in shows.values():
+                served += self.serve_waitlist_locked(show, now)
+
+        self.notify_waiters(served)
+        return refund
+
+    def _cancel_locked(
+        self, booking: Booking, show: Show, now: datetime, post_refund: bool = True
+    ) -> int:
+        # post_refund=False: the caller posts the (aggregated) refund itself, under the lock
+        restored = self.store.status_of(show, now) == ShowStatus.REGISTERED
+        if restored:
+            # Before start → refund 50% and restore seats
+            refund = (booking.unit_price * booking.quantity) // 2
+            self.return_seats_locked(show, booking.quantity, booking.seats)
+            if post_refund:
+                self.store.post_revenue(show, -refund, now)
+        else:
+            # STARTED or ENDED → no refund, no seat return
+            refund = 0
+
+        booking.status = BookingStatus.CANCELLED
+        self.store.save_booking(booking)
+        self.store.release_customer_tickets(booking)
+        booking.cancelled_seq = self.store.feed.publish(
+            EventType.BOOKING_CANCELLED,
+            booking_id=booking.booking_id,
+            show_id=show.show_id,
+            refund=refund,
+            seats_restored=restored,
+            seats_remaining=show.seats_remaining,
+            cancelled_at=now,
+        )
+        return refund
+
+    # ---------- helpers (caller holds the show lock unless noted) ----------
+    @staticmethod
+    def can_seat(show: Show, qty: int) -> bool:
+        # Also used lock-free as a selection hint
+        if show.seats_remaining < qty:
+            return False
+        return show.seat_map is None or show.seat_map.best_run >= qty
+
+    def take_seats_locked(self, show: Show, qty: int) -> Optional[List[Seat]]:
+        """Decrements seats_remaining; with a seat map also assigns qty contiguous seats."""
+        if show.seats_remaining < qty:
+            raise BookingUnavailableError("Booking unavailable")
+        seats = None
+        if show.seat_map is not None:
+            seats = show.seat_map.allocate(qty)
+            if seats is None:
+                raise BookingUnavailableError("Booking unavailable")
+        show.seats_remaining -= qty
+        self.store.save_show(show)
+        return seats
+
+    def return_seats_locked(self, show: Show, qty: int, seats: Optional[List[Seat]]) -> None:
+        show.seats_remaining += qty
+        if show.seat_map is not None and seats:
+            show.seat_map.release(seats)
+        self.store.save_show(show)
+
+    def _check_customer_limit_locked(
+        self, show: Show, qty: int, customer_id: Optional[str]
+    ) -> None:
+        # O(1): the per (customer, show) ticket count only changes under this show's lock
+        limit = self.max_tickets_per_customer
+        if limit is None or customer_id is None:
+            return
+        if self.store.customer_tickets(customer_id, show.show_id) + qty > limit:
+            raise CustomerLimitExceededError("Customer limit exceeded")
+
+    def _book_locked(
+        self, show: Show, qty: int, now: datetime, customer_id: Optional[str] = None
+    ) -> str:
+        # Mutations guarded by per-show lock
+        self._check_customer_limit_locked(show, qty, customer_id)
+        seats = self.take_seats_locked(show, qty)
+        bid = self.store.create_booking(
+            show.show_id, qty, show.price, now, seats, customer_id=customer_id
+        )
+        self.store.post_revenue(show, show.price * qty, now)
+        return bid
+
+    def serve_waitlist_locked(self, show: Show, now: datetime) -> List[Tuple[WaitlistEntry, str]]:
+        served: List[Tuple[WaitlistEntry, str]] = []
+        while self.store.status_of(show, now) == ShowStatus.REGISTERED:
+            entry = self.waitlist.pop_if_fits(
+                show.movie, show.start_time, lambda q: self.can_seat(show, q)
+            )
+            if entry is None:
+                break
+            served.append((entry, self._book_locked(show, entry.quantity, now)))
+        return served
+
+    @contextmanager
+    def _locked(self, shows: Dict[str, Show]) -> Iterator[None]:
+        # Multi-show critical section: global show_id order keeps it deadlock-free
+        with ExitStack() as stack:
+            for sid in sorted(shows):
+                stack.enter_context(self.store.locks.get(sid))
+            yield
+
+    def close_waitlist(self, movie: str, start_time: datetime, now: datetime) -> None:
+        """
+        Called (without show locks) when a show of (movie, start_time) stops selling.
+        Fails every waiter that no still-REGISTERED show could seat even when empty:
+        with ShowAlreadyStartedError once no show is REGISTERED, otherwise with
+        BookingUnavailableError. Such a waiter would block the strict-FIFO queue for
+        good, so the waiters behind it are then served from seats already free.
+        """
+        open_shows = self._open_shows(movie, start_time, now)
+        limit = max((_max_party(s) for s in open_shows), default=0)
+        failed = self.waitlist.drop_where(movie, start_time, lambda q: q > limit)
+        for entry in failed:
+            if open_shows:
+                entry.future.set_exception(BookingUnavailableError("Booking unavailable"))
+            else:
+                entry.future.set_exception(ShowAlreadyStartedError("Show already started"))
+        if not failed:
+            return
+        for s in open_shows:
+            with self.store.locks.get(s.show_id):
+                served = self.serve_waitlist_locked(s, now)
+            self.notify_waiters(served)
+
+    def _open_shows(self, movie: str, start_time: datetime, now: datetime) -> List[Show]:
+        # Lock-free: shows of the slot still REGISTERED (a hint, re-checked under locks)
+        return [
+            s
+            for s in self.store.list_shows_by_key(movie, start_time)
+            if self.store.status_of(s, now) == ShowStatus.REGISTERED
+        ]
+
+    def notify_waiters(self, served: List[Tuple[WaitlistEntry, str]]) -> None:
+        # Called after the show lock is released
+        for entry, bid in served:
+            entry.future.set_result((bid, self.store.get_booking(bid).show_id))
+
+
+def _plan_split(shows: List[Show], qty: int) -> List[Tuple[Show, int]]:
+    """
+    Picks the fewest shows that can seat qty together, then the cheapest such set.
+    Each show contributes at most what it can seat as one party (seat maps: longest run).
+    Within the chosen set cheaper shows are filled first.
+    """
+    usable = [(s, _party_capacity(s)) for s in shows]
+    usable = [(s, cap) for s, cap in usable if cap > 0]
+    by_cap = sorted((cap for _, cap in usable), reverse=True)
+    k, total = 0, 0
+    while total < qty and k < len(by_cap):
+        total += by_cap[k]
+        k += 1
+    if total < qty:
+        raise BookingUnavailableError("Booking unavailable")
+
+    usable.sort(key=_price_order)
+    combos: Iterable[Tuple[Tuple[Show, int], ...]]
+    if len(usable) <= _SPLIT_EXHAUSTIVE_MAX:
+        combos = combinations(usable, k)
+    else:
+        # Many screens in one slot: settle for the k largest (still the fewest shows)
+        largest = sorted(usable, key=lambda sc: -sc[1])[:k]
+        combos = [tuple(sorted(largest, key=_price_order))]
+
+    best: Optional[List[Tuple[Show, int]]] = None
+    best_cost = 0
+    for combo in combos:
+        if sum(cap for _, cap in combo) < qty:
+            continue
+        plan, left, cost = [], qty, 0
+        for s, cap in combo:
+            n = min(cap, left)
+            if n:
+                plan.append((s, n))
+                cost += n * s.price
+                left -= n
+        if best is None or cost < best_cost:
+            best, best_cost = plan, cost
+    assert best is not None
+    return best
+
+
+def _party_capacity(show: Show) -> int:
+    if show.seat_map is None:
+        return show.seats_remaining
+    return min(show.seats_remaining, show.seat_map.best_run)
+
+
+def _max_party(show: Show) -> int:
+    # Largest party the empty hall can seat (seat maps: the longest row)
+    if show.seat_map is None:
+        return show.capacity
+    return max(show.seat_map.row_len)
+
+
+def _price_order(sc: Tuple[Show, int]) -> Tuple[int, str]:
+    return sc[0].price, sc[0].show_id
@@ -1,10 +1,23 @@
-from datetime import datetime
-from typing import Tuple, Dict
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from typing import Tuple, Dict, Iterable, List, Optional
+from src.models.booking import Booking
 from src.repo.memory_store import MemoryStore
 from src.services.show_service import ShowService
-from src.services.booking_service import BookingService
+from src.services.booking_service import BookingService, BulkCancelResult
 from src.services.revenue_service import RevenueService
+from src.repo.rollups import Totals
+from src.utils.clock import Clock, SystemClock
 from src.services.scheduler import Scheduler
+from src.services.admission import AdmissionConfig, AdmissionController
+from src.services.hold_service import HoldService, DEFAULT_HOLD_TTL
+from src.services.export import ExportResult, export_store
+from src.services.idempotency import IdempotencyCache
+from src.services.repricing import PriceRule, ShowSelector
+from src.utils.enums import ShowStatus
+from src.utils.memory import LeakTracker, Usage, with_total
+
+STATUS_SWEEP_JOB_KEY = "__status_sweep__"
 
 
 class CinemaService:
@@ -12,21 +25,70 @@ class CinemaService:
     Facade to orchestrate all operations (store + services + scheduler).
     """
 
-    def __init__(self) -> None:
-        self.store = MemoryStore()
-        self.shows = ShowService(self.store)
-        self.booking = BookingService(self.store)
+    def __init__(
+        self,
+        admission: Optional[AdmissionConfig] = None,
+        clock: Optional[Clock] = None,
+        lazy_status: bool = False,
+        status_sweep_interval: timedelta = timedelta(minutes=1),
+        max_tickets_per_customer: Optional[int] = None,
+    ) -> None:
+        """
+        admission: optional rate limiting / in-flight cap in front of order_tickets.
+        clock: time source for the scheduler, hold expiry and CLI (default: wall clock).
+        lazy_status: derive STARTED from start_time vs. clock on read instead of arming a
+            per-show auto-start; one periodic sweep persists the status in bulk.
+        max_tickets_per_customer: per-show cap on live tickets for orders carrying a customer_id.
+        """
+        self.clock = clock or SystemClock()
+        self.store = MemoryStore(lazy_status=lazy_status)
+        self.booking = BookingService(self.store, max_tickets_per_customer)
+        # Waiters of a slot fail fast once its last sellable show starts or ends
+        self.shows = ShowService(self.store, self.clock, self.booking.close_waitlist)
         self.revenue = RevenueService(self.store)
         # Wire scheduler to call ShowService.start_show
-        self.scheduler = Scheduler(self.shows.start_show)
+        self.scheduler = Scheduler(self.shows.start_show, self.clock)
+        # Hold expiry shares the scheduler's single timer
+        self.holds = HoldService(self.store, self.booking, self.scheduler, self.clock)
+        self.admission = AdmissionController(admission) if admission is not None else None
+        # Dedupe for client retries carrying an idempotency key
+        self.idempotency = IdempotencyCache(clock=self.clock)
+        # Optional tracemalloc baseline/diff for soak tests (MEMSTATS START / DIFF)
+        self.memory_tracker = LeakTracker()
+        self._status_sweep_interval = status_sweep_interval
+        if lazy_status:
+            self._schedule_status_sweep()
 
     # ----- Show operations -----
-    def register_show(self, cinema: str, movie: str, start_time: datetime, price: int, capacity: int) -> str:
-        show_id = self.shows.register_show(cinema, movie, start_time, price, capacity)
-        # Schedule auto-start at start_time (best-effort)
-        self.scheduler.schedule_start(show_id, start_time)
+    def register_show(
+        self,
+        cinema: str,
+        movie: str,
+        start_time: datetime,
+        price: int,
+        capacity: int,
+        seats_per_row: Optional[int] = None,
+    ) -> str:
+        """seats_per_row: enables a seat map with contiguous seat allocation for this show."""
+        show_id = self.shows.register_show(
+            cinema, movie, start_time, price, capacity, seats_per_row
+        )
+        if not self.store.lazy_status:
+            # Schedule auto-start at start_time (best-effort)
+            self.scheduler.schedule_start(show_id, start_time)
         return show_id
 
+    def show_status(self, show_id: str) -> ShowStatus:
+        """Effective status right now (accounts for lazy-status mode)."""
+        return self.store.status_of(self.store.get_show(show_id), self.clock.now())
+
+    def availability(self, movie: str, start_time: datetime) -> List[Tuple[str, int, int]]:
+        """(show_id, seats_remaining, price) for every show of the slot (lock-free snapshot)."""
+        return [
+            (s.show_id, s.seats_remaining, s.price)
+            for s in self.store.list_shows_by_key(movie, start_time)
+        ]
+
     def start_show(self, show_id: str) -> None:
         # If a timer exists, cancel it (manual start takes precedence)
         self.scheduler.cancel(show_id)
@@ -38,16 +100,155 @@ class CinemaService:
     def update_price(self, show_id: str, new_price: int) -> None:
         return self.shows.update_price(show_id, new_price)
 
+    def reprice(self, selector: ShowSelector, rule: PriceRule) -> int:
+        """Bulk price update for all sellable shows matching selector; returns shows changed."""
+        return self.shows.reprice(selector, rule)
+
+    def _schedule_status_sweep(self) -> None:
+        def sweep() -> None:
+            try:
+                self.shows.materialise_started(self.clock.now())
+            finally:
+                self._schedule_status_sweep()
+
+        self.scheduler.schedule_at(
+            STATUS_SWEEP_JOB_KEY, self.clock.now() + self._status_sweep_interval, sweep
+        )
+
     # ----- Booking operations -----
-    def order_tickets(self, movie: str, start_time: datetime, qty: int, now: datetime) -> Tuple[str, str]:
-        return self.booking.order_tickets(movie, start_time, qty, now)
+    def order_tickets(
+        self,
+        movie: str,
+        start_time: datetime,
+        qty: int,
+        now: datetime,
+        idempotency_key: Optional[str] = None,
+        customer_id: Optional[str] = None,
+    ) -> Tuple[str, str]:
+        """
+        idempotency_key: a retry with the same key returns the original (booking_id, show_id)
+        without selecting or locking shows; concurrent duplicates share the first attempt.
+        customer_id: owner of the booking (see customer_bookings and max_tickets_per_customer).
+        """
+        if idempotency_key is not None:
+            return self.idempotency.run(
+                f"order:{idempotency_key}",
+                (movie, start_time, qty, customer_id),
+                lambda: self._order_tickets(movie, start_time, qty, now, customer_id),
+            )
+        return self._order_tickets(movie, start_time, qty, now, customer_id)
+
+    def _order_tickets(
+        self,
+        movie: str,
+        start_time: datetime,
+        qty: int,
+        now: datetime,
+        customer_id: Optional[str] = None,
+    ) -> Tuple[str, str]:
+        if self.admission is None:
+            return self.booking.order_tickets(movie, start_time, qty, now, customer_id)
+        # Sold-out fast path: lock-free selection raises for exhausted/started keys
+        # before the request consumes a token or an in-flight slot.
+        self.booking.pick_show(movie, start_time, qty, now)
+        with self.admission.admit((movie, start_time)):
+            return self.booking.order_tickets(movie, start_time, qty, now, customer_id)
+
+    def order_tickets_split(
+        self,
+        movie: str,
+        start_time: datetime,
+        qty: int,
+        now: datetime,
+        customer_id: Optional[str] = None,
+    ) -> Tuple[str, List[str]]:
+        """Order that may span several shows of the slot; returns (booking_id, show_ids)."""
+        return self.booking.order_tickets_split(movie, start_time, qty, now, customer_id)
+
+    def order_or_wait(self, movie: str, start_time: datetime, qty: int, now: datetime) -> Future:
+        """
+        Order, or join the (movie, start_time) waitlist; the Future yields (booking_id, show_id)
+        or fails with ShowAlreadyStartedError once no show of the slot can sell any more.
+        """
+        return self.booking.order_or_wait(movie, start_time, qty, now)
 
-    def cancel_booking(self, booking_id: str, now: datetime) -> int:
+    def cancel_booking(
+        self, booking_id: str, now: datetime, idempotency_key: Optional[str] = None
+    ) -> int:
+        """idempotency_key: a retry with the same key returns the original refund."""
+        if idempotency_key is not None:
+            return self.idempotency.run(
+                f"cancel:{idempotency_key}",
+                (booking_id,),
+                lambda: self.booking.cancel_booking(booking_id, now),
+            )
         return self.booking.cancel_booking(booking_id, now)
 
+    def customer_bookings(
+        self, customer_id: str, limit: int = 20, cursor: Optional[int] = None
+    ) -> Tuple[List[Booking], Optional[int]]:
+        """A page of the customer's bookings, newest first; pass next_cursor for the next page."""
+        return self.store.list_customer_bookings(customer_id, limit, cursor)
+
+    def cancel_bookings_bulk(self, booking_ids: Iterable[str], now: datetime) -> BulkCancelResult:
+        """Refund campaigns / fraud sweeps: per-id refunds or errors plus the total refund."""
+        return self.booking.cancel_bookings_bulk(booking_ids, now)
+
+    # ----- Hold operations -----
+    def hold_tickets(
+        self,
+        movie: str,
+        start_time: datetime,
+        qty: int,
+        now: datetime,
+        ttl: timedelta = DEFAULT_HOLD_TTL,
+    ) -> Tuple[str, str]:
+        return self.holds.hold_tickets(movie, start_time, qty, now, ttl)
+
+    def confirm_hold(self, hold_id: str, now: datetime) -> str:
+        return self.holds.confirm_hold(hold_id, now)
+
+    def release_hold(self, hold_id: str, now: datetime) -> None:
+        return self.holds.release_hold(hold_id, now)
+
     # ----- Revenue reporting -----
     def revenue_for(self, cinema: str) -> int:
         return self.revenue.revenue_for(cinema)
 
     def all_revenue(self) -> Dict[str, int]:
         return self.revenue.all_revenue()
+
+    def revenue_totals(self, cinema: str) -> Totals:
+        return self.revenue.totals(cinema)
+
+    def revenue_breakdown(self, cinema: str, by: str) -> Dict[str, Totals]:
+        return self.revenue.breakdown(cinema, by)
+
+    # ----- Export -----
+    def export(
+        self,
+        directory: str,
+        fmt: str = "csv",
+        compression: Optional[str] = None,
+        chunk_rows: int = 10_000,
+    ) -> ExportResult:
+        """Point-in-time bookings/shows/revenue export (csv | jsonl | columnar), streamed."""
+        return export_store(self.store, directory, fmt, compression, chunk_rows)
+
+    # ----- Memory accounting -----
+    def memory_stats(self, sample: int = 64) -> Usage:
+        """
+        {component: {"entries", "bytes"}} for every store index, the show lock table, the
+        revenue rollups, change feed, scheduler queue, lazy-status start queue, hold
+        expiries, waitlists, idempotency cache and admission buckets, plus "total".
+        Bytes are estimated from `sample` entries per container (O(sample) each).
+        """
+        usage = self.store.memory_usage(sample)
+        usage.update(self.scheduler.memory_usage(sample))
+        usage.update(self.shows.memory_usage(sample))
+        usage.update(self.holds.memory_usage(sample))
+        usage.update(self.booking.waitlist.memory_usage(sample))
+        usage.update(self.idempotency.memory_usage(sample))
+        if self.admission is not None:
+            usage.update(self.admission.memory_usage(sample))
+        return with_total(usage)
@@ -0,0 +1,234 @@
+"""
+Streaming export of bookings, shows and revenue for reconciliation.
+
+All tables come from one StoreSnapshot (consistent cut, see src.repo.snapshot) and are
+written in chunks of `chunk_rows`, so memory stays bounded while live bookings go on.
+
+Formats:
+  csv       header row + one row per record; None => empty field, datetimes ISO-8601
+  jsonl     one JSON object per record
+  columnar  compact binary, column-major per chunk (read back with read_columnar):
+              b"CNX1" | u32 len | JSON header {"table", "columns": [[name, type], ...]}
+              then chunks: u32 nrows (0 ends the file) and, per column,
+                int/datetime: nrows × int64 (datetime = µs since 1970-01-01, NULL = INT64_MIN)
+                str:          u32 ndict, ndict × (u32 len | utf-8), nrows × u32 code
+                              (dictionary per chunk, NULL = 0xFFFFFFFF)
+            all little-endian
+Compression: gzip | bz2 | xz (standard library codecs) applied to the whole file.
+"""
+
+from __future__ import annotations
+import bz2
+import csv
+import gzip
+import io
+import json
+import lzma
+import os
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from src.repo.memory_store import MemoryStore
+from src.repo.snapshot import Columns, StoreSnapshot
+from src.utils.errors import InvalidInputError
+
+FORMATS = ("csv", "jsonl", "columnar")
+COMPRESSIONS: Dict[str, Callable[..., Any]] = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+_EXTENSIONS = {"csv": ".csv", "jsonl": ".jsonl", "columnar": ".cnx"}
+_COMPRESSED_EXTENSIONS = {"gzip": ".gz", "bz2": ".bz2", "xz": ".xz"}
+
+_MAGIC = b"CNX1"
+_U32 = struct.Struct("<I")
+_NULL_INT = -(2 ** 63)
+_NULL_CODE = 0xFFFFFFFF
+_EPOCH = datetime(1970, 1, 1)
+_US = timedelta(microseconds=1)
+
+
+@dataclass
+class ExportResult:
+    offset: int                                            # change-feed offset of the cut
+    rows: Dict[str, int] = field(default_factory=dict)     # table -> rows written
+    paths: Dict[str, str] = field(default_factory=dict)    # table -> file written
+
+
+def export_store(
+    store: MemoryStore,
+    directory: str,
+    fmt: str = "csv",
+    compression: Optional[str] = None,
+    chunk_rows: int = 10_000,
+) -> ExportResult:
+    """Writes bookings, shows and revenue from one snapshot into `directory`."""
+    if fmt not in FORMATS:
+        raise InvalidInputError(f"Unknown export format: {fmt}")
+    if compression is not None and compression not in COMPRESSIONS:
+        raise InvalidInputError(f"Unknown compression: {compression}")
+    if chunk_rows <= 0:
+        raise InvalidInputError("Chunk size must be positive")
+
+    snapshot = StoreSnapshot(store)
+    os.makedirs(directory, exist_ok=True)
+    result = ExportResult(snapshot.offset)
+    for table in snapshot.tables():
+        path = os.path.join(directory, table.name + _EXTENSIONS[fmt])
+        if compression is not None:
+            path += _COMPRESSED_EXTENSIONS[compression]
+        if fmt == "columnar":
+            with _open_binary(path, compression) as out:
+                n = write_columnar(table.name, table.columns, table.rows, out, chunk_rows)
+        else:
+            with _open_text(path, compression) as f:
+                write = write_csv if fmt == "csv" else write_jsonl
+                n = write(table.columns, table.rows, f, chunk_rows)
+        result.rows[table.name] = n
+        result.paths[table.name] = path
+    return result
+
+
+def _open_text(path: str, compression: Optional[str]) -> TextIO:
+    opener = COMPRESSIONS[compression] if compression is not None else open
+    f: TextIO = opener(path, "wt", newline="", encoding="utf-8")
+    return f
+
+
+def _open_binary(path: str, compression: Optional[str]) -> BinaryIO:
+    opener = COMPRESSIONS[compression] if compression is not None else open
+    f: BinaryIO = opener(path, "wb")
+    return f
+
+
+def _chunks(rows: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _text(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+# ----- CSV / JSONL -----
+def write_csv(
+    columns: Columns, rows: Iterable[tuple], out: TextIO, chunk_rows: int = 10_000
+) -> int:
+    n = 0
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow([name for name, _ in columns])
+    for chunk in _chunks(rows, chunk_rows):
+        writer.writerows([_text(v) for v in row] for row in chunk)
+        out.write(buf.getvalue())
+        buf.seek(0)
+        buf.truncate()
+        n += len(chunk)
+    out.write(buf.getvalue())  # header only, when there were no rows
+    return n
+
+
+def write_jsonl(
+    columns: Columns, rows: Iterable[tuple], out: TextIO, chunk_rows: int = 10_000
+) -> int:
+    n = 0
+    names = [name for name, _ in columns]
+    for chunk in _chunks(rows, chunk_rows):
+        out.write(
+            "".join(
+                json.dumps(dict(zip(names, map(_text, row))), separators=(",", ":")) + "\n"
+                for row in chunk
+            )
+        )
+        n += len(chunk)
+    return n
+
+
+# ----- Columnar binary -----
+def write_columnar(
+    table: str, columns: Columns, rows: Iterable[tuple], out: BinaryIO, chunk_rows: int = 10_000
+) -> int:
+    header = json.dumps({"table": table, "columns": [list(c) for c in columns]}).encode()
+    out.write(_MAGIC + _U32.pack(len(header)) + header)
+    n = 0
+    for chunk in _chunks(rows, chunk_rows):
+        parts = [_U32.pack(len(chunk))]
+        for i, (_, kind) in enumerate(columns):
+            values = [row[i] for row in chunk]
+            parts.append(_encode_strs(values) if kind == "str" else _encode_ints(values, kind))
+        out.write(b"".join(parts))
+        n += len(chunk)
+    out.write(_U32.pack(0))
+    return n
+
+
+def _encode_ints(values: List[Any], kind: str) -> bytes:
+    if kind == "datetime":
+        values = [_NULL_INT if v is None else (v - _EPOCH) // _US for v in values]
+    else:
+        values = [_NULL_INT if v is None else v for v in values]
+    arr = array("q", values)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _encode_strs(values: List[Optional[str]]) -> bytes:
+    codes: Dict[str, int] = {}
+    for v in values:
+        if v is not None and v not in codes:
+            codes[v] = len(codes)
+    parts = [_U32.pack(len(codes))]
+    for s in codes:
+        raw = s.encode()
+        parts.append(_U32.pack(len(raw)) + raw)
+    arr = array("I", [_NULL_CODE if v is None else codes[v] for v in values])
+    if sys.byteorder == "big":
+        arr.byteswap()
+    parts.append(arr.tobytes())
+    return b"".join(parts)
+
+
+def read_columnar(f: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """Streams records back out of a columnar export, one chunk in memory at a time."""
+    if f.read(4) != _MAGIC:
+        raise InvalidInputError("Not a columnar export")
+    header = json.loads(f.read(_read_u32(f)))
+    columns = header["columns"]
+    names = [name for name, _ in columns]
+    while True:
+        nrows = _read_u32(f)
+        if nrows == 0:
+            return
+        cols = [_decode_column(f, kind, nrows) for _, kind in columns]
+        for row in zip(*cols):
+            yield dict(zip(names, row))
+
+
+def _read_u32(f: BinaryIO) -> int:
+    return _U32.unpack(f.read(4))[0]
+
+
+def _decode_column(f: BinaryIO, kind: str, nrows: int) -> List[Any]:
+    if kind == "str":
+        strings = [f.read(_read_u32(f)).decode() for _ in range(_read_u32(f))]
+        codes = array("I")
+        codes.frombytes(f.read(4 * nrows))
+        if sys.byteorder == "big":
+            codes.byteswap()
+        return [None if c == _NULL_CODE else strings[c] for c in codes]
+    ints = array("q")
+    ints.frombytes(f.read(8 * nrows))
+    if sys.byteorder == "big":
+        ints.byteswap()
+    if kind == "datetime":
+        return [None if v == _NULL_INT else _EPOCH + v * _US for v in ints]
+    return [None if v == _NULL_INT else v for v in ints]
@@ -0,0 +1,188 @@
+from __future__ import annotations
+import heapq
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from src.models.hold import Hold
+from src.repo.memory_store import MemoryStore
+from src.services.booking_service import BookingService
+from src.services.scheduler import Scheduler
+from src.utils.clock import Clock, SystemClock
+from src.utils.enums import ShowStatus, HoldStatus, EventType
+from src.utils.memory import Usage, container_usage
+from src.utils.errors import (
+    ShowAlreadyStartedError,
+    HoldExpiredError,
+    InvalidInputError,
+)
+
+DEFAULT_HOLD_TTL = timedelta(minutes=5)
+SWEEP_JOB_KEY = "__hold_sweep__"
+
+
+class HoldService:
+    """
+    Tentative seat holds (HOLD state) ahead of payment.
+    - hold_tickets decrements seats_remaining and records an expiry; no revenue yet.
+    - confirm_hold turns an active hold into a Booking at the held unit price.
+    - Expired holds are released in bulk by one sweep job on the shared Scheduler,
+      re-armed for the next earliest expiry (never one timer per hold).
+    """
+
+    def __init__(
+        self,
+        store: MemoryStore,
+        booking: BookingService,
+        scheduler: Scheduler,
+        clock: Optional[Clock] = None,
+    ) -> None:
+        self.store = store
+        self.booking = booking
+        self.scheduler = scheduler
+        self.clock = clock or SystemClock()
+        self._expiries: List[Tuple[datetime, str]] = []  # min-heap of (expires_at, hold_id)
+        self._sweep_due: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def hold_tickets(
+        self,
+        movie: str,
+        start_time: datetime,
+        qty: int,
+        now: datetime,
+        ttl: timedelta = DEFAULT_HOLD_TTL,
+    ) -> Tuple[str, str]:
+        """Returns: (hold_id, show_id). Same show selection as order_tickets."""
+        if ttl.total_seconds() <= 0:
+            raise InvalidInputError("Hold TTL must be positive")
+        while True:
+            # As in order_tickets: the lock-free pick is only a hint; if it went stale
+            # (sold out / started meanwhile), pick again instead of failing
+            chosen = self.booking.pick_show(movie, start_time, qty, now)
+
+            with self.store.locks.get(chosen.show_id):
+                s = self.store.get_show(chosen.show_id)
+                sellable = self.store.status_of(s, now) == ShowStatus.REGISTERED
+                if not sellable or not self.booking.can_seat(s, qty):
+                    continue
+                seats = self.booking.take_seats_locked(s, qty)
+                expires_at = now + ttl
+                hid = self.store.create_hold(s.show_id, qty, s.price, now, expires_at, seats)
+
+            self._track(hid, expires_at)
+            return hid, s.show_id
+
+    def confirm_hold(self, hold_id: str, now: datetime) -> str:
+        """Converts an active, unexpired hold into a confirmed booking. Returns booking_id."""
+        hold = self.store.get_hold(hold_id)
+        served = []
+        with self.store.locks.get(hold.show_id):
+            hold = self.store.get_hold(hold_id)
+            if hold.status != HoldStatus.ACTIVE:
+                raise HoldExpiredError("Hold expired")
+            show = self.store.get_show(hold.show_id)
+            if now >= hold.expires_at:
+                # Expired but not swept yet: release it right here
+                self._release_locked(hold, now)
+                served = self.booking.serve_waitlist_locked(show, now)
+                expired = True
+            elif self.store.status_of(show, now) != ShowStatus.REGISTERED:
+                raise ShowAlreadyStartedError("Show already started")
+            else:
+                bid = self.store.create_booking(
+                    show.show_id, hold.quantity, hold.unit_price, now, hold.seats
+                )
+                self.store.post_revenue(show, hold.unit_price * hold.quantity, now)
+                hold.status = HoldStatus.CONFIRMED
+                hold.booking_id = bid
+                self.store.save_hold(hold)
+                self.store.feed.publish(EventType.HOLD_CONFIRMED, hold_id=hold_id, booking_id=bid)
+                expired = False
+
+        if expired:
+            self.booking.notify_waiters(served)
+            raise HoldExpiredError("Hold expired")
+        return bid
+
+    def release_hold(self, hold_id: str, now: datetime) -> None:
+        """Gives held seats back before expiry (e.g. payment abandoned)."""
+        hold = self.store.get_hold(hold_id)
+        with self.store.locks.get(hold.show_id):
+            hold = self.store.get_hold(hold_id)
+            if hold.status != HoldStatus.ACTIVE:
+                raise HoldExpiredError("Hold expired")
+            self._release_locked(hold, now)
+            served = self.booking.serve_waitlist_locked(self.store.get_show(hold.show_id), now)
+        self.booking.notify_waiters(served)
+
+    def memory_usage(self, sample: int = 64) -> Usage:
+        """Expiry heap entries; confirmed/released holds stay in it until their expiry passes."""
+        with self._lock:
+            return {"hold_expiries": container_usage(self._expiries, sample)}
+
+    def release_expired(self, now: datetime) -> int:
+        """
+        Bulk-releases every active hold with expires_at <= now.
+        Holds are grouped per show so each show lock is taken once. Returns count released.
+        """
+        due: Dict[str, List[str]] = defaultdict(list)
+        with self._lock:
+            while self._expiries and self._expiries[0][0] <= now:
+                _, hid = heapq.heappop(self._expiries)
+                due[self.store.get_hold(hid).show_id].append(hid)
+
+        released = 0
+        for show_id, hold_ids in due.items():
+            with self.store.locks.get(show_id):
+                for hid in hold_ids:
+                    hold = self.store.get_hold(hid)
+                    if hold.status == HoldStatus.ACTIVE:
+                        self._release_locked(hold, now)
+                        released += 1
+                served = self.booking.serve_waitlist_locked(self.store.get_show(show_id), now)
+            self.booking.notify_waiters(served)
+        return released
+
+    # ---------- internals ----------
+    def _release_locked(self, hold: Hold, now: datetime) -> None:
+        # Caller holds the show lock; seats only matter while the show can still sell
+        show = self.store.get_show(hold.show_id)
+        restored = self.store.status_of(show, now) == ShowStatus.REGISTERED
+        if restored:
+            self.booking.return_seats_locked(show, hold.quantity, hold.seats)
+        hold.status = HoldStatus.RELEASED
+        self.store.save_hold(hold)
+        self.store.feed.publish(
+            EventType.HOLD_RELEASED,
+            hold_id=hold.hold_id,
+            show_id=hold.show_id,
+            seats_restored=restored,
+            seats_remaining=show.seats_remaining,
+        )
+
+    def _track(self, hold_id: str, expires_at: datetime) -> None:
+        with self._lock:
+            heapq.heappush(self._expiries, (expires_at, hold_id))
+            self._arm_nolock()
+
+    def _arm_nolock(self) -> None:
+        if not self._expiries:
+            self._sweep_due = None
+            return
+        due = self._expiries[0][0]
+        if self._sweep_due is not None and self._sweep_due <= due:
+            return
+        self._sweep_due = due
+        if not self.scheduler.schedule_at(SWEEP_JOB_KEY, due, self._sweep):
+            # Already due relative to the clock: sweep on the next tick
+            self.scheduler.schedule_at(
+                SWEEP_JOB_KEY, self.clock.now() + timedelta(milliseconds=1), self._sweep
+            )
+
+    def _sweep(self) -> None:
+        with self._lock:
+            self._sweep_due = None
+        self.release_expired(self.clock.now())
+        with self._lock:
+            self._arm_nolock()
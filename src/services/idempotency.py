@@ -0,0 +1,88 @@
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Hashable, Optional, TypeVar
+from src.utils.clock import Clock, SystemClock
+from src.utils.errors import InvalidInputError
+from src.utils.memory import Usage, container_usage
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Entry:
+    fingerprint: Hashable
+    future: Future
+    expires_at: datetime
+
+
+class IdempotencyCache:
+    """
+    Bounded, TTL-evicting dedupe cache for client retries.
+    - The first request for a key runs; concurrent duplicates wait on its Future
+      instead of running again (no candidate selection, no show locks).
+    - Successful results are kept for `ttl`; failures are not cached, so a retry after
+      e.g. BookingUnavailable gets a fresh attempt.
+    - Reusing a key for a different request (fingerprint mismatch) is rejected.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        ttl: timedelta = timedelta(minutes=10),
+        clock: Optional[Clock] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock or SystemClock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()  # least recently used first
+        self._lock = threading.Lock()
+
+    def run(self, key: str, fingerprint: Hashable, fn: Callable[[], T]) -> T:
+        now = self.clock.now()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= now:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                if entry.fingerprint != fingerprint:
+                    raise InvalidInputError("Idempotency key reused for a different request")
+                self._entries.move_to_end(key)
+                owner = False
+            else:
+                entry = _Entry(fingerprint, Future(), now + self.ttl)
+                self._entries[key] = entry
+                self._evict_nolock(now)
+                owner = True
+
+        if not owner:
+            return entry.future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            entry.future.set_exception(e)
+            raise
+        entry.future.set_result(result)
+        return result
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def memory_usage(self, sample: int = 64) -> Usage:
+        with self._lock:
+            return {"idempotency_cache": container_usage(self._entries, sample)}
+
+    def _evict_nolock(self, now: datetime) -> None:
+        while self._entries:
+            oldest = next(iter(self._entries.values()))
+            if len(self._entries) <= self.max_entries and oldest.expires_at > now:
+                break
+            self._entries.popitem(last=False)
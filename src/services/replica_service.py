@@ -0,0 +1,88 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.models.booking import Booking
+from src.models.show import Show
+from src.repo.replication import Replica, ReplicationLag
+from src.repo.rollups import Totals
+from src.services.export import ExportResult, export_store
+from src.services.revenue_service import RevenueService
+from src.utils.clock import Clock, SystemClock
+from src.utils.enums import ShowStatus
+from src.utils.errors import ReadOnlyReplicaError
+from src.utils.memory import LeakTracker, Usage, with_total
+
+
+class ReplicaCinemaService:
+    """
+    Read-only CinemaService facade over a Replica's store: same query methods (and the
+    same CLI read commands via run_line), every mutating call raises ReadOnlyReplicaError.
+    Results reflect the primary as of replica.offset; see lag().
+    """
+
+    def __init__(self, replica: Optional[Replica] = None, clock: Optional[Clock] = None) -> None:
+        self.replica = replica or Replica(clock=clock)
+        self.store = self.replica.store
+        self.clock = clock or SystemClock()
+        self.revenue = RevenueService(self.store)
+        self.memory_tracker = LeakTracker()
+
+    def lag(self) -> ReplicationLag:
+        return self.replica.lag()
+
+    # ----- Shows -----
+    def get_show(self, show_id: str) -> Show:
+        return self.store.get_show(show_id)
+
+    def show_status(self, show_id: str) -> ShowStatus:
+        return self.store.status_of(self.store.get_show(show_id), self.clock.now())
+
+    def availability(self, movie: str, start_time: datetime) -> List[Tuple[str, int, int]]:
+        """(show_id, seats_remaining, price) for every show of the slot."""
+        return [
+            (s.show_id, s.seats_remaining, s.price)
+            for s in self.store.list_shows_by_key(movie, start_time)
+        ]
+
+    def customer_bookings(
+        self, customer_id: str, limit: int = 20, cursor: Optional[int] = None
+    ) -> Tuple[List[Booking], Optional[int]]:
+        return self.store.list_customer_bookings(customer_id, limit, cursor)
+
+    # ----- Revenue reporting -----
+    def revenue_for(self, cinema: str) -> int:
+        return self.revenue.revenue_for(cinema)
+
+    def all_revenue(self) -> Dict[str, int]:
+        return self.revenue.all_revenue()
+
+    def revenue_totals(self, cinema: str) -> Totals:
+        return self.revenue.totals(cinema)
+
+    def revenue_breakdown(self, cinema: str, by: str) -> Dict[str, Totals]:
+        return self.revenue.breakdown(cinema, by)
+
+    # ----- Export -----
+    def export(
+        self,
+        directory: str,
+        fmt: str = "csv",
+        compression: Optional[str] = None,
+        chunk_rows: int = 10_000,
+    ) -> ExportResult:
+        """Same export as the primary's, cut at a replica offset (keeps the load off it)."""
+        return export_store(self.store, directory, fmt, compression, chunk_rows)
+
+    # ----- Memory accounting -----
+    def memory_stats(self, sample: int = 64) -> Usage:
+        """Store indexes, rollups, lock table and mirrored feed (no scheduler or caches here)."""
+        return with_total(self.store.memory_usage(sample))
+
+    # ----- Writes go to the primary -----
+    def _read_only(self, *args: Any, **kwargs: Any) -> Any:
+        raise ReadOnlyReplicaError("Read-only replica")
+
+    register_show = start_show = end_show = update_price = reprice = _read_only
+    order_tickets = order_tickets_split = order_or_wait = cancel_booking = _read_only
+    hold_tickets = confirm_hold = release_hold = _read_only
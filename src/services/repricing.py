@@ -0,0 +1,47 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
+from src.models.show import Show
+
+# Maps a show to its new price (int rupees); returning the current price means "no change"
+PriceRule = Callable[[Show], int]
+
+
+@dataclass
+class ShowSelector:
+    """
+    Predicate over movie / cinema / start time / occupancy for bulk repricing.
+    All given criteria must hold; unset fields match everything.
+    """
+    movie: Optional[str] = None
+    cinema: Optional[str] = None
+    start_from: Optional[datetime] = None     # inclusive
+    start_to: Optional[datetime] = None       # exclusive
+    max_seats_left_ratio: Optional[float] = None   # e.g. 0.2 => fewer than 20% seats left
+    predicate: Optional[Callable[[Show], bool]] = None
+
+    def matches(self, show: Show) -> bool:
+        if self.movie is not None and show.movie != self.movie:
+            return False
+        if self.cinema is not None and show.cinema != self.cinema:
+            return False
+        if self.start_from is not None and show.start_time < self.start_from:
+            return False
+        if self.start_to is not None and show.start_time >= self.start_to:
+            return False
+        if (
+            self.max_seats_left_ratio is not None
+            and show.seats_remaining >= show.capacity * self.max_seats_left_ratio
+        ):
+            return False
+        return self.predicate is None or self.predicate(show)
+
+
+def percent_change(pct: int) -> PriceRule:
+    """+10 => 10% more, -25 => 25% less; rounded half up, never below 1."""
+    return lambda s: max(1, (s.price * (100 + pct) + 50) // 100)
+
+
+def set_price(price: int) -> PriceRule:
+    return lambda s: price
@@ -1,5 +1,6 @@
 from typing import Dict
 from src.repo.memory_store import MemoryStore
+from src.repo.rollups import Totals
 
 
 class RevenueService:
@@ -11,3 +12,11 @@ class RevenueService:
 
     def all_revenue(self) -> Dict[str, int]:
         return self.store.all_revenue()
+
+    def totals(self, cinema: str) -> Totals:
+        """Gross, refunded and net revenue for a cinema (from rollups, O(1))."""
+        return self.store.rollups.totals(cinema)
+
+    def breakdown(self, cinema: str, by: str) -> Dict[str, Totals]:
+        """by: movie | show | day | hour | movie_day"""
+        return self.store.rollups.breakdown(cinema, by)
@@ -1,62 +1,132 @@
 from __future__ import annotations
+import heapq
 import threading
 from datetime import datetime
-from typing import Dict, Optional
+from itertools import count
+from typing import Callable, Dict, List, Optional, Tuple
+from src.utils.clock import Clock, SystemClock
 from src.utils.errors import DomainError
+from src.utils.memory import Usage, container_usage
 
 
 class Scheduler:
     """
     Minimal in-process scheduler that auto-starts shows at their start_time.
-    - Uses a per-show threading.Timer.
+    - Jobs live in a min-heap keyed by due time; a single threading.Timer is armed
+      for the earliest job, so pending jobs cost no threads.
+    - Besides show auto-start, any keyed callback can be scheduled (e.g. hold expiry sweeps).
+    - With a VirtualClock no timer thread is used: due jobs run when the clock is advanced.
     - Timers are lost on process restart (acceptable for this machine round).
     """
 
-    def __init__(self, start_callback) -> None:
+    def __init__(
+        self, start_callback: Callable[[str], None], clock: Optional[Clock] = None
+    ) -> None:
         """
         start_callback: callable(show_id:str) -> None
         Typically wired to ShowService.start_show.
         """
         self._start_cb = start_callback
-        self._timers: Dict[str, threading.Timer] = {}
+        self._clock = clock or SystemClock()
+        # key -> (due, seq, callback); heap entries are stale unless their seq matches
+        self._jobs: Dict[str, Tuple[datetime, int, Callable[[], None]]] = {}
+        self._heap: List[Tuple[datetime, int, str]] = []
+        self._seq = count()
+        self._timer: Optional[threading.Timer] = None
+        self._timer_due: Optional[datetime] = None
         self._lock = threading.Lock()
+        self._virtual = self._clock.subscribe(self._run_due)
 
     def schedule_start(self, show_id: str, start_time: datetime) -> None:
         """(Re)schedule auto-start for a show_id. If time already passed, do nothing."""
-        delay = (start_time - datetime.now()).total_seconds()
-        if delay <= 0:
-            # Past start time — do not auto-start; manual START command may be used.
-            return
+        # Past start time — do not auto-start; manual START command may be used.
+        self.schedule_at(show_id, start_time, lambda: self._start_cb(show_id))
+
+    def schedule_at(self, key: str, when: datetime, callback: Callable[[], None]) -> bool:
+        """
+        (Re)schedule callback() to run at `when` under `key`, replacing any pending job
+        with the same key. Returns False (and schedules nothing) if `when` already passed.
+        """
+        if (when - self._clock.now()).total_seconds() <= 0:
+            return False
         with self._lock:
-            self._cancel_nolock(show_id)
-            t = threading.Timer(delay, self._trigger_start, args=(show_id,))
-            t.daemon = True
-            t.start()
-            self._timers[show_id] = t
+            seq = next(self._seq)
+            self._jobs[key] = (when, seq, callback)
+            heapq.heappush(self._heap, (when, seq, key))
+            self._arm_nolock()
+        return True
 
     def cancel(self, show_id: str) -> None:
         """Cancel a pending auto-start (e.g., if started manually earlier)."""
         with self._lock:
             self._cancel_nolock(show_id)
 
-    def _cancel_nolock(self, show_id: str) -> None:
-        t = self._timers.pop(show_id, None)
-        if t is not None:
-            try:
-                t.cancel()
-            except Exception:
-                pass
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def memory_usage(self, sample: int = 64) -> Usage:
+        """Live jobs, and heap entries (which also hold cancelled/replaced jobs until popped)."""
+        with self._lock:
+            return {
+                "scheduler_jobs": container_usage(self._jobs, sample),
+                "scheduler_heap": container_usage(self._heap, sample),
+            }
+
+    def _cancel_nolock(self, key: str) -> None:
+        # Heap entry becomes stale and is dropped lazily when it reaches the top
+        self._jobs.pop(key, None)
+
+    def _arm_nolock(self) -> None:
+        # Drop stale entries so the top of the heap is the next live job
+        while self._heap:
+            when, seq, key = self._heap[0]
+            job = self._jobs.get(key)
+            if job is not None and job[1] == seq:
+                break
+            heapq.heappop(self._heap)
+
+        if self._virtual:
+            return
+        due = self._heap[0][0] if self._heap else None
+        if due == self._timer_due:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._timer_due = due
+        if due is None:
+            return
+        delay = max((due - self._clock.now()).total_seconds(), 0.0)
+        t = threading.Timer(delay, self._run_due)
+        t.daemon = True
+        t.start()
+        self._timer = t
+
+    def _run_due(self) -> None:
+        due_jobs: List[Callable[[], None]] = []
+        with self._lock:
+            now = self._clock.now()
+            while self._heap and self._heap[0][0] <= now:
+                when, seq, key = heapq.heappop(self._heap)
+                job = self._jobs.get(key)
+                if job is not None and job[1] == seq:
+                    del self._jobs[key]
+                    due_jobs.append(job[2])
+            if self._timer is threading.current_thread():
+                self._timer = None
+                self._timer_due = None
+            self._arm_nolock()
+
+        for cb in due_jobs:
+            self._trigger(cb)
 
-    def _trigger_start(self, show_id: str) -> None:
-        # Timer thread: attempt to start; ignore domain errors (e.g., already started/ended)
+    def _trigger(self, callback: Callable[[], None]) -> None:
+        # Timer thread: attempt the job; ignore domain errors (e.g., already started/ended)
         try:
-            self._start_cb(show_id)
+            callback()
         except DomainError:
             pass
         except Exception:
             # Swallow any unexpected error to avoid killing the timer thread.
             pass
-        finally:
-            # Cleanup timer reference
-            with self._lock:
-                self._timers.pop(show_id, None)
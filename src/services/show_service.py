@@ -1,6 +1,13 @@
+import heapq
+import threading
 from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from src.models.show import Show
 from src.repo.memory_store import MemoryStore
-from src.utils.enums import ShowStatus
+from src.services.repricing import PriceRule, ShowSelector
+from src.utils.clock import Clock, SystemClock
+from src.utils.enums import ShowStatus, EventType
+from src.utils.memory import Usage, container_usage
 from src.utils.errors import (
     ShowNotFoundError,
     ShowAlreadyStartedError,
@@ -9,38 +16,146 @@ from src.utils.errors import (
     InvalidInputError,
 )
 
+# (movie, start_time, now) -> None; told whenever a show of that slot stops selling
+StopSellingCallback = Callable[[str, datetime, datetime], None]
+
 
 class ShowService:
-    def __init__(self, store: MemoryStore) -> None:
+    def __init__(
+        self,
+        store: MemoryStore,
+        clock: Optional[Clock] = None,
+        on_stop_selling: Optional[StopSellingCallback] = None,
+    ) -> None:
+        """
+        on_stop_selling: called after a show leaves REGISTERED (show lock released).
+        Typically wired to BookingService.close_waitlist.
+        """
         self.store = store
+        self.clock = clock or SystemClock()
+        self._on_stop_selling = on_stop_selling
+        # Lazy-status mode only: registered shows ordered by start_time, for the bulk sweep
+        self._pending_starts: List[Tuple[datetime, str]] = []
+        self._pending_lock = threading.Lock()
 
-    def register_show(self, cinema: str, movie: str, start_time: datetime, price: int, capacity: int) -> str:
-        return self.store.create_show(cinema, movie, start_time, price, capacity)
+    def register_show(
+        self,
+        cinema: str,
+        movie: str,
+        start_time: datetime,
+        price: int,
+        capacity: int,
+        seats_per_row: Optional[int] = None,
+    ) -> str:
+        sid = self.store.create_show(cinema, movie, start_time, price, capacity, seats_per_row)
+        if self.store.lazy_status:
+            with self._pending_lock:
+                heapq.heappush(self._pending_starts, (start_time, sid))
+        return sid
 
+    # Status/price changes take the per-show lock so they serialize with bookings
+    # and appear in the change feed in the same order they were applied.
     def start_show(self, show_id: str) -> None:
         show = self.store.get_show(show_id)
-        if show.status == ShowStatus.STARTED:
-            raise ShowAlreadyStartedError("Show already started")
-        if show.status == ShowStatus.ENDED:
-            raise ShowAlreadyEndedError("Show already ended")
-        show.status = ShowStatus.STARTED
-        self.store.save_show(show)
+        with self.store.locks.get(show_id):
+            status = self.store.status_of(show, self.clock.now())
+            if status == ShowStatus.STARTED:
+                raise ShowAlreadyStartedError("Show already started")
+            if status == ShowStatus.ENDED:
+                raise ShowAlreadyEndedError("Show already ended")
+            show.status = ShowStatus.STARTED
+            self.store.save_show(show)
+            self.store.feed.publish(EventType.SHOW_STARTED, show_id=show_id)
+        self._stopped_selling(show)
 
     def end_show(self, show_id: str) -> None:
         show = self.store.get_show(show_id)
-        if show.status == ShowStatus.REGISTERED:
-            raise CannotEndBeforeStartError("Cannot end before start")
-        if show.status == ShowStatus.ENDED:
-            raise ShowAlreadyEndedError("Show already ended")
-        show.status = ShowStatus.ENDED
-        self.store.save_show(show)
+        with self.store.locks.get(show_id):
+            status = self.store.status_of(show, self.clock.now())
+            if status == ShowStatus.REGISTERED:
+                raise CannotEndBeforeStartError("Cannot end before start")
+            if status == ShowStatus.ENDED:
+                raise ShowAlreadyEndedError("Show already ended")
+            show.status = ShowStatus.ENDED
+            self.store.save_show(show)
+            self.store.feed.publish(EventType.SHOW_ENDED, show_id=show_id)
+        self._stopped_selling(show)
 
     def update_price(self, show_id: str, new_price: int) -> None:
         if new_price <= 0:
             raise InvalidInputError("Price must be positive")
         show = self.store.get_show(show_id)
-        if show.status != ShowStatus.REGISTERED:
-            # Only allow price update before start
-            raise ShowAlreadyStartedError("Cannot update price after start")
-        show.price = new_price
-        self.store.save_show(show)
+        with self.store.locks.get(show_id):
+            if self.store.status_of(show, self.clock.now()) != ShowStatus.REGISTERED:
+                # Only allow price update before start
+                raise ShowAlreadyStartedError("Cannot update price after start")
+            show.price = new_price
+            self.store.save_show(show)
+            self.store.feed.publish(EventType.PRICE_UPDATED, show_id=show_id, price=new_price)
+
+    def reprice(self, selector: ShowSelector, rule: PriceRule) -> int:
+        """
+        Bulk repricing in one pass: shows matching `selector` that can still sell get
+        rule(show) as their new price. Each show is re-checked and updated under its own
+        lock (never more than one held), so concurrent orders see either the old or the
+        new price, never a torn update. Returns the number of shows whose price changed.
+        A non-positive rule result raises InvalidInputError; shows already updated keep
+        their new price.
+        """
+        now = self.clock.now()
+        changed = 0
+        for show in list(self.store.shows_by_id.values()):
+            # Lock-free prefilter; most shows are rejected without touching their lock
+            if not selector.matches(show):
+                continue
+            with self.store.locks.get(show.show_id):
+                if self.store.status_of(show, now) != ShowStatus.REGISTERED:
+                    continue
+                if not selector.matches(show):  # occupancy may have moved meanwhile
+                    continue
+                new_price = rule(show)
+                if new_price <= 0:
+                    raise InvalidInputError("Price must be positive")
+                if new_price == show.price:
+                    continue
+                show.price = new_price
+                self.store.save_show(show)
+                self.store.feed.publish(
+                    EventType.PRICE_UPDATED, show_id=show.show_id, price=new_price
+                )
+                changed += 1
+        return changed
+
+    def memory_usage(self, sample: int = 64) -> Usage:
+        """Lazy-status mode: registered shows not yet swept to STARTED."""
+        with self._pending_lock:
+            return {"pending_starts": container_usage(self._pending_starts, sample)}
+
+    def materialise_started(self, now: datetime) -> int:
+        """
+        Lazy-status mode: persists STARTED for every show whose start_time <= now and is
+        still stored as REGISTERED (reads already see it as started). Returns count updated.
+        """
+        due: List[str] = []
+        with self._pending_lock:
+            while self._pending_starts and self._pending_starts[0][0] <= now:
+                due.append(heapq.heappop(self._pending_starts)[1])
+
+        started = 0
+        slots: Dict[Tuple[str, datetime], Show] = {}
+        for sid in due:
+            show = self.store.get_show(sid)
+            with self.store.locks.get(sid):
+                if show.status == ShowStatus.REGISTERED:
+                    show.status = ShowStatus.STARTED
+                    self.store.save_show(show)
+                    self.store.feed.publish(EventType.SHOW_STARTED, show_id=sid)
+                    started += 1
+            slots[(show.movie, show.start_time)] = show
+        for show in slots.values():
+            self._stopped_selling(show, now)
+        return started
+
+    def _stopped_selling(self, show: Show, now: Optional[datetime] = None) -> None:
+        if self._on_stop_selling is not None:
+            self._on_stop_selling(show.movie, show.start_time, now or self.clock.now())
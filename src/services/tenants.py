@@ -0,0 +1,51 @@
+from __future__ import annotations
+import threading
+from typing import Any, Dict, List
+
+from src.cli import commands as C
+from src.cli.parser import run_line
+from src.services.cinema_service import CinemaService
+from src.utils.errors import InvalidInputError, TenantNotFoundError
+from src.utils.memory import Usage
+
+
+class TenantRegistry:
+    """
+    Routes commands to one CinemaService per tenant (e.g. a city).
+    Each tenant owns its store, id counters, lock manager, scheduler and revenue, so
+    load in one tenant never contends on another tenant's locks.
+    """
+
+    def __init__(self) -> None:
+        self._tenants: Dict[str, CinemaService] = {}
+        self._lock = threading.Lock()  # guards tenant creation only
+
+    def create(self, tenant: str, **cinema_options: Any) -> CinemaService:
+        """cinema_options are passed to CinemaService (admission, clock, lazy_status...)."""
+        with self._lock:
+            if tenant in self._tenants:
+                raise InvalidInputError(f"Tenant already exists: {tenant}")
+            svc = CinemaService(**cinema_options)
+            self._tenants[tenant] = svc
+            return svc
+
+    def get(self, tenant: str) -> CinemaService:
+        try:
+            return self._tenants[tenant]
+        except KeyError:
+            raise TenantNotFoundError(f"Tenant not found: {tenant}")
+
+    def tenants(self) -> List[str]:
+        return sorted(self._tenants)
+
+    def run_line(self, tenant: str, line: str) -> str:
+        """Like parser.run_line, always answers with a CLI string (unknown tenants too)."""
+        try:
+            svc = self.get(tenant)
+        except TenantNotFoundError:
+            return C.ERR_TENANT_NOT_FOUND
+        return run_line(svc, line)
+
+    def memory_report(self) -> Dict[str, Usage]:
+        """Per tenant: entry counts and estimated bytes per component (see memory_stats)."""
+        return {name: self.get(name).memory_stats() for name in self.tenants()}
@@ -0,0 +1,97 @@
+from __future__ import annotations
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from src.utils.memory import Usage, container_usage
+
+Key = Tuple[str, datetime]  # (movie, start_time)
+
+
+@dataclass
+class WaitlistEntry:
+    quantity: int
+    enqueued_at: datetime
+    # Resolved with (booking_id, show_id) once seats are allocated
+    future: Future = field(default_factory=Future)
+
+
+class Waitlist:
+    """
+    Per-(movie, start_time) FIFO queue of ticket requests that could not be served.
+    - Entries are only popped by the booking service while it holds the show lock.
+    - Callers are notified through the entry's Future (no polling).
+    - A waiter may give up with future.cancel(); cancelled entries are skipped.
+    - When shows of the slot stop selling, drop_where() hands back the live waiters
+      that can no longer be seated, so the booking service can fail them.
+    """
+
+    def __init__(self) -> None:
+        self._queues: Dict[Key, Deque[WaitlistEntry]] = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    def enqueue(self, movie: str, start_time: datetime, qty: int, now: datetime) -> WaitlistEntry:
+        entry = WaitlistEntry(quantity=qty, enqueued_at=now)
+        with self._lock:
+            self._queues[(movie, start_time)].append(entry)
+        return entry
+
+    def pop_if_fits(
+        self, movie: str, start_time: datetime, fits: Callable[[int], bool]
+    ) -> Optional[WaitlistEntry]:
+        """
+        Pops the head waiter if fits(quantity) holds, skipping cancelled entries.
+        Strict FIFO: a live head that does not fit blocks everyone behind it (no overtaking).
+        """
+        key = (movie, start_time)
+        with self._lock:
+            q = self._queues.get(key)
+            try:
+                while q:
+                    head = q[0]
+                    if head.future.cancelled():
+                        q.popleft()
+                        continue
+                    if not fits(head.quantity):
+                        return None
+                    q.popleft()
+                    # Pin the future so the waiter can no longer cancel it mid-allocation
+                    if head.future.set_running_or_notify_cancel():
+                        return head
+                return None
+            finally:
+                if q is not None and not q:
+                    del self._queues[key]
+
+    def drop_where(
+        self, movie: str, start_time: datetime, hopeless: Callable[[int], bool]
+    ) -> List[WaitlistEntry]:
+        """
+        Removes every entry whose quantity is hopeless(quantity), wherever it is queued
+        (the queue itself goes once empty). Returns the live ones, pinned as running.
+        """
+        key = (movie, start_time)
+        with self._lock:
+            q = self._queues.get(key)
+            if not q:
+                return []
+            dropped = [e for e in q if hopeless(e.quantity)]
+            if not dropped:
+                return []
+            kept = deque(e for e in q if not hopeless(e.quantity))
+            if kept:
+                self._queues[key] = kept
+            else:
+                del self._queues[key]
+        return [e for e in dropped if e.future.set_running_or_notify_cancel()]
+
+    def memory_usage(self, sample: int = 64) -> Usage:
+        with self._lock:
+            return {"waitlist_queues": container_usage(self._queues, sample)}
+
+    def pending(self, movie: str, start_time: datetime) -> int:
+        with self._lock:
+            q = self._queues.get((movie, start_time), ())
+            return sum(1 for e in q if not e.future.cancelled())
@@ -0,0 +1,59 @@
+from __future__ import annotations
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+
+class Clock(ABC):
+    """Source of 'now' for services, the scheduler and the CLI."""
+
+    @abstractmethod
+    def now(self) -> datetime:
+        ...
+
+    def subscribe(self, on_advance: Callable[[], None]) -> bool:
+        """
+        Registers a callback run whenever time is moved explicitly.
+        Returns True if this clock drives its subscribers (virtual time), False if
+        subscribers must keep their own wall-clock timers.
+        """
+        return False
+
+
+class SystemClock(Clock):
+    def now(self) -> datetime:
+        return datetime.now()
+
+
+class VirtualClock(Clock):
+    """
+    Manually advanced clock for simulations and replays.
+    Subscribers (e.g. Scheduler) run synchronously in the thread that advances time.
+    """
+
+    def __init__(self, start: datetime) -> None:
+        self._now = start
+        self._listeners: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def now(self) -> datetime:
+        return self._now
+
+    def subscribe(self, on_advance: Callable[[], None]) -> bool:
+        with self._lock:
+            self._listeners.append(on_advance)
+        return True
+
+    def advance(self, delta: timedelta) -> datetime:
+        return self.advance_to(self._now + delta)
+
+    def advance_to(self, when: datetime) -> datetime:
+        """Moves time forward to `when` (never backwards) and fires due subscribers."""
+        with self._lock:
+            if when > self._now:
+                self._now = when
+            listeners = list(self._listeners)
+        for cb in listeners:
+            cb()
+        return self._now
@@ -10,3 +10,21 @@ class ShowStatus(Enum):
 class BookingStatus(Enum):
     CONFIRMED = auto()
     CANCELLED = auto()
+
+
+class HoldStatus(Enum):
+    ACTIVE = auto()
+    CONFIRMED = auto()
+    RELEASED = auto()
+
+
+class EventType(Enum):
+    SHOW_REGISTERED = auto()
+    SHOW_STARTED = auto()
+    SHOW_ENDED = auto()
+    PRICE_UPDATED = auto()
+    BOOKING_CREATED = auto()
+    BOOKING_CANCELLED = auto()
+    HOLD_CREATED = auto()
+    HOLD_CONFIRMED = auto()
+    HOLD_RELEASED = auto()
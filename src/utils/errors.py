@@ -34,3 +34,41 @@ class BookingAlreadyCancelledError(DomainError):
 
 class InvalidInputError(DomainError):
     pass
+
+
+class HoldNotFoundError(DomainError):
+    pass
+
+
+class HoldExpiredError(DomainError):
+    """Hold is no longer active (expired, released or already confirmed)."""
+    pass
+
+
+class AdmissionRejectedError(DomainError):
+    """Order shed by admission control (rate limit or in-flight cap)."""
+    pass
+
+
+class FeedOffsetExpiredError(DomainError):
+    """Requested change-feed offset was already overwritten in the ring buffer."""
+    pass
+
+
+class TenantNotFoundError(DomainError):
+    pass
+
+
+class ReplicationError(DomainError):
+    """Mutation log cannot be applied (gap in offsets)."""
+    pass
+
+
+class ReadOnlyReplicaError(DomainError):
+    """Write attempted against a read-only replica."""
+    pass
+
+
+class CustomerLimitExceededError(DomainError):
+    """Order would take a customer past the per-show ticket limit."""
+    pass
@@ -1,16 +1,66 @@
 import threading
-from itertools import count
 
-_show_counter = count(1)
-_booking_counter = count(1)
-_lock = threading.Lock()
 
+def show_id(n: int) -> str:
+    return f"S{n:05d}"
 
-def next_show_id() -> str:
-    with _lock:
-        return f"S{next(_show_counter):05d}"
 
+def booking_id(n: int) -> str:
+    return f"B{n:05d}"
 
-def next_booking_id() -> str:
-    with _lock:
-        return f"B{next(_booking_counter):05d}"
+
+def hold_id(n: int) -> str:
+    return f"H{n:05d}"
+
+
+def id_number(id_: str) -> int:
+    """Inverse of show_id / booking_id / hold_id: the sequence number of an id."""
+    return int(id_[1:])
+
+
+class IdGenerator:
+    """
+    Sequential, zero-padded ids; one instance per store so tenants never share a counter.
+    Each namespace has its own lock, held only for the increment (formatting happens outside),
+    so show registration and holds never contend with the booking path.
+    """
+
+    def __init__(self) -> None:
+        self._shows = 0
+        self._bookings = 0
+        self._holds = 0
+        self._show_lock = threading.Lock()
+        self._booking_lock = threading.Lock()
+        self._hold_lock = threading.Lock()
+
+    def next_show_id(self) -> str:
+        with self._show_lock:
+            self._shows += 1
+            n = self._shows
+        return show_id(n)
+
+    def next_booking_id(self) -> str:
+        with self._booking_lock:
+            self._bookings += 1
+            n = self._bookings
+        return booking_id(n)
+
+    def next_hold_id(self) -> str:
+        with self._hold_lock:
+            self._holds += 1
+            n = self._holds
+        return hold_id(n)
+
+    def advance_bookings(self, number: int) -> None:
+        """Accounts for a booking-namespace id minted elsewhere (a primary, for replicas)."""
+        with self._booking_lock:
+            self._bookings = max(self._bookings, number)
+
+    @property
+    def last_show_number(self) -> int:
+        return self._shows
+
+    @property
+    def last_booking_number(self) -> int:
+        """Highest booking-namespace number minted so far (bookings and split groups)."""
+        return self._bookings
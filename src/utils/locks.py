@@ -1,14 +1,40 @@
 import threading
-from collections import defaultdict
+from typing import Dict, Hashable, List
+from src.utils.memory import Usage, container_usage
 
 
 class ShowLockManager:
     """Provides a dedicated lock per show_id for atomic seat/revenue updates."""
 
     def __init__(self) -> None:
-        self._locks = defaultdict(threading.Lock)
+        self._locks: Dict[str, threading.Lock] = {}
         self._global = threading.Lock()
 
     def get(self, show_id: str) -> threading.Lock:
-        # defaultdict ensures presence; a tiny global lock is not needed here
-        return self._locks[show_id]
+        # Lock-free fast path once the lock exists. Creation goes through the global lock:
+        # without the GIL two threads could each insert their own Lock for the same show.
+        lock = self._locks.get(show_id)
+        if lock is None:
+            with self._global:
+                lock = self._locks.setdefault(show_id, threading.Lock())
+        return lock
+
+    def __len__(self) -> int:
+        # Locks are never evicted: one per show ever registered or looked up
+        return len(self._locks)
+
+    def memory_usage(self, sample: int = 64) -> Usage:
+        return {"show_locks": container_usage(self._locks, sample)}
+
+
+class StripedLock:
+    """
+    Fixed pool of locks addressed by key hash, for shared aggregates (e.g. per-cinema
+    revenue) updated from different show locks. Keys on different stripes never contend.
+    """
+
+    def __init__(self, stripes: int = 64) -> None:
+        self._locks: List[threading.Lock] = [threading.Lock() for _ in range(stripes)]
+
+    def for_key(self, key: Hashable) -> threading.Lock:
+        return self._locks[hash(key) % len(self._locks)]
@@ -0,0 +1,148 @@
+from __future__ import annotations
+import sys
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, List, Mapping, Optional, Set
+from src.utils.errors import InvalidInputError
+
+# Shared, effectively immortal objects are not attributed to any index
+_ATOMIC = (str, bytes, int, float, bool, type(None))
+
+
+def deep_sizeof(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """
+    Approximate retained size of obj in bytes: sys.getsizeof over containers,
+    dataclass/slotted instances and their contents, counting each object once.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, _ATOMIC) or isinstance(obj, type):
+        return size
+    if isinstance(obj, dict):
+        return size + sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset, deque)):
+        return size + sum(deep_sizeof(x, seen) for x in obj)
+    if hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    for slot in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, slot):
+            size += deep_sizeof(getattr(obj, slot), seen)
+    return size
+
+
+def _head(container: Any, n: int) -> List[Any]:
+    # Live containers may change size while we copy a few items; retry briefly
+    items = container.items() if isinstance(container, Mapping) else container
+    for _ in range(3):
+        try:
+            return list(islice(iter(items), n))
+        except RuntimeError:
+            continue
+    return []
+
+
+def estimate_bytes(container: Any, sample: int = 64) -> int:
+    """
+    Container overhead plus entry count × mean deep size of the first `sample` entries.
+    O(sample), so it is safe to call on large live indexes.
+    """
+    n = len(container)
+    size = sys.getsizeof(container)
+    if n == 0:
+        return size
+    head = _head(container, sample)
+    if not head:
+        return size
+    seen: Set[int] = set()
+    per_entry = sum(deep_sizeof(x, seen) for x in head) / len(head)
+    return size + int(per_entry * n)
+
+
+Usage = Dict[str, Dict[str, int]]  # name -> {"entries": n, "bytes": estimate}
+
+
+def container_usage(container: Any, sample: int = 64) -> Dict[str, int]:
+    return {"entries": len(container), "bytes": estimate_bytes(container, sample)}
+
+
+def nested_usage(containers: Mapping[Any, Any], sample: int = 64) -> Dict[str, int]:
+    """container_usage for a mapping of containers: entries are the inner entries."""
+    inner = [c for _, c in _head(containers, len(containers))]
+    return {
+        "entries": sum(len(c) for c in inner),
+        "bytes": sys.getsizeof(containers) + sum(estimate_bytes(c, sample) for c in inner),
+    }
+
+
+def with_total(usage: Usage) -> Usage:
+    """Adds (or recomputes) the "total" row."""
+    usage = {name: row for name, row in usage.items() if name != "total"}
+    usage["total"] = {
+        "entries": sum(u["entries"] for u in usage.values()),
+        "bytes": sum(u["bytes"] for u in usage.values()),
+    }
+    return usage
+
+
+# ----- tracemalloc snapshot diffs -----
+@dataclass(frozen=True)
+class AllocationDelta:
+    location: str      # "path/file.py:123"
+    size_diff: int     # bytes allocated since the baseline (negative => freed)
+    count_diff: int    # allocated blocks since the baseline
+
+
+class LeakTracker:
+    """
+    Baseline-vs-now tracemalloc diffs, grouped by allocating source line.
+    start() turns tracing on (if it is not already) and takes the baseline; tracing slows
+    allocation-heavy code noticeably, so use it around soak tests rather than in production.
+    """
+
+    def __init__(self, path_filter: Optional[str] = None) -> None:
+        """path_filter: fnmatch pattern of files to keep, e.g. "*/src/*" (None => all)."""
+        self.path_filter = path_filter
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._started_tracing = False
+
+    @property
+    def active(self) -> bool:
+        return self._baseline is not None
+
+    def start(self, frames: int = 1) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            self._started_tracing = True
+        self._baseline = self._snapshot()
+
+    def diff(self, limit: int = 10) -> List[AllocationDelta]:
+        """Top `limit` source lines by growth since start() (largest first)."""
+        if self._baseline is None or not tracemalloc.is_tracing():
+            raise InvalidInputError("Memory tracking not started")
+        stats = self._snapshot().compare_to(self._baseline, "lineno")
+        out = []
+        for stat in stats[:limit]:
+            frame = stat.traceback[0]
+            out.append(
+                AllocationDelta(f"{frame.filename}:{frame.lineno}", stat.size_diff, stat.count_diff)
+            )
+        return out
+
+    def stop(self) -> None:
+        self._baseline = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        snap = tracemalloc.take_snapshot()
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        if self.path_filter is not None:
+            filters.append(tracemalloc.Filter(True, self.path_filter))
+        return snap.filter_traces(filters)
@@ -0,0 +1,70 @@
+import threading
+from datetime import datetime
+import pytest
+
+from src.services.admission import AdmissionConfig
+from src.services.cinema_service import CinemaService
+from src.utils.errors import AdmissionRejectedError, BookingUnavailableError
+
+
+def dt(s: str) -> datetime:
+    return datetime.strptime(s, "%Y-%m-%d %H:%M")
+
+
+def test_token_bucket_fast_rejects_burst_beyond_limit():
+    svc = CinemaService(admission=AdmissionConfig(rate_per_sec=0.001, burst=2))
+    svc.register_show("PVR", "Rush", dt("2025-10-01 10:00"), 100, capacity=10)
+
+    svc.order_tickets("Rush", dt("2025-10-01 10:00"), 1, now=dt("2025-09-30 09:00"))
+    svc.order_tickets("Rush", dt("2025-10-01 10:00"), 1, now=dt("2025-09-30 09:00"))
+    with pytest.raises(AdmissionRejectedError):
+        svc.order_tickets("Rush", dt("2025-10-01 10:00"), 1, now=dt("2025-09-30 09:00"))
+
+    # Buckets are per show key
+    svc.register_show("PVR", "Other", dt("2025-10-01 10:00"), 100, capacity=10)
+    svc.order_tickets("Other", dt("2025-10-01 10:00"), 1, now=dt("2025-09-30 09:00"))
+
+
+def test_sold_out_key_is_refused_without_locking_or_spending_tokens():
+    svc = CinemaService(admission=AdmissionConfig(rate_per_sec=0.001, burst=1))
+    s = svc.register_show("PVR", "Gone", dt("2025-10-02 10:00"), 100, capacity=1)
+    svc.order_tickets("Gone", dt("2025-10-02 10:00"), 1, now=dt("2025-09-30 09:00"))
+
+    lock = svc.store.locks.get(s)
+    with lock:  # any attempt to take the show lock would deadlock this test
+        for _ in range(5):
+            with pytest.raises(BookingUnavailableError):
+                svc.order_tickets("Gone", dt("2025-10-02 10:00"), 1, now=dt("2025-09-30 09:01"))
+
+
+def test_in_flight_cap_queues_until_deadline_then_rejects():
+    svc = CinemaService(admission=AdmissionConfig(max_in_flight=1, queue_timeout=0.05))
+    s = svc.register_show("PVR", "Cap", dt("2025-10-03 10:00"), 100, capacity=10)
+
+    errors = []
+    admitted = threading.Event()
+    book = svc.booking.order_tickets
+
+    def tracked(*args, **kwargs):
+        admitted.set()  # past admission: the only in-flight slot is taken
+        return book(*args, **kwargs)
+
+    svc.booking.order_tickets = tracked
+    lock = svc.store.locks.get(s)
+    lock.acquire()  # first order gets admitted and then parks on the show lock
+
+    def order():
+        try:
+            svc.order_tickets("Cap", dt("2025-10-03 10:00"), 1, now=dt("2025-09-30 09:00"))
+        except AdmissionRejectedError as e:
+            errors.append(e)
+
+    first = threading.Thread(target=order)
+    first.start()
+    assert admitted.wait(timeout=5)
+    order()  # waits queue_timeout for the only slot, then gives up
+    lock.release()
+    first.join()
+
+    assert len(errors) == 1
+    assert svc.store.get_show(s).seats_remaining == 9
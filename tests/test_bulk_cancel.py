@@ -0,0 +1,60 @@
+from datetime import datetime
+
+from src.services.cinema_service import CinemaService
+from src.utils.enums import BookingStatus
+from src.utils.errors import (
+    BookingAlreadyCancelledError,
+    BookingNotFoundError,
+    InvalidInputError,
+)
+
+
+def dt(s: str) -> datetime:
+    return datetime.strptime(s, "%Y-%m-%d %H:%M")
+
+
+NOW = dt("2030-05-01 09:00")
+
+
+def test_bulk_cancel_groups_by_show_and_reports_per_id():
+    svc = CinemaService()
+    a = svc.register_show("PVR", "Bulk", dt("2030-05-01 10:00"), 100, capacity=10)
+    b = svc.register_show("INOX", "Bulk", dt("2030-05-01 10:00"), 200, capacity=10)
+    svc.register_show("PVR", "Late", dt("2030-05-01 12:00"), 300, capacity=2)
+    on_a = [svc.order_tickets("Bulk", dt("2030-05-01 10:00"), 2, NOW)[0] for _ in range(5)]
+    on_b = [svc.order_tickets("Bulk", dt("2030-05-01 10:00"), 4, NOW)[0] for _ in range(2)]
+    gid, _ = svc.order_tickets_split("Late", dt("2030-05-01 12:00"), 2, NOW)
+    svc.cancel_booking(on_a[0], NOW)
+    svc.start_show(b)  # cancels on b: no refund, seats stay sold
+    before = svc.revenue_for("PVR")
+
+    res = svc.cancel_bookings_bulk(on_a + on_b + ["B99999", gid, on_a[1]], NOW)
+
+    assert res.refunds == {**{bid: 100 for bid in on_a[1:]}, **{bid: 0 for bid in on_b}, gid: 300}
+    assert res.total_refund == 700
+    assert isinstance(res.errors[on_a[0]], BookingAlreadyCancelledError)
+    assert isinstance(res.errors["B99999"], BookingNotFoundError)
+    assert len(res.errors) == 2  # the duplicate on_a[1] is processed once
+    assert svc.revenue_for("PVR") == before - 700
+    assert svc.revenue_for("INOX") == 1600
+    assert svc.store.get_show(a).seats_remaining == 10
+    assert svc.store.get_show(b).seats_remaining == 2
+    assert all(svc.store.get_booking(bid).status == BookingStatus.CANCELLED for bid in on_b)
+    assert svc.revenue_breakdown("PVR", "show")[a].refunded == 500
+
+
+def test_bulk_cancel_rejects_split_parts_and_serves_waitlist():
+    svc = CinemaService()
+    svc.register_show("PVR", "Wait", dt("2030-05-01 10:00"), 100, capacity=4)
+    svc.register_show("INOX", "Wait", dt("2030-05-01 10:00"), 100, capacity=4)
+    gid, _ = svc.order_tickets_split("Wait", dt("2030-05-01 10:00"), 8, NOW)
+    part = svc.store.groups_by_id[gid].booking_ids[0]
+    waiting = svc.order_or_wait("Wait", dt("2030-05-01 10:00"), 3, NOW)
+
+    res = svc.cancel_bookings_bulk([part], NOW)
+    assert isinstance(res.errors[part], InvalidInputError) and res.total_refund == 0
+    assert not waiting.done()
+
+    res = svc.cancel_bookings_bulk([gid], NOW)
+    assert res.total_refund == 400
+    assert waiting.result(timeout=1)[0].startswith("B")
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+from datetime import datetime
+import pytest
+
+from src.repo.change_feed import ChangeFeed
+from src.services.cinema_service import CinemaService
+from src.utils.enums import EventType
+from src.utils.errors import FeedOffsetExpiredError
+
+
+def dt(s: str) -> datetime:
+    return datetime.strptime(s, "%Y-%m-%d %H:%M")
+
+
+def test_every_mutation_emits_typed_event_in_order():
+    svc = CinemaService()
+    s = svc.register_show("PVR", "Feed", dt("2025-12-01 10:00"), 200, capacity=5)
+    svc.update_price(s, 250)
+    bid, _ = svc.order_tickets("Feed", dt("2025-12-01 10:00"), 2, now=dt("2025-11-30 09:00"))
+    svc.cancel_booking(bid, now=dt("2025-11-30 09:01"))
+    svc.start_show(s)
+    svc.end_show(s)
+
+    events = svc.store.feed.read(0, max_items=100)
+    assert [e.offset for e in events] == list(range(len(events)))
+    assert [e.type for e in events] == [
+        EventType.SHOW_REGISTERED,
+        EventType.PRICE_UPDATED,
+        EventType.BOOKING_CREATED,
+        EventType.BOOKING_CANCELLED,
+        EventType.SHOW_STARTED,
+        EventType.SHOW_ENDED,
+    ]
+    assert events[2].data["seats_remaining"] == 3
+    assert events[3].data == {
+        "booking_id": bid,
+        "show_id": s,
+        "refund": 250,
+        "seats_restored": True,
+        "seats_remaining": 5,
+        "cancelled_at": dt("2025-11-30 09:01"),
+    }
+
+
+def test_ring_buffer_expires_old_offsets_and_batches_from_any_offset():
+    feed = ChangeFeed(capacity=4)
+    for i in range(10):
+        feed.publish(EventType.PRICE_UPDATED, show_id="S1", price=i)
+    assert (feed.tail, feed.head) == (6, 10)
+    with pytest.raises(FeedOffsetExpiredError):
+        feed.read(5)
+
+    sub = feed.subscribe(from_offset=6, batch_size=3)
+    assert [e.data["price"] for e in sub.poll()] == [6, 7, 8]
+    assert [e.data["price"] for e in sub.poll()] == [9]
+    assert sub.poll() == []
+
+
+def test_blocking_generator_and_backpressure():
+    feed = ChangeFeed(capacity=2, backpressure=True, publish_timeout=5.0)
+    sub = feed.subscribe(batch_size=1)
+    received = []
+
+    def consume():
+        for batch in sub:
+            received.extend(e.data["n"] for e in batch)
+            if len(received) == 5:
+                return
+
+    t = threading.Thread(target=consume)
+    t.start()
+    # Publisher outruns capacity 2 but waits for the consumer instead of overwriting
+    for n in range(5):
+        feed.publish(EventType.SHOW_STARTED, n=n)
+    t.join(timeout=5)
+    sub.close()
+    assert received == [0, 1, 2, 3, 4]
+
+
+def test_async_iterator():
+    feed = ChangeFeed()
+    sub = feed.subscribe(from_offset=0)
+    feed.publish(EventType.SHOW_STARTED, show_id="S1")
+    feed.publish(EventType.SHOW_ENDED, show_id="S1")
+
+    async def first_batch():
+        async for batch in sub:
+            return batch
+
+    batch = asyncio.run(first_batch())
+    assert [e.type for e in batch] == [EventType.SHOW_STARTED, EventType.SHOW_ENDED]
+
+
+def test_backpressure_drops_an_abandoned_subscription_after_one_timeout():
+    feed = ChangeFeed(capacity=2, backpressure=True, publish_timeout=0.05)
+    stalled = feed.subscribe(from_offset=0)  # never read, never closed
+    t0 = time.monotonic()
+    for n in range(20):
+        feed.publish(EventType.SHOW_STARTED, n=n)
+    assert time.monotonic() - t0 < 0.5  # one timeout in total, not one per event
+    with pytest.raises(FeedOffsetExpiredError):
+        stalled.poll()
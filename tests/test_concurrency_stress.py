@@ -0,0 +1,131 @@
+"""
+High thread-count stress for the locking layer. Written to hold without the GIL:
+on a free-threaded build run with PYTHON_GIL=0; on a GIL build a tiny switch interval
+forces the interleavings. STRESS_THREADS scales the thread count.
+"""
+import os
+import random
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+import pytest
+
+from src.repo.memory_store import MemoryStore
+from src.services.cinema_service import CinemaService
+from src.utils.enums import BookingStatus
+from src.utils.errors import BookingAlreadyCancelledError, BookingUnavailableError
+from src.utils.locks import ShowLockManager
+
+THREADS = int(os.environ.get("STRESS_THREADS", "32"))
+
+
+def dt(s: str) -> datetime:
+    return datetime.strptime(s, "%Y-%m-%d %H:%M")
+
+
+@pytest.fixture(autouse=True)
+def fast_switching():
+    old = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(old)
+
+
+def run_all(target, n=THREADS):
+    barrier = threading.Barrier(n)
+    errors = []
+
+    def body(i):
+        barrier.wait()
+        try:
+            target(i)
+        except BaseException as e:  # surface worker failures in the test
+            errors.append(e)
+
+    threads = [threading.Thread(target=body, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors, errors[0]
+
+
+def test_first_lock_access_yields_one_lock_per_show():
+    locks = ShowLockManager()
+    seen = [None] * THREADS
+
+    def grab(i):
+        seen[i] = locks.get("S00001")
+
+    run_all(grab)
+    assert all(lock is seen[0] for lock in seen)
+
+
+def test_revenue_posted_from_many_shows_is_not_lost():
+    store = MemoryStore()
+    run_all(lambda i: [store.add_revenue("PVR", 1) for _ in range(2000)])
+    assert store.get_revenue("PVR") == THREADS * 2000
+
+
+def test_mixed_orders_and_cancels_keep_seat_and_revenue_invariants():
+    svc = CinemaService()
+    slot = dt("2030-05-01 10:00")
+    now = dt("2030-05-01 09:00")
+    for cinema, price in (("PVR", 100), ("INOX", 150), ("PVR", 200)):
+        svc.register_show(cinema, "Stress", slot, price, capacity=THREADS * 4)
+
+    def worker(i):
+        rnd = random.Random(i)
+        mine = []
+        for _ in range(60):
+            if mine and rnd.random() < 0.35:
+                bid = mine.pop(rnd.randrange(len(mine)))
+                try:
+                    svc.cancel_booking(bid, now)
+                except BookingAlreadyCancelledError:
+                    pass
+            else:
+                try:
+                    bid, _ = svc.order_tickets(
+                        "Stress", slot, rnd.randint(1, 3), now, customer_id=f"c{i % 4}"
+                    )
+                    mine.append(bid)
+                except BookingUnavailableError:
+                    pass
+
+    run_all(worker)
+
+    bookings = list(svc.store.bookings_by_id.values())
+    expected = Counter()
+    for show in svc.store.list_shows_by_key("Stress", slot):
+        live = [b for b in bookings if b.show_id == show.show_id
+                and b.status == BookingStatus.CONFIRMED]
+        assert show.seats_remaining + sum(b.quantity for b in live) == show.capacity
+    for b in bookings:
+        cinema = svc.store.get_show(b.show_id).cinema
+        expected[cinema] += b.quantity * b.unit_price
+        if b.status == BookingStatus.CANCELLED:
+            expected[cinema] -= b.quantity * b.unit_price // 2
+    for cinema in ("PVR", "INOX"):
+        assert svc.revenue_for(cinema) == expected[cinema]
+        assert svc.revenue_totals(cinema).net == expected[cinema]
+    per_customer = Counter(b.customer_id for b in bookings)
+    assert {c: len(ids) for c, ids in svc.store.bookings_by_customer.items()} == per_customer
+
+
+def test_holds_repick_when_the_lock_free_choice_sells_out():
+    svc = CinemaService()
+    slot = dt("2030-05-02 10:00")
+    now = dt("2030-05-02 09:00")
+    per_thread = 10
+    # Capacity is exact: a hold failing on a stale pick while seats remain is a bug
+    shows = [
+        svc.register_show("PVR", "Hold", slot, 100, capacity=THREADS * per_thread // 2),
+        svc.register_show("INOX", "Hold", slot, 150, capacity=THREADS * per_thread // 2),
+    ]
+
+    run_all(lambda i: [svc.hold_tickets("Hold", slot, 1, now) for _ in range(per_thread)])
+    assert [svc.store.get_show(s).seats_remaining for s in shows] == [0, 0]
+    with pytest.raises(BookingUnavailableError):
+        svc.hold_tickets("Hold", slot, 1, now)
@@ -0,0 +1,64 @@
+from datetime import datetime
+import pytest
+
+from src.cli.parser import run_line
+from src.services.cinema_service import CinemaService
+from src.utils.enums import BookingStatus
+from src.utils.errors import CustomerLimitExceededError
+
+
+def dt(s: str) -> datetime:
+    return datetime.strptime(s, "%Y-%m-%d %H:%M")
+
+
+NOW = dt("2030-05-01 09:00")
+
+
+def test_my_bookings_are_paginated_most_recent_first():
+    svc = CinemaService()
+    svc.register_show("PVR", "Mine", dt("2030-05-01 10:00"), 100, capacity=50)
+    mine = [svc.order_tickets("Mine", dt("2030-05-01 10:00"), 1, NOW, customer_id="c1")[0]
+            for _ in range(5)]
+    svc.order_tickets("Mine", dt("2030-05-01 10:00"), 1, NOW, customer_id="c2")
+    svc.order_tickets("Mine", dt("2030-05-01 10:00"), 1, NOW)
+    svc.cancel_booking(mine[1], NOW)
+
+    page, cursor = svc.customer_bookings("c1", limit=2)
+    assert [b.booking_id for b in page] == [mine[4], mine[3]]
+    # New bookings do not shift later pages
+    newest = svc.order_tickets("Mine", dt("2030-05-01 10:00"), 1, NOW, customer_id="c1")[0]
+    page, cursor = svc.customer_bookings("c1", limit=2, cursor=cursor)
+    assert [b.booking_id for b in page] == [mine[2], mine[1]]
+    assert page[1].status == BookingStatus.CANCELLED
+    page, cursor = svc.customer_bookings("c1", limit=2, cursor=cursor)
+    assert [b.booking_id for b in page] == [mine[0]] and cursor is None
+    assert svc.customer_bookings("c1", limit=1)[0][0].booking_id == newest
+    assert svc.customer_bookings("nobody") == ([], None)
+
+
+def test_per_customer_limit_counts_live_tickets_per_show():
+    svc = CinemaService(max_tickets_per_customer=4)
+    a = svc.register_show("PVR", "Cap", dt("2030-05-01 10:00"), 100, capacity=20)
+    bid, _ = svc.order_tickets("Cap", dt("2030-05-01 10:00"), 3, NOW, customer_id="c1")
+    with pytest.raises(CustomerLimitExceededError):
+        svc.order_tickets("Cap", dt("2030-05-01 10:00"), 2, NOW, customer_id="c1")
+    assert svc.store.get_show(a).seats_remaining == 17  # rejected order took nothing
+
+    svc.order_tickets("Cap", dt("2030-05-01 10:00"), 4, NOW, customer_id="c2")
+    svc.order_tickets("Cap", dt("2030-05-01 10:00"), 10, NOW)  # anonymous: no limit
+    svc.cancel_booking(bid, NOW)  # frees c1's quota
+    svc.order_tickets("Cap", dt("2030-05-01 10:00"), 4, NOW, customer_id="c1")
+    assert svc.store.customer_tickets("c1", a) == 4
+
+
+def test_cli_customer_orders_and_listing():
+    svc = CinemaService(max_tickets_per_customer=2)
+    run_line(svc, "REGISTER_SHOW PVR Cli 2030-05-01 10:00 100 10")
+    assert run_line(svc, "ORDER_TICKETS Cli 2030-05-01 10:00 1 CUSTOMER=u1").startswith("OK B00001")
+    assert run_line(svc, "ORDER_TICKETS Cli 2030-05-01 10:00 1 CUSTOMER=u1").startswith("OK B00002")
+    assert run_line(svc, "ORDER_TICKETS Cli 2030-05-01 10:00 1 CUSTOMER=u1") == (
+        "ERROR: Customer Limit Exceeded"
+    )
+    assert run_line(svc, "MY_BOOKINGS u1 LIMIT=1") == "B00002:S00001:1:CONFIRMED NEXT=1"
+    assert run_line(svc, "MY_BOOKINGS u1 LIMIT=1 CURSOR=1") == "B00001:S00001:1:CONFIRMED"
+    assert run_line(svc, "MY_BOOKINGS u1 LIMIT=0") == "ERROR: Invalid Input"
@@ -0,0 +1,124 @@
+import csv
+import gzip
+import io
+import json
+import lzma
+import threading
+from datetime import datetime
+import pytest
+
+from src.cli.parser import run_line
+from src.repo.replication import LogShipper
+from src.repo.snapshot import StoreSnapshot
+from src.services.cinema_service import CinemaService
+from src.services.export import read_columnar
+from src.services.replica_service import ReplicaCinemaService
+from src.utils.errors import InvalidInputError
+
+
+def dt(s: str) -> datetime:
+    return datetime.strptime(s, "%Y-%m-%d %H:%M")
+
+
+NOW = dt("2030-05-01 09:00")
+
+
+def make_service():
+    svc = CinemaService()
+    svc.register_show("PVR", "Exp", dt("2030-05-01 10:00"), 100, capacity=4)
+    svc.register_show("INOX", "Exp", dt("2030-05-01 10:00"), 150, capacity=10)
+    b1, _ = svc.order_tickets("Exp", dt("2030-05-01 10:00"), 2, NOW, customer_id="c1")
+    svc.order_tickets_split("Exp", dt("2030-05-01 10:00"), 11, NOW)
+    svc.cancel_booking(b1, NOW)
+    return svc
+
+
+def test_snapshot_is_a_consistent_cut_while_bookings_continue():
+    svc = make_service()
+    snap = StoreSnapshot(svc.store)
+    later, _ = svc.order_tickets("Exp", dt("2030-05-01 10:00"), 1, NOW)
+    b2 = svc.store.bookings_by_id["B00003"]  # part of the split, confirmed at the cut
+    svc.cancel_booking(b2.group_id, NOW)
+
+    rows = list(snap.iter_bookings())
+    assert [r[0] for r in rows] == ["B00001", "B00003", "B00004"]  # B00002 is the group id
+    assert [r[5] for r in rows] == ["CANCELLED", "CONFIRMED", "CONFIRMED"]
+    assert later not in [r[0] for r in rows]
+    assert snap.revenue == [("INOX", 1350, 1350, 0, 1350), ("PVR", 300, 400, 100, 300)]
+
+
+@pytest.mark.parametrize(
+    "fmt,compression", [("csv", None), ("jsonl", "gzip"), ("columnar", None), ("columnar", "xz")]
+)
+def test_export_formats_round_trip(tmp_path, fmt, compression):
+    svc = make_service()
+    res = svc.export(str(tmp_path), fmt, compression, chunk_rows=2)
+    assert res.rows == {"bookings": 3, "shows": 2, "revenue": 2}
+
+    path = res.paths["bookings"]
+    opener = gzip.open if compression == "gzip" else open
+    if fmt == "csv":
+        with open(path, newline="") as f:
+            records = list(csv.DictReader(f))
+        assert records[0]["created_at"] == "2030-05-01T09:00:00"
+        assert records[1]["customer_id"] == ""
+    elif fmt == "jsonl":
+        with opener(path, "rt") as f:
+            records = [json.loads(line) for line in f]
+        assert records[0]["customer_id"] == "c1" and records[1]["customer_id"] is None
+    else:
+        with (lzma.open(path) if compression == "xz" else open(path, "rb")) as f:
+            records = list(read_columnar(f))
+        assert records[0]["created_at"] == NOW
+        assert records[1]["customer_id"] is None
+    assert [str(r["quantity"]) for r in records] == ["2", "2", "9"]
+    assert [r["status"] for r in records] == ["CANCELLED", "CONFIRMED", "CONFIRMED"]
+
+
+def test_export_runs_alongside_live_bookings(tmp_path):
+    svc = CinemaService()
+    svc.register_show("PVR", "Live", dt("2030-05-01 10:00"), 100, capacity=5000)
+    for _ in range(500):
+        svc.order_tickets("Live", dt("2030-05-01 10:00"), 1, NOW)
+    stop = threading.Event()
+
+    def book():
+        while not stop.is_set():
+            svc.order_tickets("Live", dt("2030-05-01 10:00"), 1, NOW)
+
+    t = threading.Thread(target=book)
+    t.start()
+    try:
+        res = svc.export(str(tmp_path), "columnar", chunk_rows=64)
+    finally:
+        stop.set()
+        t.join()
+    with open(res.paths["bookings"], "rb") as f:
+        sold = sum(r["quantity"] for r in read_columnar(f))
+    with open(res.paths["revenue"], "rb") as f:
+        revenue = next(read_columnar(f))
+    assert sold >= 500 and revenue["gross"] == sold * 100  # bookings and revenue agree
+
+
+def test_cli_export(tmp_path):
+    svc = make_service()
+    out = run_line(svc, f"EXPORT {tmp_path} FORMAT=JSONL COMPRESS=BZ2")
+    assert out.startswith("OK OFFSET=") and out.endswith("BOOKINGS=3 SHOWS=2 REVENUE=2")
+    assert (tmp_path / "bookings.jsonl.bz2").exists()
+    assert run_line(svc, f"EXPORT {tmp_path} FORMAT=XML") == "ERROR: Invalid Input"
+    with pytest.raises(InvalidInputError):
+        svc.export(str(tmp_path), "csv", "zip")
+
+
+def test_replica_export_matches_the_primary(tmp_path):
+    primary = make_service()
+    log = io.StringIO()
+    LogShipper(primary.store.feed, log).ship()
+    replica = ReplicaCinemaService()
+    replica.replica.follow(io.StringIO(log.getvalue()))
+
+    assert run_line(replica, f"EXPORT {tmp_path / 'r'}") == run_line(
+        primary, f"EXPORT {tmp_path / 'p'}"
+    )
+    for name in ("bookings.csv", "shows.csv", "revenue.csv"):
+        assert (tmp_path / "r" / name).read_text() == (tmp_path / "p" / name).read_text()
@@ -0,0 +1,74 @@
+import time
+from datetime import datetime, timedelta
+import pytest
+
+from src.services.cinema_service import CinemaService
+from src.utils.enums import HoldStatus
+from src.utils.errors import BookingUnavailableError, HoldExpiredError
+
+
+def future_show(hours: int = 2) -> datetime:
+    return datetime.now() + timedelta(hours=hours)
+
+
+def test_hold_then_confirm_creates_booking_at_held_price():
+    svc = CinemaService()
+    start = future_show()
+    s = svc.register_show("PVR", "Held", start, 300, capacity=4)
+
+    hid, sid = svc.hold_tickets("Held", start, 3, now=datetime.now())
+    assert sid == s
+    assert svc.store.get_show(s).seats_remaining == 1
+    assert svc.revenue_for("PVR") == 0  # no revenue until confirmed
+
+    svc.update_price(s, 500)
+    bid = svc.confirm_hold(hid, now=datetime.now())
+    assert svc.store.get_booking(bid).unit_price == 300
+    assert svc.revenue_for("PVR") == 300 * 3
+    assert svc.store.get_hold(hid).status == HoldStatus.CONFIRMED
+    with pytest.raises(HoldExpiredError):
+        svc.confirm_hold(hid, now=datetime.now())
+
+
+def test_expired_holds_are_swept_in_bulk_by_scheduler():
+    svc = CinemaService()
+    start = future_show()
+    s = svc.register_show("PVR", "Sweep", start, 100, capacity=5)
+
+    h1, _ = svc.hold_tickets("Sweep", start, 2, now=datetime.now(), ttl=timedelta(seconds=0.2))
+    h2, _ = svc.hold_tickets("Sweep", start, 3, now=datetime.now(), ttl=timedelta(seconds=0.2))
+    with pytest.raises(BookingUnavailableError):
+        svc.order_tickets("Sweep", start, 1, now=datetime.now())
+
+    time.sleep(0.5)
+    assert svc.store.get_hold(h1).status == HoldStatus.RELEASED
+    assert svc.store.get_hold(h2).status == HoldStatus.RELEASED
+    assert svc.store.get_show(s).seats_remaining == 5
+    with pytest.raises(HoldExpiredError):
+        svc.confirm_hold(h1, now=datetime.now())
+
+
+def test_confirm_after_expiry_releases_even_before_sweep():
+    svc = CinemaService()
+    start = future_show()
+    s = svc.register_show("PVR", "Late", start, 100, capacity=2)
+    now = datetime.now()
+    hid, _ = svc.hold_tickets("Late", start, 2, now=now, ttl=timedelta(minutes=5))
+
+    with pytest.raises(HoldExpiredError):
+        svc.confirm_hold(hid, now=now + timedelta(minutes=6))
+    assert svc.store.get_show(s).seats_remaining == 2
+    # Sweeper later finds nothing left to release
+    assert svc.holds.release_expired(now + timedelta(minutes=10)) == 0
+
+
+def test_released_hold_seats_go_to_waitlist():
+    svc = CinemaService()
+    start = future_show()
+    s = svc.register_show("PVR", "HoldWait", start, 100, capacity=2)
+    hid, _ = svc.hold_tickets("HoldWait", start, 2, now=datetime.now())
+    fut = svc.order_or_wait("HoldWait", start, 2, now=datetime.now())
+
+    svc.release_hold(hid, now=datetime.now())
+    assert fut.result(timeout=1)[1] == s
+    assert svc.store.get_show(s).seats_remaining == 0
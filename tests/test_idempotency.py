@@ -0,0 +1,88 @@
+import threading
+import time
+from datetime import datetime, timedelta
+import pytest
+
+from src.cli.parser import run_line
+from src.services.cinema_service import CinemaService
+from src.services.idempotency import IdempotencyCache
+from src.utils.clock import VirtualClock
+from src.utils.errors import BookingUnavailableError, InvalidInputError
+
+
+def dt(s: str) -> datetime:
+    return datetime.strptime(s, "%Y-%m-%d %H:%M")
+
+
+def test_retried_order_and_cancel_return_original_result():
+    svc = CinemaService()
+    s = svc.register_show("PVR", "Retry", dt("2025-10-10 10:00"), 200, capacity=5)
+    first = svc.order_tickets("Retry", dt("2025-10-10 10:00"), 2, dt("2025-10-09 09:00"), "k1")
+    again = svc.order_tickets("Retry", dt("2025-10-10 10:00"), 2, dt("2025-10-09 09:01"), "k1")
+    assert first == again
+    assert svc.store.get_show(s).seats_remaining == 3
+    assert svc.revenue_for("PVR") == 400
+
+    refund = svc.cancel_booking(first[0], dt("2025-10-09 09:02"), idempotency_key="c1")
+    assert svc.cancel_booking(first[0], dt("2025-10-09 09:03"), idempotency_key="c1") == refund
+
+    with pytest.raises(InvalidInputError):
+        svc.order_tickets("Retry", dt("2025-10-10 10:00"), 3, dt("2025-10-09 09:04"), "k1")
+
+
+def test_failures_are_not_cached():
+    svc = CinemaService()
+    svc.register_show("PVR", "Full", dt("2025-10-11 10:00"), 200, capacity=1)
+    bid, _ = svc.order_tickets("Full", dt("2025-10-11 10:00"), 1, dt("2025-10-10 09:00"))
+    with pytest.raises(BookingUnavailableError):
+        svc.order_tickets("Full", dt("2025-10-11 10:00"), 1, dt("2025-10-10 09:01"), "k2")
+    svc.cancel_booking(bid, dt("2025-10-10 09:02"))
+    svc.order_tickets("Full", dt("2025-10-11 10:00"), 1, dt("2025-10-10 09:03"), "k2")
+
+
+def test_concurrent_duplicates_coalesce_onto_first_request():
+    cache = IdempotencyCache()
+    calls = []
+    gate = threading.Event()
+
+    def slow():
+        calls.append(1)
+        gate.wait(1)
+        return ("B1", "S1")
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.run("k", ("x",), slow)))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    gate.set()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert results == [("B1", "S1")] * 8
+
+
+def test_cache_is_bounded_and_ttl_evicting():
+    clock = VirtualClock(dt("2025-10-12 09:00"))
+    cache = IdempotencyCache(max_entries=2, ttl=timedelta(minutes=1), clock=clock)
+    for k in "abc":
+        cache.run(k, (), lambda: k)
+    assert len(cache) == 2
+    assert cache.run("b", (), lambda: "new") == "b"
+    clock.advance(timedelta(minutes=2))
+    assert cache.run("b", (), lambda: "new") == "new"
+
+
+def test_cli_key_option():
+    svc = CinemaService()
+    run_line(svc, "REGISTER_SHOW PVR Cli 2030-01-01 10:00 100 5")
+    out = run_line(svc, "ORDER_TICKETS Cli 2030-01-01 10:00 2 KEY=abc")
+    assert run_line(svc, "ORDER_TICKETS Cli 2030-01-01 10:00 2 KEY=abc") == out
+    bid = out.split()[1]
+    assert run_line(svc, f"CANCEL_BOOKING {bid} KEY=z") == "OK REFUND=100"
+    assert run_line(svc, f"CANCEL_BOOKING {bid} KEY=z") == "OK REFUND=100"
+    assert run_line(svc, f"CANCEL_BOOKING {bid}") == "ERROR: Booking Already Cancelled"
+    assert run_line(svc, "ORDER_TICKETS Cli 2030-01-01 10:00 2 bogus") == "ERROR: Invalid Input"
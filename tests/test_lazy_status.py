@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+import pytest
+
+from src.services.cinema_service import CinemaService
+from src.utils.clock import VirtualClock
+from src.utils.enums import ShowStatus
+from src.utils.errors import ShowAlreadyStartedError
+
+
+def dt(s: str) -> datetime:
+    return datetime.strptime(s, "%Y-%m-%d %H:%M")
+
+
+def test_status_is_derived_from_clock_without_per_show_jobs():
+    clock = VirtualClock(dt("2025-09-01 09:00"))
+    svc = CinemaService(clock=clock, lazy_status=True)
+    shows = [
+        svc.register_show("PVR", "Lazy", dt("2025-09-01 10:00"), 100 + i, capacity=5)
+        for i in range(50)
+    ]
+    assert svc.scheduler.pending() == 1  # only the periodic sweep
+    assert all(svc.show_status(s) == ShowStatus.REGISTERED for s in shows)
+
+    bid, _ = svc.order_tickets("Lazy", dt("2025-09-01 10:00"), 2, now=dt("2025-09-01 09:59"))
+    # Booking at/after start_time is refused even though nothing flipped the status yet
+    with pytest.raises(ShowAlreadyStartedError):
+        svc.order_tickets("Lazy", dt("2025-09-01 10:00"), 1, now=dt("2025-09-01 10:00"))
+    # Cancel after start: no refund
+    assert svc.cancel_booking(bid, now=dt("2025-09-01 10:00")) == 0
+
+
+def test_sweep_materialises_started_shows_in_bulk():
+    clock = VirtualClock(dt("2025-09-02 09:00"))
+    svc = CinemaService(clock=clock, lazy_status=True, status_sweep_interval=timedelta(minutes=5))
+    early = svc.register_show("PVR", "A", dt("2025-09-02 09:02"), 100, capacity=5)
+    late = svc.register_show("PVR", "B", dt("2025-09-02 12:00"), 100, capacity=5)
+
+    clock.advance(timedelta(minutes=3))
+    # Derived already, stored value not yet
+    assert svc.show_status(early) == ShowStatus.STARTED
+    assert svc.store.get_show(early).status == ShowStatus.REGISTERED
+    with pytest.raises(ShowAlreadyStartedError):
+        svc.update_price(early, 150)
+
+    clock.advance(timedelta(minutes=3))  # sweep at 09:05 fires
+    assert svc.store.get_show(early).status == ShowStatus.STARTED
+    assert svc.store.get_show(late).status == ShowStatus.REGISTERED
+    assert svc.scheduler.pending() == 1  # sweep re-armed
+
+    # Ending works off the derived status too
+    svc.end_show(early)
+    assert svc.show_status(early) == ShowStatus.ENDED
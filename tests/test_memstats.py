@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+import io
+import tracemalloc
+import pytest
+
+from src.cli.parser import run_line
+from src.repo.replication import LogShipper
+from src.services.admission import AdmissionConfig
+from src.services.cinema_service import CinemaService
+from src.services.replica_service import ReplicaCinemaService
+from src.utils.errors import InvalidInputError
+
+
+def future_show(hours: int = 2) -> datetime:
+    return datetime.now().replace(second=0, microsecond=0) + timedelta(hours=hours)
+
+
+def test_memory_stats_counts_every_component():
+    svc = CinemaService()
+    start = future_show()
+    for i in range(3):
+        svc.register_show("PVR", f"Mem{i}", start, 100, capacity=100)
+    before = svc.memory_stats()
+    for _ in range(50):
+        svc.order_tickets("Mem0", start, 1, datetime.now(), customer_id="c1")
+    svc.hold_tickets("Mem1", start, 2, datetime.now())
+    stats = svc.memory_stats()
+
+    assert stats["shows_by_id"]["entries"] == 3
+    assert stats["bookings_by_id"]["entries"] == 50
+    assert stats["bookings_by_id"]["bytes"] > before["bookings_by_id"]["bytes"]
+    assert stats["bookings_by_customer"]["entries"] == 1
+    assert stats["holds_by_id"]["entries"] == 1
+    assert stats["hold_expiries"]["entries"] == 1
+    assert stats["show_locks"]["entries"] == 2  # created on first use, never evicted
+    assert stats["scheduler_jobs"]["entries"] == 4  # 3 auto-starts + hold sweep
+    assert stats["change_feed"]["entries"] == 3 + 50 + 1
+    # cinema total + movie, show, day, hour, movie_day buckets (all sales in one hour)
+    assert before["revenue_rollups"]["entries"] == 0
+    assert stats["revenue_rollups"]["entries"] == 6
+    assert stats["pending_starts"]["entries"] == 0  # lazy-status mode only
+    assert stats["total"]["entries"] == sum(
+        row["entries"] for name, row in stats.items() if name != "total"
+    )
+    assert stats["total"]["bytes"] > before["total"]["bytes"]
+
+
+def test_leak_tracker_diffs_allocations_since_baseline():
+    svc = CinemaService()
+    start = future_show()
+    svc.register_show("PVR", "Leak", start, 100, capacity=5000)
+    was_tracing = tracemalloc.is_tracing()
+
+    with pytest.raises(InvalidInputError):
+        svc.memory_tracker.diff()
+    svc.memory_tracker.start()
+    try:
+        for _ in range(2000):
+            svc.order_tickets("Leak", start, 1, datetime.now())
+        deltas = svc.memory_tracker.diff(limit=5)
+    finally:
+        svc.memory_tracker.stop()
+
+    assert len(deltas) == 5
+    assert deltas[0].size_diff > 0
+    assert any("src" in d.location for d in deltas)
+    assert tracemalloc.is_tracing() == was_tracing
+
+
+def test_cli_memstats():
+    svc = CinemaService()
+    run_line(svc, f"REGISTER_SHOW PVR Cli {future_show():%Y-%m-%d %H:%M} 100 10")
+    out = run_line(svc, "MEMSTATS").split()
+    assert out[0].startswith("shows_by_id:1/") and out[-1].startswith("total:")
+    assert run_line(svc, "MEMSTATS DIFF") == "ERROR: Invalid Input"
+    assert run_line(svc, "MEMSTATS START") == "OK"
+    assert len(run_line(svc, "MEMSTATS DIFF 3").split()) <= 3
+    assert run_line(svc, "MEMSTATS STOP") == "OK"
+    assert run_line(svc, "MEMSTATS BOGUS") == "ERROR: Invalid Input"
+
+
+def test_memstats_on_a_replica():
+    primary = CinemaService()
+    start = future_show()
+    primary.register_show("PVR", "MemR", start, 100, capacity=10)
+    primary.order_tickets("MemR", start, 2, datetime.now())
+    log = io.StringIO()
+    LogShipper(primary.store.feed, log).ship()
+    replica = ReplicaCinemaService()
+    replica.replica.follow(io.StringIO(log.getvalue()))
+
+    stats = replica.memory_stats()
+    assert stats["bookings_by_id"]["entries"] == 1
+    assert stats["change_feed"]["entries"] == 2  # mirrored from the primary
+    out = run_line(replica, "MEMSTATS")
+    assert "bookings_by_id:1/" in out and f"total:{stats['total']['entries']}/" in out
+    assert run_line(replica, "MEMSTATS START") == "OK"
+    assert run_line(replica, "MEMSTATS STOP") == "OK"
+
+
+def test_memstats_reports_lazy_starts_admission_buckets_and_rollup_growth():
+    svc = CinemaService(admission=AdmissionConfig(rate_per_sec=1000, burst=100), lazy_status=True)
+    start = future_show()
+    for i in range(3):
+        svc.register_show("PVR", f"Grow{i}", start, 100, capacity=10)
+    svc.order_tickets("Grow0", start, 1, datetime.now())
+    stats = svc.memory_stats()
+    assert stats["pending_starts"]["entries"] == 3
+    assert stats["admission_buckets"]["entries"] == 1
+
+    svc.order_tickets("Grow1", start, 1, datetime.now())
+    # a new movie adds movie, show and movie_day buckets
+    grown = svc.memory_stats()["revenue_rollups"]["entries"]
+    assert grown == stats["revenue_rollups"]["entries"] + 3
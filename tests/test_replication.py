@@ -0,0 +1,149 @@
+import io
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+import pytest
+
+from src.cli.parser import run_line
+from src.repo.replication import LogShipper, Replica, ReplicationLag
+from src.services.cinema_service import CinemaService
+from src.services.replica_service import ReplicaCinemaService
+from src.utils.clock import VirtualClock
+from src.utils.enums import BookingStatus, HoldStatus
+from src.utils.errors import ReadOnlyReplicaError, ReplicationError
+
+
+def future_show(hours: int = 2) -> datetime:
+    return datetime.now().replace(second=0, microsecond=0) + timedelta(hours=hours)
+
+
+def ship_all(primary: CinemaService) -> ReplicaCinemaService:
+    log = io.StringIO()
+    LogShipper(primary.store.feed, log).ship()
+    replica = ReplicaCinemaService()
+    replica.replica.follow(io.StringIO(log.getvalue()))
+    return replica
+
+
+def test_replica_mirrors_shows_bookings_holds_and_revenue():
+    primary = CinemaService()
+    start = future_show()
+    now = datetime.now()
+    a = primary.register_show("PVR", "Mirror", start, 200, capacity=6, seats_per_row=3)
+    b = primary.register_show("INOX", "Mirror", start, 300, capacity=4)
+    primary.update_price(a, 250)
+    bid, _ = primary.order_tickets("Mirror", start, 2, now, customer_id="c9")
+    gid, _ = primary.order_tickets_split("Mirror", start, 7, now)
+    hid, _ = primary.hold_tickets("Mirror", start, 1, now)
+    primary.confirm_hold(hid, now)
+    primary.cancel_booking(bid, now)
+    primary.cancel_booking(gid, now)
+    released, _ = primary.hold_tickets("Mirror", start, 2, now)
+    primary.release_hold(released, now)
+    primary.start_show(b)
+
+    replica = ship_all(primary)
+    for sid in (a, b):
+        p, r = primary.store.get_show(sid), replica.get_show(sid)
+        assert (r.price, r.seats_remaining, r.status) == (p.price, p.seats_remaining, p.status)
+    assert replica.get_show(a).seat_map.rows == primary.store.get_show(a).seat_map.rows
+    assert replica.all_revenue() == primary.all_revenue()
+    assert repr(replica.revenue_totals("PVR")) == repr(primary.revenue_totals("PVR"))
+    assert replica.store.groups_by_id[gid].status == BookingStatus.CANCELLED
+    assert replica.store.get_hold(hid).status == HoldStatus.CONFIRMED
+    assert replica.store.get_hold(released).status == HoldStatus.RELEASED
+    assert replica.availability("Mirror", start) == primary.availability("Mirror", start)
+    assert replica.lag().offsets == 0
+    assert [b.booking_id for b in replica.customer_bookings("c9")[0]] == [bid]
+    assert replica.store.customer_tickets("c9", a) == 0
+
+    for line in ("REPORT_REVENUE", "REPORT_REVENUE PVR BY MOVIE GROSS"):
+        assert run_line(replica, line) == run_line(primary, line)
+    assert run_line(replica, f"START_SHOW {a}") == "ERROR: Read Only Replica"
+    with pytest.raises(ReadOnlyReplicaError):
+        replica.order_tickets("Mirror", start, 1, now)
+
+
+def test_lag_heartbeats_duplicates_and_gaps():
+    primary = CinemaService()
+    start = future_show()
+    primary.register_show("PVR", "Lag", start, 100, capacity=10)
+    for _ in range(3):
+        primary.order_tickets("Lag", start, 1, datetime.now())
+    events = primary.store.feed.read(0)
+
+    log = io.StringIO()
+    shipper = LogShipper(primary.store.feed, log, batch_size=2)
+    shipper.ship()
+    shipper.ship()
+    shipper.ship()  # idle => heartbeat carrying the primary head
+    lines = log.getvalue().splitlines()
+
+    replica = Replica()
+    replica.apply_line(lines[0])
+    replica.apply_line(lines[-1])
+    lag = replica.lag()
+    assert lag.offsets == len(events) - 1
+    assert lag.seconds == pytest.approx(json.loads(lines[-1])["ts"] - events[0].ts)
+
+    replica.apply_line(lines[0])  # already applied: skipped
+    with pytest.raises(ReplicationError):
+        replica.apply_line(lines[2])  # offset 2 before offset 1
+    for line in lines[1:]:
+        replica.apply_line(line)
+    assert replica.lag().offsets == 0
+    assert replica.store.get_revenue("PVR") == 300
+
+
+def test_replica_follows_live_primary_over_a_pipe():
+    primary = CinemaService()
+    start = future_show()
+    sid = primary.register_show("PVR", "Piped", start, 100, capacity=1000)
+    r, w = os.pipe()
+    shipper = LogShipper(primary.store.feed, os.fdopen(w, "w"), heartbeat=0.01)
+    replica = ReplicaCinemaService()
+    follower = threading.Thread(target=replica.replica.follow, args=(os.fdopen(r),))
+    shipper.start()
+    follower.start()
+
+    def book():
+        for _ in range(50):
+            primary.order_tickets("Piped", start, 1, datetime.now())
+
+    threads = [threading.Thread(target=book) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    shipper.stop()
+    shipper.out.close()
+    follower.join(timeout=5)
+
+    assert replica.get_show(sid).seats_remaining == 600
+    assert replica.revenue_for("PVR") == primary.revenue_for("PVR") == 40000
+    assert replica.lag().offsets == 0
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_failed_shipper_stops_loudly_and_replica_lag_grows():
+    primary = CinemaService()
+    out = io.StringIO()
+    out.close()  # broken pipe stand-in: every write fails
+    shipper = LogShipper(primary.store.feed, out, heartbeat=0.01)
+    shipper.start()
+    shipper._thread.join(timeout=5)
+    assert not shipper._thread.is_alive()
+    assert isinstance(shipper.error, ValueError)
+    with pytest.raises(ReplicationError):
+        shipper.stop()
+
+    clock = VirtualClock(datetime(2030, 1, 1, 9, 0))
+    replica = Replica(heartbeat=1.0, clock=clock)
+    replica.apply({"hb": 0, "ts": 0.0})
+    clock.advance(timedelta(seconds=0.5))
+    assert replica.lag() == ReplicationLag(0, 0.0)
+    clock.advance(timedelta(seconds=4.5))  # heartbeats stopped arriving
+    assert replica.lag() == ReplicationLag(0, 5.0)
+    replica.apply({"hb": 0, "ts": 5.0})
+    assert replica.lag().seconds == 0.0
@@ -0,0 +1,55 @@
+from datetime import datetime
+import pytest
+
+from src.services.cinema_service import CinemaService
+from src.services.repricing import ShowSelector, percent_change, set_price
+from src.utils.enums import EventType
+from src.utils.errors import InvalidInputError
+
+
+def dt(s: str) -> datetime:
+    return datetime.strptime(s, "%Y-%m-%d %H:%M")
+
+
+def _catalog():
+    svc = CinemaService()
+    sat = svc.register_show("PVR", "X", dt("2030-06-08 18:00"), 200, capacity=10)
+    sun = svc.register_show("INOX", "X", dt("2030-06-09 18:00"), 300, capacity=10)
+    mon = svc.register_show("PVR", "X", dt("2030-06-10 18:00"), 200, capacity=10)
+    other = svc.register_show("PVR", "Y", dt("2030-06-08 18:00"), 250, capacity=10)
+    # Sat and Sun are nearly sold out (< 20% left)
+    svc.order_tickets("X", dt("2030-06-08 18:00"), 9, now=dt("2030-06-01 09:00"))
+    svc.order_tickets("X", dt("2030-06-09 18:00"), 9, now=dt("2030-06-01 09:00"))
+    svc.order_tickets("Y", dt("2030-06-08 18:00"), 9, now=dt("2030-06-01 09:00"))
+    return svc, sat, sun, mon, other
+
+
+def test_rule_based_repricing_selects_by_movie_time_and_occupancy():
+    svc, sat, sun, mon, other = _catalog()
+    weekend = ShowSelector(
+        movie="X",
+        start_from=dt("2030-06-08 00:00"),
+        start_to=dt("2030-06-10 00:00"),
+        max_seats_left_ratio=0.2,
+    )
+    assert svc.reprice(weekend, percent_change(10)) == 2
+    prices = {sid: svc.store.get_show(sid).price for sid in (sat, sun, mon, other)}
+    assert prices == {sat: 220, sun: 330, mon: 200, other: 250}
+
+    # New price applies to the next booking on that show
+    svc.update_price(mon, 500)
+    _, sid = svc.order_tickets("X", dt("2030-06-08 18:00"), 1, now=dt("2030-06-01 10:00"))
+    assert sid == sat and svc.revenue_for("PVR") == 200 * 9 + 250 * 9 + 220
+
+    events = [e for e in svc.store.feed.read(0, 100) if e.type == EventType.PRICE_UPDATED]
+    assert [e.data["show_id"] for e in events] == [sat, sun, mon]
+
+
+def test_started_shows_and_no_op_prices_are_not_counted():
+    svc, sat, sun, mon, other = _catalog()
+    svc.start_show(sat)
+    assert svc.reprice(ShowSelector(cinema="PVR"), set_price(200)) == 1  # only `other`
+    assert svc.store.get_show(sat).price == 200
+    assert svc.reprice(ShowSelector(predicate=lambda s: s.price > 1000), set_price(5)) == 0
+    with pytest.raises(InvalidInputError):
+        svc.reprice(ShowSelector(movie="Y"), set_price(0))
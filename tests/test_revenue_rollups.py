@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from src.cli.parser import run_line
+from src.services.cinema_service import CinemaService
+
+
+def dt(s: str) -> datetime:
+    return datetime.strptime(s, "%Y-%m-%d %H:%M")
+
+
+def _setup():
+    svc = CinemaService()
+    a = svc.register_show("PVR", "Alpha", dt("2025-12-10 10:00"), 100, capacity=10)
+    b = svc.register_show("PVR", "Beta", dt("2025-12-10 18:00"), 200, capacity=10)
+    svc.register_show("INOX", "Alpha", dt("2025-12-10 10:00"), 150, capacity=10)
+
+    svc.order_tickets("Alpha", dt("2025-12-10 10:00"), 2, now=dt("2025-12-08 09:15"))  # PVR 200
+    bid, _ = svc.order_tickets("Beta", dt("2025-12-10 18:00"), 3, now=dt("2025-12-08 11:30"))  # 600
+    svc.order_tickets("Beta", dt("2025-12-10 18:00"), 1, now=dt("2025-12-09 20:00"))  # 200
+    svc.cancel_booking(bid, now=dt("2025-12-09 21:00"))  # refund 300
+    return svc, a, b
+
+
+def test_rollups_track_gross_refunds_and_dimensions():
+    svc, a, b = _setup()
+    t = svc.revenue_totals("PVR")
+    assert (t.gross, t.refunded, t.net) == (1000, 300, 700)
+    assert t.net == svc.revenue_for("PVR")
+
+    by_movie = svc.revenue_breakdown("PVR", "movie")
+    assert {k: v.net for k, v in by_movie.items()} == {"Alpha": 200, "Beta": 500}
+    by_show = svc.revenue_breakdown("PVR", "show")
+    assert by_show[b].refunded == 300
+    by_day = svc.revenue_breakdown("PVR", "day")
+    assert {k: (v.gross, v.refunded) for k, v in by_day.items()} == {
+        "2025-12-08": (800, 0),
+        "2025-12-09": (200, 300),
+    }
+    assert svc.revenue_breakdown("PVR", "movie_day")["Beta@2025-12-09"].net == -100
+    assert svc.revenue_breakdown("INOX", "movie") == {}
+
+
+def test_report_revenue_cli_variants():
+    svc, _, _ = _setup()
+    assert run_line(svc, "REPORT_REVENUE PVR") == "700"
+    assert run_line(svc, "REPORT_REVENUE PVR GROSS") == "1000"
+    assert run_line(svc, "REPORT_REVENUE PVR REFUNDED") == "300"
+    assert run_line(svc, "REPORT_REVENUE PVR BY MOVIE") == "Alpha:200 Beta:500"
+    assert run_line(svc, "REPORT_REVENUE PVR BY HOUR GROSS") == (
+        "2025-12-08T09:200 2025-12-08T11:600 2025-12-09T20:200 2025-12-09T21:0"
+    )
+    assert run_line(svc, "REPORT_REVENUE PVR BY WEEK") == "ERROR: Invalid Input"
@@ -0,0 +1,111 @@
+import threading
+from datetime import datetime
+import pytest
+
+from src.models.seat_map import SeatMap
+from src.services.cinema_service import CinemaService
+from src.utils.errors import BookingUnavailableError
+
+
+def dt(s: str) -> datetime:
+    return datetime.strptime(s, "%Y-%m-%d %H:%M")
+
+
+def test_allocator_is_best_fit_and_contiguous():
+    m = SeatMap(capacity=20, seats_per_row=10)
+    first = m.allocate(7)
+    assert first == [(0, c) for c in range(7)]
+    # Row 0 has a 3-seat gap left; a party of 3 should fill it instead of opening row 1
+    assert m.allocate(3) == [(0, 7), (0, 8), (0, 9)]
+    assert m.allocate(10) == [(1, c) for c in range(10)]
+    assert m.allocate(1) is None
+    assert m.best_run == 0
+
+    m.release(first[2:5])
+    assert m.best_run == 3
+    assert m.allocate(4) is None
+    assert m.allocate(2) == [(0, 2), (0, 3)]
+    assert m.free_count() == 1
+
+
+def test_short_last_row():
+    m = SeatMap(capacity=25, seats_per_row=10)
+    assert m.row_len == [10, 10, 5]
+    # best fit prefers the short row for a party that fits it
+    assert [r for r, _ in m.allocate(5)] == [2] * 5
+
+
+def test_order_and_cancel_assign_and_free_seats():
+    svc = CinemaService()
+    s = svc.register_show("PVR", "Rows", dt("2025-11-01 10:00"), 100, capacity=8, seats_per_row=4)
+
+    b1, _ = svc.order_tickets("Rows", dt("2025-11-01 10:00"), 3, now=dt("2025-10-31 09:00"))
+    b2, _ = svc.order_tickets("Rows", dt("2025-11-01 10:00"), 3, now=dt("2025-10-31 09:00"))
+    assert svc.store.get_booking(b1).seats == [(0, 0), (0, 1), (0, 2)]
+    assert svc.store.get_booking(b2).seats == [(1, 0), (1, 1), (1, 2)]
+
+    # 2 seats remain but not side by side
+    assert svc.store.get_show(s).seats_remaining == 2
+    with pytest.raises(BookingUnavailableError):
+        svc.order_tickets("Rows", dt("2025-11-01 10:00"), 2, now=dt("2025-10-31 09:01"))
+
+    svc.cancel_booking(b1, now=dt("2025-10-31 09:02"))
+    b3, _ = svc.order_tickets("Rows", dt("2025-11-01 10:00"), 4, now=dt("2025-10-31 09:03"))
+    assert svc.store.get_booking(b3).seats == [(0, c) for c in range(4)]
+
+
+def test_fragmented_show_falls_back_to_other_screen():
+    svc = CinemaService()
+    s1 = svc.register_show("PVR", "Frag", dt("2025-11-02 10:00"), 100, capacity=4, seats_per_row=2)
+    s2 = svc.register_show("Grand", "Frag", dt("2025-11-02 10:00"), 200, capacity=4)
+    _, sid = svc.order_tickets("Frag", dt("2025-11-02 10:00"), 3, now=dt("2025-11-01 09:00"))
+    assert sid == s2  # s1 is cheaper but has no 3 adjacent seats
+    assert svc.store.get_show(s1).seats_remaining == 4
+
+
+def test_concurrent_orders_never_double_assign_a_seat():
+    svc = CinemaService()
+    s = svc.register_show(
+        "PVR", "Busy", dt("2025-11-03 10:00"), 100, capacity=500, seats_per_row=25
+    )
+    booked = []
+    lock = threading.Lock()
+
+    def worker(qty: int):
+        while True:
+            try:
+                bid, _ = svc.order_tickets(
+                    "Busy", dt("2025-11-03 10:00"), qty, dt("2025-11-02 09:00")
+                )
+            except BookingUnavailableError:
+                return
+            with lock:
+                booked.append(bid)
+
+    threads = [threading.Thread(target=worker, args=(1 + i % 5,)) for i in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    seats = [seat for bid in booked for seat in svc.store.get_booking(bid).seats]
+    assert len(seats) == len(set(seats))
+    show = svc.store.get_show(s)
+    assert show.seats_remaining == 500 - len(seats) == show.seat_map.free_count()
+
+
+def test_waitlist_rejects_parties_longer_than_any_row():
+    svc = CinemaService()
+    start = dt("2025-11-04 10:00")
+    s = svc.register_show("PVR", "Rows", start, 100, capacity=8, seats_per_row=4)
+    bids = [svc.order_tickets("Rows", start, 4, now=dt("2025-11-03 09:00"))[0] for _ in range(2)]
+
+    # 5 <= capacity, but no row holds 5 adjacent seats: queuing it would block the line
+    with pytest.raises(BookingUnavailableError):
+        svc.order_or_wait("Rows", start, 5, now=dt("2025-11-03 09:01"))
+    small = svc.order_or_wait("Rows", start, 1, now=dt("2025-11-03 09:02"))
+
+    for bid in bids:
+        svc.cancel_booking(bid, now=dt("2025-11-03 09:03"))
+    assert small.result(timeout=1)[1] == s
+    assert svc.store.get_show(s).seats_remaining == 7
@@ -0,0 +1,113 @@
+import threading
+from datetime import datetime
+import pytest
+
+from src.cli.parser import run_line
+from src.services.cinema_service import CinemaService
+from src.utils.enums import BookingStatus
+from src.utils.errors import (
+    BookingAlreadyCancelledError,
+    BookingUnavailableError,
+    InvalidInputError,
+    ShowAlreadyStartedError,
+)
+
+
+def dt(s: str) -> datetime:
+    return datetime.strptime(s, "%Y-%m-%d %H:%M")
+
+
+SLOT = dt("2030-03-01 19:00")
+NOW = dt("2030-02-28 10:00")
+
+
+def test_party_is_split_across_fewest_then_cheapest_shows():
+    svc = CinemaService()
+    a = svc.register_show("PVR", "Party", SLOT, 300, capacity=5)
+    b = svc.register_show("Grand", "Party", SLOT, 100, capacity=3)
+    c = svc.register_show("INOX", "Party", SLOT, 200, capacity=5)
+
+    with pytest.raises(BookingUnavailableError):
+        svc.order_tickets("Party", SLOT, 8, NOW)
+
+    gid, sids = svc.order_tickets_split("Party", SLOT, 8, NOW)
+    # Two shows suffice; {b, c} is the cheapest 2-show set (1300 vs 1800 / 1900)
+    assert sids == [b, c]
+    assert [svc.store.get_show(s).seats_remaining for s in (a, b, c)] == [5, 0, 0]
+    parts = [svc.store.get_booking(bid) for bid in svc.store.groups_by_id[gid].booking_ids]
+    assert [(p.show_id, p.quantity, p.group_id) for p in parts] == [(b, 3, gid), (c, 5, gid)]
+    assert svc.revenue_for("Grand") == 300 and svc.revenue_for("INOX") == 1000
+
+
+def test_single_show_fit_is_a_plain_booking():
+    svc = CinemaService()
+    s = svc.register_show("PVR", "Solo", SLOT, 300, capacity=5)
+    bid, sids = svc.order_tickets_split("Solo", SLOT, 4, NOW)
+    assert sids == [s] and bid not in svc.store.groups_by_id
+
+
+def test_composite_cancel_reverses_all_parts_as_a_unit():
+    svc = CinemaService()
+    a = svc.register_show("PVR", "Unit", SLOT, 200, capacity=5)
+    b = svc.register_show("Grand", "Unit", SLOT, 200, capacity=5)
+    gid, _ = svc.order_tickets_split("Unit", SLOT, 8, NOW)
+    part = svc.store.groups_by_id[gid].booking_ids[0]
+
+    with pytest.raises(InvalidInputError):
+        svc.cancel_booking(part, NOW)
+
+    svc.start_show(b)
+    refund = svc.cancel_booking(gid, NOW)
+    # Show a (5 seats) refunds 50%; started show b refunds nothing and keeps seats taken
+    assert refund == 500
+    assert svc.store.get_show(a).seats_remaining == 5
+    assert svc.store.get_show(b).seats_remaining == 2
+    assert svc.store.groups_by_id[gid].status == BookingStatus.CANCELLED
+    with pytest.raises(BookingAlreadyCancelledError):
+        svc.cancel_booking(gid, NOW)
+
+
+def test_concurrent_split_orders_never_oversell():
+    svc = CinemaService()
+    shows = [svc.register_show(f"C{i}", "Crowd", SLOT, 100 + i, capacity=7) for i in range(4)]
+    done = []
+
+    def worker():
+        try:
+            done.append(svc.order_tickets_split("Crowd", SLOT, 9, NOW))
+        except BookingUnavailableError:
+            pass
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(done) == 3  # 28 seats / 9
+    assert sum(svc.store.get_show(s).seats_remaining for s in shows) == 28 - 27
+
+
+def test_cli_split_option():
+    svc = CinemaService()
+    run_line(svc, "REGISTER_SHOW PVR Cli 2030-01-01 10:00 100 2")
+    run_line(svc, "REGISTER_SHOW INOX Cli 2030-01-01 10:00 100 2")
+    out = run_line(svc, "ORDER_TICKETS Cli 2030-01-01 10:00 3 SPLIT=YES")
+    assert out.startswith("OK B") and out.count(",") == 1
+    assert run_line(svc, f"CANCEL_BOOKING {out.split()[1]}") == "OK REFUND=150"
+
+
+def test_split_skips_a_started_show_of_the_slot():
+    svc = CinemaService()
+    a = svc.register_show("PVR", "Late", SLOT, 100, capacity=10)
+    b = svc.register_show("Grand", "Late", SLOT, 200, capacity=5)
+    c = svc.register_show("INOX", "Late", SLOT, 300, capacity=5)
+    svc.start_show(a)
+
+    gid, shows = svc.order_tickets_split("Late", SLOT, 8, NOW)
+    assert sorted(shows) == sorted([b, c])
+    assert svc.store.get_show(a).seats_remaining == 10
+
+    svc.start_show(b)
+    svc.start_show(c)
+    with pytest.raises(ShowAlreadyStartedError):
+        svc.order_tickets_split("Late", SLOT, 1, NOW)
@@ -0,0 +1,46 @@
+from datetime import datetime
+import pytest
+
+from src.services.tenants import TenantRegistry
+from src.utils.errors import InvalidInputError, TenantNotFoundError
+
+
+def dt(s: str) -> datetime:
+    return datetime.strptime(s, "%Y-%m-%d %H:%M")
+
+
+def test_tenants_have_isolated_stores_ids_and_revenue():
+    reg = TenantRegistry()
+    mumbai = reg.create("mumbai")
+    delhi = reg.create("delhi")
+
+    m = mumbai.register_show("PVR", "Film", dt("2030-05-01 10:00"), 300, 10)
+    d = delhi.register_show("PVR", "Film", dt("2030-05-01 10:00"), 200, 10)
+    assert m == d == "S00001"  # id counters are per tenant
+
+    mumbai.order_tickets("Film", dt("2030-05-01 10:00"), 2, dt("2030-04-30 10:00"))
+    assert mumbai.revenue_for("PVR") == 600
+    assert delhi.revenue_for("PVR") == 0
+    assert delhi.store.get_show(d).seats_remaining == 10
+    assert mumbai.store.locks is not delhi.store.locks
+    assert mumbai.scheduler is not delhi.scheduler
+
+
+def test_registry_routes_cli_and_reports_memory_per_tenant():
+    reg = TenantRegistry()
+    reg.create("pune")
+    reg.create("goa")
+    assert reg.run_line("pune", "REGISTER_SHOW PVR Film 2030-05-01 10:00 100 5") == "OK S00001"
+    assert reg.run_line("pune", "ORDER_TICKETS Film 2030-05-01 10:00 2").startswith("OK B00001")
+    assert reg.run_line("goa", "REPORT_REVENUE PVR") == "0"
+
+    report = reg.memory_report()
+    assert report["pune"]["bookings_by_id"]["entries"] == 1
+    assert report["pune"]["total"]["bytes"] > report["goa"]["total"]["bytes"]
+    assert report["goa"]["shows_by_id"]["entries"] == 0
+
+    assert reg.run_line("nowhere", "REPORT_REVENUE PVR") == "ERROR: Tenant Not Found"
+    with pytest.raises(TenantNotFoundError):
+        reg.get("nowhere")
+    with pytest.raises(InvalidInputError):
+        reg.create("goa")
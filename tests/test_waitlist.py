@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta
+import pytest
+
+from src.services.cinema_service import CinemaService
+from src.utils.clock import VirtualClock
+from src.utils.errors import BookingUnavailableError, ShowAlreadyStartedError
+
+
+def dt(s: str) -> datetime:
+    return datetime.strptime(s, "%Y-%m-%d %H:%M")
+
+
+def test_cancellation_allocates_to_waiters_in_fifo_order():
+    svc = CinemaService()
+    s = svc.register_show("PVR", "Queue", dt("2025-09-10 10:00"), 200, capacity=3)
+    bid, _ = svc.order_tickets("Queue", dt("2025-09-10 10:00"), 3, now=dt("2025-09-09 09:00"))
+
+    first = svc.order_or_wait("Queue", dt("2025-09-10 10:00"), 2, now=dt("2025-09-09 09:01"))
+    second = svc.order_or_wait("Queue", dt("2025-09-10 10:00"), 1, now=dt("2025-09-09 09:02"))
+    assert not first.done() and not second.done()
+
+    notified = []
+    first.add_done_callback(lambda f: notified.append(f.result()))
+
+    refund = svc.cancel_booking(bid, now=dt("2025-09-09 09:03"))
+    assert refund == (200 * 3) // 2
+
+    bid1, sid1 = first.result(timeout=1)
+    bid2, sid2 = second.result(timeout=1)
+    assert sid1 == sid2 == s
+    assert notified == [(bid1, sid1)]
+    # freed seats went to the waiters, not back to the pool
+    assert svc.store.get_show(s).seats_remaining == 0
+    assert svc.revenue_for("PVR") == 200 * 3 - refund + 200 * 3
+
+
+def test_head_of_line_waiter_is_not_overtaken():
+    svc = CinemaService()
+    s = svc.register_show("PVR", "Hol", dt("2025-09-11 10:00"), 100, capacity=4)
+    b1, _ = svc.order_tickets("Hol", dt("2025-09-11 10:00"), 1, now=dt("2025-09-10 09:00"))
+    b2, _ = svc.order_tickets("Hol", dt("2025-09-11 10:00"), 3, now=dt("2025-09-10 09:00"))
+
+    big = svc.order_or_wait("Hol", dt("2025-09-11 10:00"), 3, now=dt("2025-09-10 09:01"))
+    small = svc.order_or_wait("Hol", dt("2025-09-11 10:00"), 1, now=dt("2025-09-10 09:02"))
+
+    # One seat frees up: the head waiter needs 3, so nobody is served yet
+    svc.cancel_booking(b1, now=dt("2025-09-10 09:03"))
+    assert not big.done() and not small.done()
+    assert svc.store.get_show(s).seats_remaining == 1
+
+    svc.cancel_booking(b2, now=dt("2025-09-10 09:04"))
+    assert big.result(timeout=1)[1] == s
+    assert small.result(timeout=1)[1] == s
+    assert svc.store.get_show(s).seats_remaining == 0
+
+
+def test_cancelled_waiter_is_skipped_and_oversized_requests_rejected():
+    svc = CinemaService()
+    s = svc.register_show("PVR", "Skip", dt("2025-09-12 10:00"), 100, capacity=2)
+    bid, _ = svc.order_tickets("Skip", dt("2025-09-12 10:00"), 2, now=dt("2025-09-11 09:00"))
+
+    with pytest.raises(BookingUnavailableError):
+        svc.order_or_wait("Skip", dt("2025-09-12 10:00"), 5, now=dt("2025-09-11 09:01"))
+
+    gone = svc.order_or_wait("Skip", dt("2025-09-12 10:00"), 2, now=dt("2025-09-11 09:01"))
+    waiting = svc.order_or_wait("Skip", dt("2025-09-12 10:00"), 2, now=dt("2025-09-11 09:02"))
+    assert gone.cancel()
+
+    svc.cancel_booking(bid, now=dt("2025-09-11 09:03"))
+    assert waiting.result(timeout=1)[1] == s
+    assert svc.booking.waitlist.pending("Skip", dt("2025-09-12 10:00")) == 0
+
+
+def test_order_or_wait_succeeds_immediately_when_seats_exist():
+    svc = CinemaService()
+    s = svc.register_show("PVR", "Now", dt("2025-09-13 10:00"), 100, capacity=2)
+    fut = svc.order_or_wait("Now", dt("2025-09-13 10:00"), 1, now=dt("2025-09-12 09:00"))
+    assert fut.done() and fut.result()[1] == s
+
+
+@pytest.mark.parametrize("lazy_status", [False, True])
+def test_waiters_fail_once_the_last_show_of_the_slot_stops_selling(lazy_status):
+    clock = VirtualClock(dt("2025-09-14 09:00"))
+    svc = CinemaService(clock=clock, lazy_status=lazy_status)
+    start = dt("2025-09-14 10:00")
+    s1 = svc.register_show("PVR", "Gone", start, 100, capacity=1)
+    s2 = svc.register_show("INOX", "Gone", start, 100, capacity=1)
+    svc.order_tickets("Gone", start, 1, now=clock.now())
+    svc.order_tickets("Gone", start, 1, now=clock.now())
+    waiter = svc.order_or_wait("Gone", start, 1, now=clock.now())
+
+    if lazy_status:
+        clock.advance(timedelta(hours=1, minutes=1))  # the status sweep materialises STARTED
+    else:
+        svc.start_show(s1)
+        assert not waiter.done()  # s2 can still free a seat
+        svc.start_show(s2)
+    with pytest.raises(ShowAlreadyStartedError):
+        waiter.result(timeout=1)
+    assert svc.booking.waitlist.pending("Gone", start) == 0
+    assert ("Gone", start) not in svc.booking.waitlist._queues
+
+
+def test_waiters_fail_when_the_last_show_ends_before_the_status_sweep():
+    clock = VirtualClock(dt("2025-09-15 09:00"))
+    svc = CinemaService(clock=clock, lazy_status=True, status_sweep_interval=timedelta(hours=6))
+    start = dt("2025-09-15 10:00")
+    s = svc.register_show("PVR", "End", start, 100, capacity=1)
+    svc.order_tickets("End", start, 1, now=clock.now())
+    waiter = svc.order_or_wait("End", start, 1, now=clock.now())
+
+    clock.advance(timedelta(hours=2))  # derived STARTED, nothing materialised it yet
+    assert not waiter.done()
+    svc.end_show(s)
+    with pytest.raises(ShowAlreadyStartedError):
+        waiter.result(timeout=1)
+    assert svc.booking.waitlist.pending("End", start) == 0
+
+
+def test_waiter_queues_when_one_show_started_and_the_other_is_full():
+    svc = CinemaService()
+    start = dt("2025-09-16 10:00")
+    early = svc.register_show("PVR", "Mixed", start, 100, capacity=2)
+    full = svc.register_show("INOX", "Mixed", start, 100, capacity=2)
+    svc.order_tickets("Mixed", start, 2, now=dt("2025-09-15 09:00"))
+    bid, sid = svc.order_tickets("Mixed", start, 2, now=dt("2025-09-15 09:00"))
+    assert sid == full
+    svc.start_show(early)
+
+    waiter = svc.order_or_wait("Mixed", start, 2, now=dt("2025-09-15 09:01"))
+    assert not waiter.done()
+    svc.cancel_booking(bid, now=dt("2025-09-15 09:02"))
+    assert waiter.result(timeout=1)[1] == full
+
+
+def test_waiters_only_the_started_show_could_seat_are_failed():
+    svc = CinemaService()
+    start = dt("2025-09-17 10:00")
+    small = svc.register_show("PVR", "Big", start, 100, capacity=3)
+    large = svc.register_show("INOX", "Big", start, 200, capacity=5)
+    bid, _ = svc.order_tickets("Big", start, 3, now=dt("2025-09-16 09:00"))
+    svc.order_tickets("Big", start, 5, now=dt("2025-09-16 09:00"))
+    party = svc.order_or_wait("Big", start, 5, now=dt("2025-09-16 09:01"))
+    single = svc.order_or_wait("Big", start, 1, now=dt("2025-09-16 09:02"))
+
+    svc.start_show(large)
+    with pytest.raises(BookingUnavailableError):
+        party.result(timeout=1)  # only the started show could ever seat 5
+    assert not single.done()
+    svc.cancel_booking(bid, now=dt("2025-09-16 09:03"))
+    assert single.result(timeout=1)[1] == small
+    assert svc.store.get_show(small).seats_remaining == 2